@@ -1,6 +1,15 @@
 # -*- coding: utf-8 -*-
 
-from node import Node
+from collections import deque
+from lists import ListTheory
+from node import Node, collect_nodes
+from proof import ProofForest
+from signature import SignatureTable
+from stats import Statistics
+from store import TermStore
+
+# The term store is part of the package's interface.
+__all__ = ['Algorithm', 'TermStore']
 
 
 class Algorithm(object):
@@ -8,13 +17,73 @@ class Algorithm(object):
         The implementation of the congruence closure algorithm.
     """
 
+    # Compare all pairs of parents of two merged classes. This is the
+    # reference implementation.
+    PAIRWISE = 'pairwise'
+
+    # Look up the parents of the merged class in a signature table.
+    SIGNATURE = 'signature'
+
 
-    def __init__(self, merge_list = None, inequality_list = None):
+    def __init__(self, merge_list = None, inequality_list = None,
+                 strategy = SIGNATURE, store = None, incremental = False,
+                 eager = False, explain = False, instrument = False,
+                 atom_list = None, lists = False, lazy = False):
         """
             Initialize this class.
 
+            If a term store is given, the merge and inequality lists contain
+            term IDs of this store instead of nodes, and the store's own
+            congruence closure is used.
+
+            An incremental algorithm supports push() and pop(). While a
+            scope is open, it records every change in a trail so it can be
+            undone, and it never
+            compresses paths in the union-find, so classes must be looked up
+            with are_equal() instead of Node.get_class_representative().
+
+            An eager algorithm indexes the inequalities by the
+            representatives of their nodes and checks them whenever two
+            classes are merged. Merging stops as soon as an inequality is
+            violated.
+
+            An algorithm with explanations records why each pair of nodes
+            has been merged, so explain() can return the input equalities
+            implying an equality. Without explanations, nothing is recorded.
+
+            An instrumented algorithm counts the operations of the congruence
+            closure in a Statistics object available as stats. The counters
+            are collected by wrapping the algorithm's functions here, so an
+            algorithm without instrumentation does not pay for them. With a
+            term store, only the merges are counted.
+
+            An algorithm for lists decides the theory T_cons: the projections
+            car and cdr of all cons nodes are added and merged automatically,
+            and each node in the atom list must not be equal to a cons node.
+            Such conflicts are found while merging.
+
+            A lazy algorithm does not merge anything in merge_nodes(). Only
+            when two nodes are compared, the nodes that may influence their
+            classes are merged: the nodes connected to them by input
+            equalities, their arguments, and their parents sharing a function
+            symbol with one of these nodes. These classes are kept, so
+            repeated queries only look up representatives.
+
             :type merge_list: list[(Node, Node)]
             :type inequality_list: list[(Node, Node)]
+            :param strategy: The way congruent parents are found, either
+                             Algorithm.PAIRWISE or Algorithm.SIGNATURE.
+            :type store: TermStore
+            :type incremental: bool
+            :type eager: bool
+            :type explain: bool
+            :param instrument: True or a Statistics object to collect the
+                               statistics in, e.g. one with timers.
+            :type instrument: bool | Statistics
+            :param atom_list: The nodes x of the literals atom(x).
+            :type atom_list: list[Node]
+            :type lists: bool
+            :type lazy: bool
         """
 
         if not merge_list:
@@ -27,15 +96,1036 @@ class Algorithm(object):
         else:
             self.inequality_list = inequality_list
 
+        if not atom_list:
+            self.atom_list = []
+        else:
+            self.atom_list = atom_list
+
+        if self.atom_list and not lists:
+            raise ValueError('Atoms require an algorithm for lists')
+
+        if strategy not in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            raise ValueError('Unknown strategy: {0!s}'.format(strategy))
+
+        if store is not None:
+            if strategy != Algorithm.SIGNATURE:
+                raise ValueError('A term store only supports the signature '
+                                 'strategy')
+            if incremental or eager or explain or lists or lazy:
+                raise ValueError('A term store cannot be used incrementally, '
+                                 'eagerly, lazily, with explanations or for '
+                                 'lists')
+            self._merge = self._merge_store
+            self._equal = store.are_equal
+        elif lazy:
+            if strategy != Algorithm.SIGNATURE:
+                raise ValueError('A lazy algorithm only supports the '
+                                 'signature strategy')
+            if incremental or eager or lists:
+                raise ValueError('A lazy algorithm cannot be used '
+                                 'incrementally, eagerly or for lists')
+            self._merge = self._merge_lazy
+            self._equal = self._lazy_equal
+        elif strategy == Algorithm.PAIRWISE:
+            self._merge = self._merge_pairwise
+            self._equal = self._same_class
+        else:
+            self._merge = self._merge_signature
+            self._equal = self._same_class
+
+        self.strategy = strategy
+        self.store = store
+        self.incremental = incremental
+        self.eager = eager
+        self.explanations = explain
+        self.lists = lists
+        self.lazy = lazy
+
+        if instrument is True:
+            instrument = Statistics()
+        self.stats = instrument or None
+
+        # Undo actions (function, arguments) of all changes while a scope is
+        # open, and the state of the lists at each push(). Changes outside of
+        # any scope can never be undone, so nothing is recorded for them.
+        if incremental:
+            self._find = Node.get_root
+        else:
+            self._find = Node.get_class_representative
+        self._trail = None
+        self._scopes = []
+
+        if self.stats is not None:
+            self._find = self.stats.counted('finds', self._find)
+
+        self._signatures = SignatureTable(self._find, self._trail)
+
+        # Equalities that have been found but not yet been merged.
+        self._pending = deque()
+
+        # The number of entries of the merge list that have been merged.
+        self._merged = 0
+
+        # Functions called after each union with the new child and root,
+        # the merged nodes of the child's and the root's class and the
+        # reason for the merge.
+        self._union_hooks = []
+
+        # For eager algorithms: The inequalities involving each class, keyed
+        # by its representative, and the number of entries of the inequality
+        # list that have been indexed.
+        self._disequalities = {}
+        self._indexed = 0
+        if eager:
+            self._union_hooks.append(self._merge_disequalities)
+
+        # The first violated inequality found by an eager algorithm, or an
+        # atom and a cons node in the same class.
+        self.conflict = None
+
+        # Watched pairs of nodes as (pair, callback), whether each of them has
+        # been reported, and the indices of the unreported watches involving
+        # each class, keyed by its representative. The index is only kept up
+        # to date once the first pair is watched.
+        self._watches = []
+        self._fired = []
+        self._watched = {}
+        self._watching = False
+
+        # Watched equalities that have become true and watched disequalities
+        # that have become violated, unless they have a callback.
+        self.implied = deque()
+        self.violated = deque()
+
+        # For algorithms for lists: The index of atoms and cons nodes, and the
+        # number of entries of the inequality and atom lists that have been
+        # indexed.
+        self._lists = ListTheory(self._find, self._trail)
+        self._listed = 0
+        self._atoms_indexed = 0
+        if lists:
+            self._union_hooks.append(self._merge_lists)
+
+        # For lazy algorithms: The nodes that have been compared or may
+        # influence compared nodes, the input equalities of each node, the
+        # function symbols (name, arity) of the relevant nodes, and the
+        # parents of relevant nodes whose symbol is not among them.
+        self._relevant = set()
+        self._partners = {}  # Dict: node -> list of (node, reason)
+        self._symbols = set()
+        self._parked = {}  # Dict: (name, arity) -> list of nodes
+
+        # For algorithms with explanations: The reasons for all merges and
+        # the number of nodes in each class, keyed by its representative.
+        self._proofs = ProofForest(self._trail)
+        self._sizes = {}
+        if explain:
+            self._union_hooks.append(self._record_proof)
+
+        if self.stats is not None:
+            self._instrument()
+
+
+    def _instrument(self):
+        """
+            Replace the functions of this algorithm by wrappers updating the
+            statistics.
+        """
+
+        stats = self.stats
+        counts = stats.counts
+        pending = self._pending
+        table = self._signatures
+
+        # The number of queued equalities left in the current round of
+        # congruences and the number of rounds since the last input equality.
+        rounds = [0, 0]
+
+        merge = self._merge
+
+        def counted_merge(node1, node2, reason = None):
+            counts['merges'] += 1
+            if reason is None:
+                counts['congruences'] += 1
+
+            # All equalities queued during a round form the next round.
+            if not rounds[0]:
+                rounds[0] = len(pending) + 1
+                rounds[1] += 1
+            rounds[0] -= 1
+            merge(node1, node2, reason)
+
+        propagate = self._propagate
+
+        def counted_propagate():
+            rounds[0] = rounds[1] = 0
+            propagate()
+            counts['propagation_depth'] = max(counts['propagation_depth'],
+                                              rounds[1] - 1)
+
+        union = self._union
+        pairwise = self.strategy == Algorithm.PAIRWISE
+
+        def counted_union(rep1, rep2, node1, node2, reason):
+            counts['unions'] += 1
+            size1 = len(rep1.parents)
+            size2 = len(rep2.parents)
+            counts['moved_parents'] += min(size1, size2)
+            union(rep1, rep2, node1, node2, reason)
+            # The set of the attached class may have received the parents of
+            # both classes, so count the parents it had before the union.
+            if pairwise:
+                counts['parent_pairs'] += size1 * size2
+            elif rep1.find is rep1:
+                counts['parent_pairs'] += size2
+            else:
+                counts['parent_pairs'] += size1
+
+        update = table.update
+
+        def counted_update(nodes):
+            counts['signatures'] += len(nodes)
+            return update(nodes)
+
+        self._merge = counted_merge
+        self._propagate = counted_propagate
+        self._union = counted_union
+        table.update = counted_update
+        table.signature = stats.counted('signatures', table.signature)
+        self.merge_nodes = stats.timed('merge_nodes', self.merge_nodes)
+        self.check_satisfiability = stats.timed('check_satisfiability',
+                                                self.check_satisfiability)
+
 
     def merge_nodes(self):
         """
-            Merge all nodes in the merge list.
+            Merge all nodes in the merge list that have not been merged yet.
+        """
+
+        if self.eager:
+            self._index_disequalities()
+        if self.lists:
+            self._index_lists()
+        if self.lazy:
+            self._index_partners()
+            return
+
+        merge_list = self.merge_list
+        for n in range(self._merged, len(merge_list)):
+            if self.conflict is not None:
+                return
+
+            node1, node2 = merge_list[n]
+            self.merge(node1, node2, merge_list[n])
+            self._merged = n + 1
+
+
+    def assert_equality(self, node1, node2):
+        """
+            Add an equality to the merge list and merge its nodes.
+
+            :type node1: Node
+            :type node2: Node
+        """
+
+        self.merge_list.append((node1, node2))
+        self.merge_nodes()
+
+
+    def assert_inequality(self, node1, node2):
+        """
+            Add an inequality to the inequality list.
+
+            :type node1: Node
+            :type node2: Node
+        """
+
+        self.inequality_list.append((node1, node2))
+        if self.eager:
+            self._index_disequalities()
+        if self.lists:
+            self._index_lists()
+
+
+    def assert_atom(self, node):
+        """
+            Add a node x of the literal atom(x) to the atom list.
+
+            :type node: Node
+        """
+
+        if not self.lists:
+            raise ValueError('Atoms require an algorithm for lists')
+
+        self.atom_list.append(node)
+        self._index_lists()
+
+
+    def watch(self, node1, node2, callback = None):
+        """
+            Watch a pair of nodes and report it once both nodes are in the
+            same class, either by calling the callback with the pair or by
+            appending the pair to the queue implied. A pair that is already
+            equal is reported right away.
+
+            Each pair is reported exactly once, during the union making it
+            equal, so callbacks must not merge nodes themselves. The cost is
+            proportional to the watched pairs of the smaller of the two merged
+            classes, not to the number of watched pairs. Watches of an
+            incremental algorithm are removed by pop() like assertions.
+
+            :type node1: Node
+            :type node2: Node
+            :param callback: A function called with the pair (node1, node2).
+            :type callback: function
+            :return: The watched pair (node1, node2).
+            :rtype: (Node, Node)
+        """
+
+        return self._watch(node1, node2, callback or self.implied.append)
+
+
+    def watch_disequality(self, node1, node2, callback = None):
+        """
+            Watch a disequality of two nodes without asserting it, and report
+            it once it is violated, either by calling the callback with the
+            pair or by appending the pair to the queue violated. See watch().
+
+            :type node1: Node
+            :type node2: Node
+            :param callback: A function called with the pair (node1, node2).
+            :type callback: function
+            :return: The watched pair (node1, node2).
+            :rtype: (Node, Node)
+        """
+
+        return self._watch(node1, node2, callback or self.violated.append)
+
+
+    def _watch(self, node1, node2, callback):
+        """
+            Add a watched pair and index it by the representatives of its
+            nodes.
+
+            :type node1: Node
+            :type node2: Node
+            :type callback: function
+            :rtype: (Node, Node)
+        """
+
+        if self.store is not None or self.lazy:
+            raise ValueError('A term store or lazy algorithm cannot watch '
+                             'pairs')
+
+        if not self._watching:
+            self._watching = True
+            self._union_hooks.append(self._merge_watches)
+
+        pair = (node1, node2)
+        watches = self._watches
+        fired = self._fired
+        trail = self._trail
+        n = len(watches)
+        watches.append((pair, callback))
+        fired.append(False)
+        if trail is not None:
+            trail.append((watches.pop, ()))
+            trail.append((fired.pop, ()))
+
+        find = self._find
+        rep1 = find(node1)
+        rep2 = find(node2)
+        if rep1 is rep2:
+            self._fire(n)
+            return pair
+
+        index = self._watched
+        for rep in [rep1, rep2]:
+            entries = index.get(rep)
+            if entries is None:
+                entries = index[rep] = []
+                if trail is not None:
+                    trail.append((index.pop, (rep, None)))
+
+            entries.append(n)
+            if trail is not None:
+                trail.append((entries.pop, ()))
+
+        return pair
+
+
+    def _fire(self, n):
+        """
+            Report the watched pair with the given index.
+
+            :type n: int
+        """
+
+        self._fired[n] = True
+        if self._trail is not None:
+            self._trail.append((self._fired.__setitem__, (n, False)))
+
+        pair, callback = self._watches[n]
+        callback(pair)
+
+
+    def push(self):
+        """
+            Open a new scope. All equalities and inequalities asserted and all
+            merges done from now on are undone by the matching pop().
+        """
+
+        if not self.incremental:
+            raise ValueError('push() requires an incremental algorithm')
+        if not self._scopes:
+            self._set_trail([])
+
+        self._scopes.append((len(self._trail), len(self.merge_list),
+                             len(self.inequality_list), len(self.atom_list),
+                             self._merged, self._indexed, self._listed,
+                             self._atoms_indexed, self.conflict))
+
+
+    def pop(self):
+        """
+            Close the current scope, restoring the state of the last push().
+            The cost is proportional to the number of changes since then.
         """
 
-        for mergees in self.merge_list:
-            node1, node2 = mergees
-            node1.merge(node2)
+        if not self._scopes:
+            raise IndexError('pop() without a matching push()')
+
+        length, merges, inequalities, atoms, merged, indexed, listed, \
+            atoms_indexed, conflict = self._scopes.pop()
+        trail = self._trail
+        while len(trail) > length:
+            function, arguments = trail.pop()
+            function(*arguments)
+
+        del self.merge_list[merges:]
+        del self.inequality_list[inequalities:]
+        del self.atom_list[atoms:]
+        self._merged = merged
+        self._indexed = indexed
+        self._listed = listed
+        self._atoms_indexed = atoms_indexed
+        self.conflict = conflict
+        self._pending.clear()
+        if not self._scopes:
+            self._set_trail(None)
+
+
+    def _set_trail(self, trail):
+        """
+            Start or stop recording undo actions, in this algorithm and in
+            the structures it uses.
+
+            :param trail: The list to append the undo actions to, or None.
+            :type trail: list[(function, tuple)]
+        """
+
+        self._trail = trail
+        self._signatures._trail = trail
+        self._lists._trail = trail
+        self._proofs._trail = trail
+
+
+    def merge(self, node1, node2, reason = None):
+        """
+            Merge the two given nodes and all nodes becoming congruent by
+            this merge.
+
+            The congruent pairs are collected in a queue of pending
+            equalities which is drained in a loop, so the length of a
+            propagation chain does not affect the stack depth. Input
+            equalities are queued together with their reason, congruent pairs
+            without one.
+
+            :type node1: Node
+            :type node2: Node
+            :param reason: The input equality returned by explanations of
+                           this merge, by default the pair of both nodes.
+        """
+
+        if reason is None:
+            reason = (node1, node2)
+
+        self._pending.append((node1, node2, reason))
+        self._propagate()
+
+
+    def _propagate(self):
+        """
+            Merge all pending equalities, including those found on the way.
+        """
+
+        merge = self._merge
+        pending = self._pending
+        while pending:
+            merge(*pending.popleft())
+
+            # An eager algorithm stops at the first violated inequality.
+            if self.conflict is not None:
+                pending.clear()
+                return
+
+
+    def _union(self, rep1, rep2, node1, node2, reason):
+        """
+            Create the union of the classes of the two given representatives
+            and notify the union hooks, passing the merged node of the class
+            attached below the other one first.
+
+            :type rep1: Node
+            :type rep2: Node
+            :param node1: The merged node in the first class.
+            :param node2: The merged node in the second class.
+            :param reason: The input equality of the merge, or None if both
+                           nodes are congruent.
+        """
+
+        rep1.union(rep2, self._trail)
+        if rep1.find is rep1:
+            child, root = rep2, rep1
+            node1, node2 = node2, node1
+        else:
+            child, root = rep1, rep2
+
+        for hook in self._union_hooks:
+            hook(child, root, node1, node2, reason)
+
+
+    def _merge_store(self, term1, term2, reason = None):
+        """
+            Merge the two given terms of the term store.
+
+            :type term1: int
+            :type term2: int
+        """
+
+        self.store.merge(term1, term2)
+
+
+    def _merge_pairwise(self, node1, node2, reason = None):
+        """
+            Merge the two given nodes, comparing all pairs of parents of the
+            two classes.
+
+            :type node1: Node
+            :type node2: Node
+            :param reason: The input equality, or None for congruent nodes.
+        """
+
+        find = self._find
+        rep1 = find(node1)
+        rep2 = find(node2)
+        if rep1 is rep2:
+            return
+
+        # The union adds one set of parents to the other.
+        parents1 = list(rep1.parents)
+        parents2 = list(rep2.parents)
+        self._union(rep1, rep2, node1, node2, reason)
+
+        # Merge all congruent parent combinations.
+        signature = self._signatures.signature
+        pending = self._pending
+        for p1 in parents1:
+            for p2 in parents2:
+                if find(p1) is not find(p2) and \
+                        signature(p1) == signature(p2):
+                    pending.append((p1, p2))
+
+
+    def _merge_signature(self, node1, node2, reason = None):
+        """
+            Merge the two given nodes, looking up the parents of the class
+            attached below the other one in the signature table.
+
+            The attached class is chosen by rank, not by its number of
+            parents, so it may be the larger one. After the in-place union,
+            its set may even contain the parents of both classes, so a merge
+            costs up to twice the number of parents of the attached class.
+
+            :type node1: Node
+            :type node2: Node
+            :param reason: The input equality, or None for congruent nodes.
+        """
+
+        table = self._signatures
+        pending = self._pending
+        pending.extend(table.register([node1, node2]))
+
+        find = self._find
+        rep1 = find(node1)
+        rep2 = find(node2)
+        if rep1 is rep2:
+            return
+
+        # Only the parents of the class that is attached below the other one
+        # get new signatures. If that class had more parents, its set has
+        # received the other class's parents, whose signatures do not
+        # change, which at most doubles the lookups.
+        parents1 = rep1.parents
+        parents2 = rep2.parents
+        self._union(rep1, rep2, node1, node2, reason)
+        if rep1.find is rep1:
+            parents = parents2
+        else:
+            parents = parents1
+
+        pending.extend(table.update(parents))
+
+
+    def _merge_lazy(self, node1, node2, reason = None):
+        """
+            Merge the two given nodes of a lazy algorithm, looking up only
+            the relevant parents of the class attached below the other one in
+            the signature table, as _merge_signature() does.
+
+            :type node1: Node
+            :type node2: Node
+            :param reason: The input equality, or None for congruent nodes.
+        """
+
+        find = self._find
+        rep1 = find(node1)
+        rep2 = find(node2)
+        if rep1 is rep2:
+            return
+
+        parents1 = rep1.parents
+        parents2 = rep2.parents
+        self._union(rep1, rep2, node1, node2, reason)
+        if rep1.find is rep1:
+            parents = parents2
+        else:
+            parents = parents1
+
+        relevant = self._relevant
+        self._pending.extend(self._signatures.update(
+            [parent for parent in parents if parent in relevant]))
+
+
+    def _index_partners(self):
+        """
+            Index the entries of the merge list of a lazy algorithm that have
+            not been indexed yet by their nodes. An equality of a relevant
+            node is merged right away.
+        """
+
+        partners = self._partners
+        relevant = self._relevant
+        merge_list = self.merge_list
+        for n in range(self._merged, len(merge_list)):
+            merge = merge_list[n]
+            node1, node2 = merge
+            partners.setdefault(node1, []).append((node2, merge))
+            partners.setdefault(node2, []).append((node1, merge))
+            if node1 in relevant or node2 in relevant:
+                self._expand([node1, node2])
+                self.merge(node1, node2, merge)
+
+        self._merged = len(merge_list)
+
+
+    def _expand(self, nodes):
+        """
+            Add the given nodes and all nodes that may influence their classes
+            to the relevant nodes of a lazy algorithm, and merge the equalities
+            of the new relevant nodes.
+
+            :type nodes: list[Node]
+        """
+
+        relevant = self._relevant
+        stack = [node for node in nodes if node not in relevant]
+        if not stack:
+            return
+
+        relevant.update(stack)
+        partners = self._partners
+        symbols = self._symbols
+        parked = self._parked
+        added = []
+        merges = []
+        while stack:
+            node = stack.pop()
+            added.append(node)
+            neighbours = list(node.arguments)
+            neighbours.append(node.find)
+            for partner, reason in partners.get(node, []):
+                neighbours.append(partner)
+                merges.append((node, partner, reason))
+
+            # A parent can only be congruent to a node with the same symbol.
+            symbol = (node.symbol, node.arity)
+            if symbol not in symbols:
+                symbols.add(symbol)
+                neighbours.extend(parked.pop(symbol, []))
+            for parent in node.parents:
+                symbol = (parent.symbol, parent.arity)
+                if symbol in symbols:
+                    neighbours.append(parent)
+                else:
+                    parked.setdefault(symbol, []).append(parent)
+
+            for neighbour in neighbours:
+                if neighbour not in relevant:
+                    relevant.add(neighbour)
+                    stack.append(neighbour)
+
+        pending = self._pending
+        pending.extend(self._signatures.update(
+            [node for node in added if node.arguments]))
+        pending.extend(merges)
+        self._propagate()
+
+
+    def _lazy_equal(self, node1, node2):
+        """
+            :type node1: Node
+            :type node2: Node
+            :rtype: bool
+        """
+
+        self._index_partners()
+        self._expand([node1, node2])
+        find = self._find
+        return find(node1) is find(node2)
+
+
+    def _index_disequalities(self):
+        """
+            Add all inequalities that have not been indexed yet to the
+            disequality lists of their nodes' classes.
+        """
+
+        find = self._find
+        index = self._disequalities
+        trail = self._trail
+        inequality_list = self.inequality_list
+        for n in range(self._indexed, len(inequality_list)):
+            inequality = inequality_list[n]
+            node1, node2 = inequality
+            rep1 = find(node1)
+            rep2 = find(node2)
+            if rep1 is rep2 and self.conflict is None:
+                self.conflict = inequality
+
+            for rep in [rep1, rep2]:
+                entries = index.get(rep)
+                if entries is None:
+                    entries = index[rep] = []
+                    if trail is not None:
+                        trail.append((index.pop, (rep, None)))
+
+                entries.append(inequality)
+                if trail is not None:
+                    trail.append((entries.pop, ()))
+
+        self._indexed = len(inequality_list)
+
+
+    def _merge_disequalities(self, child, root, node1, node2, reason):
+        """
+            Merge the disequality lists of two classes that have just been
+            merged and check them for a violated inequality.
+
+            Every violated inequality must be in both lists, so only the
+            shorter list is checked, and it is appended to the longer one.
+
+            :type child: Node
+            :type root: Node
+            :type node1: Node
+            :type node2: Node
+            :param reason: The input equality, or None for congruent nodes.
+        """
+
+        index = self._disequalities
+        trail = self._trail
+        entries1 = index.get(child)
+        if not entries1:
+            return
+
+        entries2 = index.get(root)
+        if not entries2:
+            index[root] = entries1
+            if trail is not None:
+                trail.append((index.__setitem__, (root, entries2)))
+            return
+
+        if len(entries1) > len(entries2):
+            entries1, entries2 = entries2, entries1
+            index[root] = entries2
+            if trail is not None:
+                trail.append((index.__setitem__, (root, entries1)))
+
+        find = self._find
+        if self.conflict is None:
+            for inequality in entries1:
+                if find(inequality[0]) is find(inequality[1]):
+                    self.conflict = inequality
+                    break
+
+        if trail is not None:
+            trail.append((entries2.__delitem__,
+                          (slice(len(entries2), None),)))
+        entries2.extend(entries1)
+
+
+    def _merge_watches(self, child, root, node1, node2, reason):
+        """
+            Merge the watch lists of two classes that have just been merged
+            and report the watched pairs that have become equal.
+
+            Every such pair must be in both lists, so only the shorter list
+            is checked, and its unreported pairs are appended to the longer
+            one.
+
+            :type child: Node
+            :type root: Node
+            :type node1: Node
+            :type node2: Node
+            :param reason: The input equality, or None for congruent nodes.
+        """
+
+        index = self._watched
+        trail = self._trail
+        entries1 = index.get(child)
+        if not entries1:
+            return
+
+        entries2 = index.get(root)
+        if not entries2:
+            index[root] = entries1
+            if trail is not None:
+                trail.append((index.__setitem__, (root, entries2)))
+            return
+
+        if len(entries1) > len(entries2):
+            entries1, entries2 = entries2, entries1
+            index[root] = entries2
+            if trail is not None:
+                trail.append((index.__setitem__, (root, entries1)))
+
+        find = self._find
+        watches = self._watches
+        fired = self._fired
+        remaining = []
+        for n in entries1:
+            if fired[n]:
+                continue
+
+            pair = watches[n][0]
+            if find(pair[0]) is find(pair[1]):
+                self._fire(n)
+            else:
+                remaining.append(n)
+
+        if trail is not None:
+            trail.append((entries2.__delitem__,
+                          (slice(len(entries2), None),)))
+        entries2.extend(remaining)
+
+
+    def _index_lists(self):
+        """
+            Register the nodes of all equalities, inequalities and atoms that
+            have not been merged or indexed yet with the theory of lists,
+            index the new atoms, and merge the projections of all new cons
+            nodes.
+        """
+
+        theory = self._lists
+        nodes = [node for pair in self.merge_list[self._merged:]
+                 for node in pair]
+        nodes.extend([node for pair in self.inequality_list[self._listed:]
+                      for node in pair])
+        nodes.extend(self.atom_list[self._atoms_indexed:])
+        self._listed = len(self.inequality_list)
+
+        axioms, conflict = theory.register(nodes)
+        if self.conflict is None:
+            self.conflict = conflict
+
+        for node in self.atom_list[self._atoms_indexed:]:
+            conflict = theory.add_atom(node)
+            if self.conflict is None:
+                self.conflict = conflict
+        self._atoms_indexed = len(self.atom_list)
+
+        for projection, argument in axioms:
+            if self.conflict is not None:
+                return
+            self.merge(projection, argument)
+
+
+    def _merge_lists(self, child, root, node1, node2, reason):
+        """
+            Update the index of atoms and cons nodes of two classes that have
+            just been merged and check the merged class for a conflict.
+
+            :type child: Node
+            :type root: Node
+            :type node1: Node
+            :type node2: Node
+            :param reason: The input equality, or None for congruent nodes.
+        """
+
+        conflict = self._lists.merge(child, root)
+        if self.conflict is None:
+            self.conflict = conflict
+
+
+    def _record_proof(self, child, root, node1, node2, reason):
+        """
+            Add the merge of the two given nodes to the proof forest. The
+            node of the smaller class becomes the root of its proof tree, so
+            every node is moved to a new path at most a logarithmic number of
+            times.
+
+            :type child: Node
+            :type root: Node
+            :param node1: The merged node in the child's class.
+            :type node1: Node
+            :param node2: The merged node in the root's class.
+            :type node2: Node
+            :param reason: The input equality, or None for congruent nodes.
+        """
+
+        sizes = self._sizes
+        size1 = sizes.get(child, 1)
+        size2 = sizes.get(root, 1)
+        sizes[root] = size1 + size2
+        if self._trail is not None:
+            self._trail.append((sizes.__setitem__, (root, size2)))
+
+        if size1 <= size2:
+            self._proofs.add_edge(node1, node2, reason)
+        else:
+            self._proofs.add_edge(node2, node1, reason)
+
+
+    def explain(self, node1, node2):
+        """
+            Return the input equalities implying that the two given nodes are
+            equal. These are entries of the merge list, or the pairs of nodes
+            passed to merge().
+
+            :type node1: Node
+            :type node2: Node
+            :rtype: list[(Node, Node)]
+        """
+
+        if not self.explanations:
+            raise ValueError('The algorithm does not record explanations')
+        if not self._equal(node1, node2):
+            raise ValueError('The nodes are not in the same class')
+
+        return self._proofs.explain(node1, node2)
+
+
+    def explain_conflict(self):
+        """
+            Return a violated inequality and the input equalities implying
+            that its nodes are equal, or None if no inequality is violated.
+            For an algorithm for lists, the violated literal may also be an
+            atom and a cons node in its class. The equalities of the
+            projections of cons nodes are part of the explanations.
+
+            :rtype: ((Node, Node), list[(Node, Node)])
+        """
+
+        if self.eager:
+            self._index_disequalities()
+            inequality = self.conflict
+        else:
+            inequality = None
+            for candidate in self.inequality_list:
+                if self._equal(candidate[0], candidate[1]):
+                    inequality = candidate
+                    break
+            else:
+                inequality = self.conflict
+
+        if inequality is None:
+            return None
+
+        return inequality, self.explain(inequality[0], inequality[1])
+
+
+    def are_equal(self, node1, node2):
+        """
+            Return True if the two given nodes are in the same class.
+
+            :type node1: Node
+            :type node2: Node
+            :rtype: bool
+        """
+
+        return self._equal(node1, node2)
+
+
+    def _same_class(self, node1, node2):
+        """
+            :type node1: Node
+            :type node2: Node
+            :rtype: bool
+        """
+
+        find = self._find
+        return find(node1) is find(node2)
+
+
+    def classes(self):
+        """
+            Yield the equivalence classes of all nodes connected to the merge
+            list, the inequality list and the atom list, each as a list of its
+            members. Each class is yielded once.
+
+            The members are read from the circular lists spliced together by
+            the unions, so the time is linear in the number of nodes and the
+            classes are built one at a time while they are consumed. A lazy
+            algorithm first merges the equalities of all these nodes.
+
+            :rtype: generator[list[Node]]
+        """
+
+        if self.store is not None:
+            raise ValueError('The classes of a term store cannot be '
+                             'enumerated')
+
+        nodes = collect_nodes(self.merge_list, self.inequality_list +
+                              [(node, node) for node in self.atom_list])
+        if self.lazy:
+            self._index_partners()
+            self._expand(nodes)
+
+        listed = set()
+        for node in nodes:
+            if node in listed:
+                continue
+
+            members = node.get_class_members()
+            listed.update(members)
+            yield members
+
+
+    def model(self):
+        """
+            Yield the pairs (node, representative) of all nodes returned by
+            classes(), mapping each node to the representative of its class.
+            All members of a class are yielded one after another.
+
+            :rtype: generator[(Node, Node)]
+        """
+
+        find = self._find
+        for members in self.classes():
+            representative = find(members[0])
+            for node in members:
+                yield node, representative
 
 
     def check_satisfiability(self):
@@ -45,14 +1135,21 @@ class Algorithm(object):
             :rtype: bool
         """
 
+        # An eager algorithm has already checked all merged classes.
+        if self.eager:
+            self._index_disequalities()
+            return self.conflict is None
+
         # Check the inequality list.
+        equal = self._equal
         for inequality in self.inequality_list:
             node1, node2 = inequality
-            if node1.get_class_representative() == \
-               node2.get_class_representative():
+            if equal(node1, node2):
                 return False
 
-        # TODO: Implement checking atoms for T_cons.
+        # Atoms equal to cons nodes have been found while merging.
+        if self.conflict is not None:
+            return False
 
         # No contradictions found.
         return True
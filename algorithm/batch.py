@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+from multiprocessing import Pool, cpu_count
+from problem import Problem
+from serialize import loads
+
+
+def solve(problem):
+    """
+        Decide the satisfiability of a single problem, which may also be
+        given in its binary encoding.
+
+        :type problem: Problem | str
+        :rtype: bool
+    """
+
+    if isinstance(problem, str):
+        problem = loads(problem)
+
+    return problem.solve()
+
+
+def solve_many(problems, processes = None, chunksize = None):
+    """
+        Decide the satisfiability of many independent problems in a pool of
+        worker processes and return the results in the order of the input.
+
+        The problems are sent to the workers in their compact encoding, so no
+        nodes are ever pickled. Pairs of merge and inequality lists are
+        encoded before they are sent. Problems in their binary encoding (see
+        serialize.dumps) are sent as they are and only decoded by the
+        workers.
+
+        :type problems: list[Problem | str | (list[(Node, Node)],
+                                              list[(Node, Node)])]
+        :param processes: The number of worker processes, by default the
+                          number of CPUs. With a single process, all problems
+                          are solved in the current process.
+        :param chunksize: The number of problems sent to a worker at once. By
+                          default, each worker gets about four chunks.
+        :rtype: list[bool]
+    """
+
+    problems = [problem if isinstance(problem, (Problem, str))
+                else Problem.from_lists(*problem) for problem in problems]
+
+    if processes is None:
+        processes = cpu_count()
+    if processes <= 1 or len(problems) <= 1:
+        return [solve(problem) for problem in problems]
+
+    if chunksize is None:
+        chunksize = max(1, len(problems) // (4 * processes))
+
+    pool = Pool(processes)
+    try:
+        return pool.map(solve, problems, chunksize)
+    finally:
+        pool.close()
+        pool.join()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from algorithm.batch import solve_many
+from algorithm.init_test import create_example, create_random
+from algorithm.problem import Problem
+from algorithm.serialize import dumps
+
+
+class TestBatch(unittest.TestCase):
+    """
+        A collection of tests for solving batches of problems.
+    """
+
+
+    def test_solve_many(self):
+        expected = []
+        problems = []
+        for seed in range(0, 40):
+            merge_list, inequality_list = create_random(seed, 40)
+            problem = Problem.from_lists(merge_list, inequality_list)
+            problems.append(problem)
+            expected.append(problem.solve())
+
+        self.assertEqual(solve_many(problems, 1), expected)
+        self.assertEqual(solve_many(problems, 2), expected)
+        self.assertEqual(solve_many(problems, 3, 1), expected)
+        self.assertEqual(solve_many([]), [])
+
+
+    def test_solve_many_lists(self):
+        merge_list, inequality_list = create_example()
+        satisfiable = create_example()
+        self.assertEqual(solve_many([(merge_list, inequality_list),
+                                     (satisfiable[0][1:], satisfiable[1])],
+                                    2),
+                         [False, True])
+
+
+    def test_solve_many_serialized(self):
+        problems = [Problem.from_lists(*create_random(seed, 40))
+                    for seed in range(0, 10)]
+        expected = [problem.solve() for problem in problems]
+        data = [dumps(problem) for problem in problems]
+        self.assertEqual(solve_many(data, 2), expected)
+        self.assertEqual(solve_many(data, 1), expected)
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from algorithm import Algorithm
+from lists import CAR, CDR, CONS
+from problem import Problem
+from serialize import dumps
+
+
+def fingerprint(merge_list, inequality_list, atom_list = None, keep = ()):
+    """
+        Return a hash of the given literals and their terms that does not
+        depend on the function names: two formulas get the same fingerprint
+        if one results from the other by consistently renaming its function
+        names, given the literals are in the same order.
+
+        The terms are numbered in the order in which they are reached from
+        the literals, arguments first, and each function name is replaced by
+        the number of its first occurrence. Nodes that already have been
+        merged with other nodes are encoded with an additional equality.
+
+        :type merge_list: list[(Node, Node)]
+        :type inequality_list: list[(Node, Node)]
+        :type atom_list: list[Node]
+        :param keep: Function names that have a fixed meaning and must not be
+                     renamed.
+        :type keep: list[str]
+        :rtype: str
+    """
+
+    if atom_list is None:
+        atom_list = []
+
+    problem = Problem()
+    names = {}  # Dict: function name -> canonical name
+    ids = {}  # Dict: node -> term ID
+    merges = []
+
+    def add(root):
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node in ids:
+                stack.pop()
+                continue
+
+            missing = [argument for argument in reversed(node.arguments)
+                       if argument not in ids]
+            if missing:
+                stack.extend(missing)
+                continue
+
+            stack.pop()
+            name = node.name
+            if name not in keep:
+                name = names.setdefault(name, '#{0!s}'.format(len(names)))
+            ids[node] = problem.add_term(
+                name, [ids[argument] for argument in node.arguments])
+
+            if node.find is not node:
+                merges.append((node, node.find))
+
+        return ids[root]
+
+    for node1, node2 in merge_list:
+        problem.add_merge(add(node1), add(node2))
+    for node1, node2 in inequality_list:
+        problem.add_inequality(add(node1), add(node2))
+    atoms = [add(node) for node in atom_list]
+
+    # Find pointers may lead to further nodes.
+    while merges:
+        node1, node2 = merges.pop()
+        problem.add_merge(ids[node1], add(node2))
+
+    digest = hashlib.sha1(dumps(problem))
+    digest.update(repr(atoms))
+    return digest.hexdigest()
+
+
+class QueryCache(object):
+    """
+        A bounded cache of the results of satisfiability checks, keyed by the
+        fingerprints of the formulas. The least recently used entry is
+        dropped when the cache is full.
+
+        Each entry contains the verdict and, if it has been computed, an
+        explanation of the conflict as positions in the inequality and merge
+        lists, so it applies to all formulas with the same fingerprint.
+    """
+
+
+    def __init__(self, capacity = 1024, path = None):
+        """
+            Initialize the cache, loading its entries from the given file if
+            it exists.
+
+            :param capacity: The maximum number of entries.
+            :type capacity: int
+            :param path: The file save() writes the entries to.
+            :type path: str
+        """
+
+        if capacity < 1:
+            raise ValueError('The capacity must be positive')
+
+        self.capacity = capacity
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # Dict: key -> (bool, explanation)
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as stream:
+                entries = pickle.load(stream)
+            for key, entry in entries[-capacity:]:
+                self._entries[key] = entry
+
+
+    def __len__(self):
+        """
+            :rtype: int
+        """
+
+        return len(self._entries)
+
+
+    def __contains__(self, key):
+        """
+            :type key: str
+            :rtype: bool
+        """
+
+        return key in self._entries
+
+
+    def get(self, key):
+        """
+            Return the entry with the given key and mark it as recently used,
+            or return None.
+
+            :type key: str
+            :rtype: (bool, (int, list[int]))
+        """
+
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._entries[key] = entry
+
+        return entry
+
+
+    def put(self, key, entry):
+        """
+            Add or replace an entry, dropping the least recently used entry if
+            the cache is full.
+
+            :type key: str
+            :type entry: (bool, (int, list[int]))
+        """
+
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last = False)
+
+
+    def save(self):
+        """
+            Write all entries to the cache's file. The file is replaced
+            atomically, so a failed write does not destroy earlier entries.
+        """
+
+        if self.path is None:
+            raise ValueError('The cache has no file')
+
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as stream:
+            pickle.dump(self._entries.items(), stream,
+                        pickle.HIGHEST_PROTOCOL)
+        os.rename(temporary, self.path)
+
+
+    def key(self, merge_list, inequality_list, atom_list = None,
+            lists = False):
+        """
+            Return the key of a formula. For the theory of lists, the names of
+            the list functions are not renamed.
+
+            :type merge_list: list[(Node, Node)]
+            :type inequality_list: list[(Node, Node)]
+            :type atom_list: list[Node]
+            :type lists: bool
+            :rtype: str
+        """
+
+        if lists:
+            return 'lists:' + fingerprint(merge_list, inequality_list,
+                                          atom_list, (CONS, CAR, CDR))
+
+        return fingerprint(merge_list, inequality_list, atom_list)
+
+
+    def solve(self, merge_list, inequality_list, atom_list = None,
+              **options):
+        """
+            Decide the satisfiability of a formula, using the cached verdict
+            if there is one.
+
+            :type merge_list: list[(Node, Node)]
+            :type inequality_list: list[(Node, Node)]
+            :type atom_list: list[Node]
+            :param options: Passed to the constructor of the algorithm.
+            :rtype: bool
+        """
+
+        key = self.key(merge_list, inequality_list, atom_list,
+                       options.get('lists', False))
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        return self._solve(key, merge_list, inequality_list, atom_list,
+                           options)[0]
+
+
+    def explain(self, merge_list, inequality_list, atom_list = None,
+                **options):
+        """
+            Return the same result as Algorithm.explain_conflict() for a
+            formula, using the cached explanation if there is one.
+
+            :type merge_list: list[(Node, Node)]
+            :type inequality_list: list[(Node, Node)]
+            :type atom_list: list[Node]
+            :param options: Passed to the constructor of the algorithm.
+            :rtype: ((Node, Node), list[(Node, Node)])
+        """
+
+        key = self.key(merge_list, inequality_list, atom_list,
+                       options.get('lists', False))
+        entry = self.get(key)
+        if entry is not None and (entry[0] or entry[1] is not None):
+            self.hits += 1
+        else:
+            self.misses += 1
+            options['explain'] = True
+            entry = self._solve(key, merge_list, inequality_list, atom_list,
+                                options)
+
+        satisfiable, explanation = entry
+        if satisfiable:
+            return None
+        if explanation is None:
+            raise ValueError('The conflict cannot be explained by the '
+                             'literals alone')
+
+        inequality, merges = explanation
+        return (inequality_list[inequality],
+                [merge_list[n] for n in merges])
+
+
+    def _solve(self, key, merge_list, inequality_list, atom_list, options):
+        """
+            Decide the satisfiability of a formula and add the result to the
+            cache.
+
+            The explanation is only kept if it consists of the given literals,
+            i.e. not for conflicts of atoms or explanations containing the
+            projections of cons nodes.
+
+            :type key: str
+            :type merge_list: list[(Node, Node)]
+            :type inequality_list: list[(Node, Node)]
+            :type atom_list: list[Node]
+            :type options: dict
+            :rtype: (bool, (int, list[int]))
+        """
+
+        alg = Algorithm(list(merge_list), list(inequality_list),
+                        atom_list = atom_list and list(atom_list), **options)
+        alg.merge_nodes()
+        satisfiable = alg.check_satisfiability()
+
+        explanation = None
+        if not satisfiable and alg.explanations:
+            positions = dict([(id(merge), n)
+                              for n, merge in enumerate(merge_list)])
+            inequalities = dict([(id(inequality), n)
+                                 for n, inequality
+                                 in enumerate(inequality_list)])
+            inequality, reasons = alg.explain_conflict()
+            if id(inequality) in inequalities and \
+                    all([id(reason) in positions for reason in reasons]):
+                explanation = (inequalities[id(inequality)],
+                               [positions[id(reason)] for reason in reasons])
+
+        entry = (satisfiable, explanation)
+        self.put(key, entry)
+        return entry
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from algorithm.cache import QueryCache, fingerprint
+from algorithm.init_test import create_example, create_random
+from algorithm.lists import CONS
+from algorithm.node import Node
+
+
+def create_renamed(f = 'f', g = 'g', x = 'x', y = 'y'):
+    """
+        Create the example with other function names.
+    """
+
+    node3 = Node(x)
+    node2 = Node(g, [node3])
+    node1 = Node(f, [node2])
+    node7 = Node(y)
+    node6 = Node(f, [node7])
+    node5 = Node(g, [node6])
+    node4 = Node(f, [node5])
+    node9 = Node(f, [node3])
+    node8 = Node(g, [node9])
+    return [(node1, node8), (node4, node3), (node6, node3)], [(node8, node3)]
+
+
+class TestQueryCache(unittest.TestCase):
+    """
+        A collection of tests for fingerprints and the query cache.
+    """
+
+
+    def test_fingerprint(self):
+        key = fingerprint(*create_renamed())
+        self.assertEqual(fingerprint(*create_renamed()), key)
+        self.assertEqual(fingerprint(*create_renamed('h', 'k', 'u', 'v')),
+                         key)
+        self.assertEqual(fingerprint(*create_example()), key)
+
+        # Different structures.
+        self.assertNotEqual(fingerprint(*create_renamed('f', 'f')), key)
+        merge_list, inequality_list = create_renamed()
+        self.assertNotEqual(fingerprint(merge_list[:2], inequality_list),
+                            key)
+        self.assertNotEqual(fingerprint(merge_list, inequality_list,
+                                        [merge_list[0][0]]), key)
+
+        # Fixed names are kept.
+        self.assertNotEqual(fingerprint(*create_renamed('h'), keep = ['f']),
+                            fingerprint(*create_renamed(), keep = ['f']))
+
+
+    def test_find_pointers(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        key = fingerprint([], [(x, y)])
+        x.find = z
+        self.assertNotEqual(fingerprint([], [(x, y)]), key)
+
+
+    def test_solve(self):
+        cache = QueryCache()
+        self.assertFalse(cache.solve(*create_renamed()))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertFalse(cache.solve(*create_renamed('h', 'k')))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(len(cache), 1)
+
+        for seed in range(0, 10):
+            cache = QueryCache()
+            expected = cache.solve(*create_random(seed, 40))
+            self.assertEqual(cache.solve(*create_random(seed, 40)), expected)
+            self.assertEqual(cache.hits, 1)
+
+
+    def test_explain(self):
+        cache = QueryCache()
+        merge_list, inequality_list = create_renamed()
+        inequality, reasons = cache.explain(merge_list, inequality_list)
+        self.assertIs(inequality, inequality_list[0])
+        self.assertEqual(set(map(id, reasons)), set(map(id, merge_list)))
+
+        # The explanation refers to the literals of the new formula.
+        merge_list, inequality_list = create_renamed('h', 'k')
+        inequality, reasons = cache.explain(merge_list, inequality_list)
+        self.assertEqual(cache.hits, 1)
+        self.assertIs(inequality, inequality_list[0])
+        self.assertEqual(set(map(id, reasons)), set(map(id, merge_list)))
+
+        self.assertIsNone(cache.explain([], [(Node('a'), Node('b'))]))
+
+        # A verdict cached without explanation is solved again.
+        cache = QueryCache()
+        cache.solve(*create_renamed())
+        self.assertIsNotNone(cache.explain(*create_renamed()))
+        self.assertEqual(cache.misses, 2)
+
+
+    def test_lists(self):
+        cache = QueryCache()
+        x = Node('x')
+        cons = Node(CONS, [Node('a'), Node('b')])
+        self.assertFalse(cache.solve([(x, cons)], [], [x], lists = True))
+
+        # The list functions are not renamed.
+        x = Node('x')
+        cons = Node('pair', [Node('a'), Node('b')])
+        self.assertTrue(cache.solve([(x, cons)], [], [x], lists = True))
+        self.assertEqual(cache.hits, 0)
+
+        x = Node('x')
+        cons = Node(CONS, [Node('a'), Node('b')])
+        self.assertRaises(ValueError, cache.explain, [(x, cons)], [], [x],
+                          lists = True)
+
+
+    def test_lru(self):
+        cache = QueryCache(2)
+        cache.put('a', (True, None))
+        cache.put('b', (True, None))
+        self.assertEqual(cache.get('a'), (True, None))
+        cache.put('c', (False, None))
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertRaises(ValueError, QueryCache, 0)
+
+
+    def test_save(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'cache')
+            cache = QueryCache(path = path)
+            cache.solve(*create_renamed())
+            cache.put('a', (True, None))
+            cache.save()
+
+            cache = QueryCache(path = path)
+            self.assertEqual(len(cache), 2)
+            self.assertFalse(cache.solve(*create_renamed('h')))
+            self.assertEqual(cache.hits, 1)
+
+            # Only the most recently used entries are loaded.
+            cache = QueryCache(1, path)
+            self.assertEqual(len(cache), 1)
+            self.assertIn('a', cache)
+            self.assertRaises(ValueError, QueryCache().save)
+        finally:
+            shutil.rmtree(directory)
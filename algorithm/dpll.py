@@ -0,0 +1,541 @@
+# -*- coding: utf-8 -*-
+
+"""
+    A DPLL(T) solver for clauses of equalities and inequalities between
+    nodes. The Boolean search is a conflict-driven clause learning (CDCL)
+    solver with two watched literals per clause, first-UIP conflict
+    analysis, an activity-based decision heuristic with phase saving, and
+    restarts following the Luby sequence. The theory is decided by an
+    incremental, eager algorithm with explanations: every assigned literal
+    is asserted as soon as it is assigned, each decision level is a scope of
+    the algorithm, and a violated inequality is turned into a conflict
+    clause consisting of the inequality and the equalities explaining it.
+
+    Literals are non-zero integers as in the DIMACS format: literal(node1,
+    node2) returns the variable of the equality node1 = node2, and its
+    negation is the inequality node1 != node2.
+"""
+
+import heapq
+from algorithm import Algorithm
+
+
+def luby(n):
+    """
+        Return the n-th element of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1,
+        ... starting with n = 1.
+
+        :type n: int
+        :rtype: int
+    """
+
+    while True:
+        # The sequence consists of blocks of 2^k - 1 elements ending with
+        # 2^(k - 1), each block repeating the previous one twice.
+        k = 1
+        while (1 << k) - 1 < n:
+            k += 1
+        if n == (1 << k) - 1:
+            return 1 << (k - 1)
+        n -= (1 << (k - 1)) - 1
+
+
+class Solver(object):
+    """
+        A CDCL solver using the congruence closure as its theory solver.
+    """
+
+
+    def __init__(self, restart_interval = 64, decay = 0.95):
+        """
+            Initialize a solver without any clauses.
+
+            :param restart_interval: The number of conflicts between two
+                                     restarts is this number times the next
+                                     element of the Luby sequence.
+            :type restart_interval: int
+            :param decay: The factor by which the activities of all variables
+                          decay after each conflict.
+            :type decay: float
+        """
+
+        self.restart_interval = restart_interval
+        self.decay = decay
+
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.restarts = 0
+        self.learned = 0
+
+        self._theory = Algorithm(incremental = True, eager = True,
+                                 explain = True)
+        self._variables = {}  # Dict: (node, node) -> variable
+        self._atoms = [None]  # List: variable -> (node, node)
+
+        # The clauses and the clauses watching each literal.
+        self._clauses = []  # List of lists of literals
+        self._watches = {}  # Dict: literal -> list of clauses
+
+        # The assignment: the value, decision level and reason clause of
+        # each variable, the assigned literals in order, and the position in
+        # the trail of each decision level's first literal.
+        self._values = [None]  # List: variable -> bool
+        self._levels = [0]  # List: variable -> int
+        self._reasons = [None]  # List: variable -> clause
+        self._trail = []  # List of literals
+        self._limits = []  # List of int
+        self._head = 0  # The first literal not propagated yet
+
+        # The decision heuristic.
+        self._activity = [0.0]  # List: variable -> float
+        self._increment = 1.0
+        self._phases = [False]  # List: variable -> bool
+        self._heap = []  # Heap of (-activity, variable)
+
+        # False once an empty clause has been derived.
+        self._consistent = True
+
+
+    def literal(self, node1, node2):
+        """
+            Return the positive literal of the equality of the two given
+            nodes, creating a new variable for it if needed.
+
+            :type node1: Node
+            :type node2: Node
+            :rtype: int
+        """
+
+        # The atom keeps the order of the nodes it has been created with.
+        if id(node1) > id(node2):
+            key = (node2, node1)
+        else:
+            key = (node1, node2)
+
+        variable = self._variables.get(key)
+        if variable is not None:
+            return variable
+
+        variable = len(self._atoms)
+        self._variables[key] = variable
+        self._atoms.append((node1, node2))
+        self._values.append(None)
+        self._levels.append(0)
+        self._reasons.append(None)
+        self._activity.append(0.0)
+        self._phases.append(False)
+        heapq.heappush(self._heap, (0.0, variable))
+        return variable
+
+
+    def atom(self, literal):
+        """
+            Return the nodes of the equality of the given literal's variable.
+
+            :type literal: int
+            :rtype: (Node, Node)
+        """
+
+        return self._atoms[abs(literal)]
+
+
+    def add_clause(self, literals):
+        """
+            Add a clause, i.e. a disjunction of literals. Clauses may be added
+            between two calls of solve().
+
+            Return False if the clauses have become unsatisfiable.
+
+            :type literals: list[int]
+            :rtype: bool
+        """
+
+        self._backtrack(0)
+        if not self._consistent:
+            return False
+
+        # Drop duplicates and false literals, and skip satisfied clauses.
+        clause = []
+        for literal in literals:
+            if not literal or abs(literal) >= len(self._atoms):
+                raise ValueError('Unknown literal: {0!s}'.format(literal))
+            if -literal in clause:
+                return True
+
+            value = self._value(literal)
+            if value is True:
+                return True
+            if value is None and literal not in clause:
+                clause.append(literal)
+
+        if not clause:
+            self._consistent = False
+        elif len(clause) == 1:
+            self._assign(clause[0], None)
+            self._consistent = self._propagate() is None
+        else:
+            self._watch(clause)
+
+        return self._consistent
+
+
+    def solve(self):
+        """
+            Decide the satisfiability of the clauses. If they are
+            satisfiable, the assignment found is available by value() until
+            the next clause is added.
+
+            :rtype: bool
+        """
+
+        if not self._consistent:
+            return False
+
+        restarts = 1
+        budget = self.restart_interval * luby(restarts)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                budget -= 1
+                if not self._limits:
+                    self._consistent = False
+                    return False
+
+                learned, level = self._analyze(conflict)
+                self._backtrack(level)
+                self._learn(learned)
+                continue
+
+            if budget <= 0:
+                self.restarts += 1
+                restarts += 1
+                budget = self.restart_interval * luby(restarts)
+                self._backtrack(0)
+                continue
+
+            variable = self._decide()
+            if variable is None:
+                return True
+
+            self.decisions += 1
+            self._limits.append(len(self._trail))
+            self._theory.push()
+            if self._phases[variable]:
+                self._assign(variable, None)
+            else:
+                self._assign(-variable, None)
+
+
+    def value(self, literal):
+        """
+            Return the value of a literal in the current assignment, or None
+            if it is unassigned.
+
+            :type literal: int
+            :rtype: bool
+        """
+
+        return self._value(literal)
+
+
+    def model(self):
+        """
+            Return the equalities and inequalities of the current assignment.
+
+            :rtype: (list[(Node, Node)], list[(Node, Node)])
+        """
+
+        equalities = []
+        inequalities = []
+        for variable in range(1, len(self._atoms)):
+            value = self._values[variable]
+            if value is True:
+                equalities.append(self._atoms[variable])
+            elif value is False:
+                inequalities.append(self._atoms[variable])
+
+        return equalities, inequalities
+
+
+    def _value(self, literal):
+        """
+            :type literal: int
+            :rtype: bool
+        """
+
+        value = self._values[abs(literal)]
+        if value is None or literal > 0:
+            return value
+
+        return not value
+
+
+    def _watch(self, clause):
+        """
+            Watch the first two literals of a clause.
+
+            :type clause: list[int]
+        """
+
+        self._clauses.append(clause)
+        for literal in clause[:2]:
+            self._watches.setdefault(literal, []).append(clause)
+
+
+    def _assign(self, literal, reason):
+        """
+            Make a literal true.
+
+            :type literal: int
+            :param reason: The clause implying the literal, or None for
+                           decisions and units.
+            :type reason: list[int]
+        """
+
+        variable = abs(literal)
+        self._values[variable] = literal > 0
+        self._levels[variable] = len(self._limits)
+        self._reasons[variable] = reason
+        self._trail.append(literal)
+
+
+    def _propagate(self):
+        """
+            Assert all assigned literals that have not been asserted yet in
+            the theory and propagate them through the clauses watching their
+            negations.
+
+            Return a clause whose literals are all false, or None.
+
+            :rtype: list[int]
+        """
+
+        trail = self._trail
+        watches = self._watches
+        value = self._value
+        while self._head < len(trail):
+            literal = trail[self._head]
+            self._head += 1
+            self.propagations += 1
+
+            conflict = self._assert(literal)
+            if conflict is not None:
+                return conflict
+
+            false = -literal
+            watching = watches.get(false)
+            if not watching:
+                continue
+
+            kept = []
+            for n in range(0, len(watching)):
+                clause = watching[n]
+
+                # Keep the false literal at the second position.
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+
+                if value(clause[0]) is True:
+                    kept.append(clause)
+                    continue
+
+                # Look for another literal to watch.
+                for m in range(2, len(clause)):
+                    if value(clause[m]) is not False:
+                        clause[1], clause[m] = clause[m], false
+                        watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if value(clause[0]) is False:
+                        kept.extend(watching[n + 1:])
+                        watches[false] = kept
+                        return clause
+
+                    self._assign(clause[0], clause)
+
+            watches[false] = kept
+
+        return None
+
+
+    def _assert(self, literal):
+        """
+            Assert a literal in the theory. Return a clause whose literals are
+            all false if the theory becomes inconsistent, or None.
+
+            :type literal: int
+            :rtype: list[int]
+        """
+
+        theory = self._theory
+        node1, node2 = self._atoms[abs(literal)]
+        if literal > 0:
+            theory.merge(node1, node2, literal)
+        else:
+            theory.assert_inequality(node1, node2)
+
+        if theory.conflict is None:
+            return None
+
+        # The violated inequality and the equalities implying its nodes'
+        # equality.
+        inequality, equalities = theory.explain_conflict()
+        conflict = [self.literal(inequality[0], inequality[1])]
+        for equality in equalities:
+            if -equality not in conflict:
+                conflict.append(-equality)
+
+        return conflict
+
+
+    def _analyze(self, conflict):
+        """
+            Derive the first-UIP clause from a conflict clause, and return it
+            together with the decision level to return to. The asserting
+            literal is the first literal of the learned clause.
+
+            :type conflict: list[int]
+            :rtype: (list[int], int)
+        """
+
+        levels = self._levels
+        reasons = self._reasons
+        trail = self._trail
+        level = len(self._limits)
+        seen = set()
+        learned = [None]
+        counter = 0
+        position = len(trail) - 1
+        literal = None
+        clause = conflict
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen or \
+                        not levels[variable]:
+                    continue
+
+                seen.add(variable)
+                self._bump(variable)
+                if levels[variable] == level:
+                    counter += 1
+                else:
+                    learned.append(other)
+
+            # The next literal of the current level on the trail.
+            while abs(trail[position]) not in seen:
+                position -= 1
+            literal = trail[position]
+            position -= 1
+            counter -= 1
+            if not counter:
+                break
+
+            clause = reasons[abs(literal)]
+
+        learned[0] = -literal
+        self._increment /= self.decay
+
+        # Watch the literal of the highest level after the asserting one.
+        if len(learned) == 1:
+            return learned, 0
+
+        highest = 1
+        for n in range(2, len(learned)):
+            if levels[abs(learned[n])] > levels[abs(learned[highest])]:
+                highest = n
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, levels[abs(learned[1])]
+
+
+    def _learn(self, clause):
+        """
+            Add a learned clause after backtracking and assign its asserting
+            literal.
+
+            :type clause: list[int]
+        """
+
+        self.learned += 1
+        if len(clause) == 1:
+            self._assign(clause[0], None)
+        else:
+            self._watch(clause)
+            self._assign(clause[0], clause)
+
+
+    def _backtrack(self, level):
+        """
+            Undo all assignments above the given decision level.
+
+            :type level: int
+        """
+
+        limits = self._limits
+        if len(limits) <= level:
+            return
+
+        trail = self._trail
+        start = limits[level]
+        for n in range(len(trail) - 1, start - 1, -1):
+            literal = trail[n]
+            variable = abs(literal)
+            self._phases[variable] = literal > 0
+            self._values[variable] = None
+            self._reasons[variable] = None
+            heapq.heappush(self._heap, (-self._activity[variable], variable))
+
+        del trail[start:]
+        self._head = min(self._head, start)
+        for _ in range(level, len(limits)):
+            self._theory.pop()
+        del limits[level:]
+
+
+    def _bump(self, variable):
+        """
+            Increase the activity of a variable involved in a conflict.
+
+            :type variable: int
+        """
+
+        activity = self._activity
+        activity[variable] += self._increment
+
+        # Rescale all activities before they overflow.
+        if activity[variable] > 1e100:
+            for n in range(1, len(activity)):
+                activity[n] *= 1e-100
+            self._increment *= 1e-100
+            self._heap = [(-activity[n], n) for n in range(1, len(activity))
+                          if self._values[n] is None]
+            heapq.heapify(self._heap)
+        elif self._values[variable] is None:
+            heapq.heappush(self._heap, (-activity[variable], variable))
+
+
+    def _decide(self):
+        """
+            Return the unassigned variable with the highest activity, or None
+            if all variables are assigned.
+
+            :rtype: int
+        """
+
+        heap = self._heap
+        values = self._values
+        activity = self._activity
+        while heap:
+            priority, variable = heapq.heappop(heap)
+            if values[variable] is None and -priority == activity[variable]:
+                return variable
+
+        # Entries may be outdated after the activities were rescaled.
+        for variable in range(1, len(values)):
+            if values[variable] is None:
+                return variable
+
+        return None
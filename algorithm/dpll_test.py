@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import random
+import unittest
+from algorithm import Algorithm
+from algorithm.dpll import Solver, luby
+from algorithm.node import Node
+
+
+def create_problem(seed):
+    """
+        Create a random set of clauses over equalities of a small DAG.
+
+        :type seed: int
+        :rtype: (list[(Node, Node)], list[list[int]])
+    """
+
+    rng = random.Random(seed)
+    nodes = [Node(name) for name in 'abcd']
+    for _ in range(0, rng.randint(2, 6)):
+        nodes.append(Node(rng.choice('fg'), [rng.choice(nodes)]))
+
+    pairs = [(rng.choice(nodes), rng.choice(nodes))
+             for _ in range(0, rng.randint(2, 7))]
+    clauses = [[rng.choice([1, -1]) * rng.randint(1, len(pairs))
+                for _ in range(0, rng.randint(1, 3))]
+               for _ in range(0, rng.randint(1, 10))]
+    return pairs, clauses
+
+
+def enumerate_problem(seed):
+    """
+        Decide the satisfiability of a random set of clauses by solving the
+        conjunction of each satisfying assignment.
+
+        :type seed: int
+        :rtype: bool
+    """
+
+    pairs, clauses = create_problem(seed)
+    for values in itertools.product([False, True], repeat = len(pairs)):
+        if not all([any([values[abs(literal) - 1] == (literal > 0)
+                         for literal in clause]) for clause in clauses]):
+            continue
+
+        # The nodes of each conjunction must not have been merged before.
+        pairs, clauses = create_problem(seed)
+        alg = Algorithm([pairs[n] for n in range(0, len(pairs)) if values[n]],
+                        [pairs[n] for n in range(0, len(pairs))
+                         if not values[n]])
+        alg.merge_nodes()
+        if alg.check_satisfiability():
+            return True
+
+    return False
+
+
+class TestSolver(unittest.TestCase):
+    """
+        A collection of tests for the DPLL(T) solver.
+    """
+
+
+    def test_luby(self):
+        self.assertEqual([luby(n) for n in range(1, 16)],
+                         [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+
+
+    def test_literal(self):
+        x = Node('x')
+        y = Node('y')
+        solver = Solver()
+        literal = solver.literal(x, y)
+        self.assertEqual(literal, 1)
+        self.assertEqual(solver.literal(y, x), literal)
+        self.assertEqual(solver.atom(-literal), (x, y))
+        self.assertRaises(ValueError, solver.add_clause, [2])
+
+
+    def test_sat(self):
+        # (x = y or x = z) and f(x) != f(y)
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        fx = Node('f', [x])
+        fy = Node('f', [y])
+        solver = Solver()
+        xy = solver.literal(x, y)
+        xz = solver.literal(x, z)
+        self.assertTrue(solver.add_clause([xy, xz]))
+        self.assertTrue(solver.add_clause([-solver.literal(fx, fy)]))
+        self.assertTrue(solver.solve())
+        self.assertFalse(solver.value(xy))
+        self.assertTrue(solver.value(xz))
+
+        equalities, inequalities = solver.model()
+        self.assertEqual(equalities, [(x, z)])
+        self.assertEqual(len(inequalities), 2)
+
+
+    def test_unsat(self):
+        # (x = y or x = z) and (y = z) and f(x) != f(z)
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        fx = Node('f', [x])
+        fz = Node('f', [z])
+        solver = Solver()
+        solver.add_clause([solver.literal(x, y), solver.literal(x, z)])
+        solver.add_clause([solver.literal(y, z)])
+        solver.add_clause([-solver.literal(fx, fz)])
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.conflicts, 0)
+
+        # Once unsatisfiable, the clauses stay unsatisfiable.
+        self.assertFalse(solver.add_clause([solver.literal(x, z)]))
+        self.assertFalse(solver.solve())
+
+
+    def test_incremental(self):
+        nodes = [Node('x{0!s}'.format(n)) for n in range(0, 6)]
+        solver = Solver()
+        literals = [solver.literal(nodes[n], nodes[n + 1])
+                    for n in range(0, 5)]
+        self.assertTrue(solver.add_clause(literals))
+        self.assertTrue(solver.solve())
+
+        # Exclude each equality one after another.
+        for n in range(0, 4):
+            self.assertTrue(solver.add_clause([-literals[n]]))
+            self.assertTrue(solver.solve())
+            self.assertTrue(solver.value(literals[-1]))
+
+        # The last one is implied by the first clause.
+        self.assertFalse(solver.add_clause([-literals[-1]]))
+        self.assertFalse(solver.solve())
+
+
+    def test_transitivity(self):
+        # A chain of disjunctions x_i = y_i or x_i = z_i, where all y_i and z_i
+        # are equal to x_(i + 1), and x_0 != x_n.
+        size = 8
+        xs = [Node('x{0!s}'.format(n)) for n in range(0, size + 1)]
+        solver = Solver(restart_interval = 4)
+        for n in range(0, size):
+            y = Node('y{0!s}'.format(n))
+            z = Node('z{0!s}'.format(n))
+            solver.add_clause([solver.literal(xs[n], y),
+                               solver.literal(xs[n], z)])
+            solver.add_clause([solver.literal(y, xs[n + 1])])
+            solver.add_clause([solver.literal(z, xs[n + 1])])
+        solver.add_clause([-solver.literal(xs[0], xs[size])])
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.learned, 0)
+
+
+    def test_random(self):
+        for seed in range(0, 150):
+            pairs, clauses = create_problem(seed)
+            solver = Solver(restart_interval = 1 + seed % 3)
+            literals = [solver.literal(node1, node2) for node1, node2 in pairs]
+            for clause in clauses:
+                solver.add_clause([cmp(literal, 0) * literals[abs(literal) - 1]
+                                   for literal in clause])
+
+            satisfiable = solver.solve()
+            self.assertEqual(satisfiable, enumerate_problem(seed))
+            if satisfiable:
+                for clause in clauses:
+                    self.assertTrue(any([
+                        solver.value(cmp(literal, 0) *
+                                     literals[abs(literal) - 1])
+                        for literal in clause]))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from weakref import WeakValueDictionary
+from node import Node
+
+
+class TermFactory(object):
+    """
+        Create nodes such that structurally identical terms are represented
+        by a single node. Each term is looked up by its function name and the
+        identities of its argument nodes, so a DAG built with a factory never
+        contains duplicate subterms.
+    """
+
+
+    def __init__(self, weak = False):
+        """
+            Initialize the factory.
+
+            :param weak: If True, the factory does not keep its nodes alive:
+                         a node is dropped from the table as soon as it is no
+                         longer referenced anywhere else.
+        """
+
+        if weak:
+            self._table = WeakValueDictionary()
+        else:
+            self._table = {}
+
+
+    def __len__(self):
+        """
+            Return the number of distinct terms created by this factory.
+
+            :rtype: int
+        """
+
+        return len(self._table)
+
+
+    def term(self, name, arguments = None):
+        """
+            Return the node for the given function name applied to the given
+            arguments, creating it only if it does not exist yet.
+
+            The arguments must have been created by this factory as well.
+
+            :type name: str
+            :type arguments: list[Node]
+            :rtype: Node
+        """
+
+        if arguments is None:
+            arguments = []
+
+        # The arguments are kept alive by the node, so their IDs cannot be
+        # reused as long as the node is part of the table.
+        key = (name,) + tuple([id(argument) for argument in arguments])
+        node = self._table.get(key)
+        if node is None:
+            node = Node(name, list(arguments))
+            self._table[key] = node
+
+        return node
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import gc
+import unittest
+from algorithm.factory import TermFactory
+
+
+class TestTermFactory(unittest.TestCase):
+    """
+        A collection of tests for the entire TermFactory class.
+    """
+
+
+    def test_term(self):
+        factory = TermFactory()
+        x = factory.term('x')
+        y = factory.term('y')
+        fx = factory.term('f', [x])
+
+        self.assertEqual(fx.name, 'f')
+        self.assertEqual(fx.arguments, [x])
+        self.assertEqual(x.parents, {fx})
+
+        # Identical terms are created only once.
+        self.assertIs(factory.term('x'), x)
+        self.assertIs(factory.term('f', [x]), fx)
+        self.assertIs(factory.term('f', [factory.term('x')]), fx)
+        self.assertEqual(x.parents, {fx})
+        self.assertEqual(len(factory), 3)
+
+        # Different names or arguments create different terms.
+        self.assertIsNot(factory.term('f', [y]), fx)
+        self.assertIsNot(factory.term('g', [x]), fx)
+        self.assertIsNot(factory.term('f', [x, x]), fx)
+        self.assertEqual(len(factory), 6)
+
+
+    def test_weak(self):
+        factory = TermFactory(weak = True)
+        x = factory.term('x')
+        fx = factory.term('f', [x])
+        factory.term('g')
+        gc.collect()
+
+        # The unreferenced node g has been dropped. f(x) is still referenced
+        # as a parent of x.
+        self.assertEqual(len(factory), 2)
+        self.assertIs(factory.term('f', [x]), fx)
+
+        del x, fx
+        gc.collect()
+        self.assertEqual(len(factory), 0)
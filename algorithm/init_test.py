@@ -1,9 +1,640 @@
 # -*- coding: utf-8 -*-
 
+import random
 import unittest
+import algorithm
+from algorithm import Algorithm
+from algorithm.node import Node
+from algorithm.store import TermStore
+
+
+def create_example():
+    """
+        f(g(x)) == g(f(x)) && f(g(f(y))) == x && f(y) == x && g(f(x)) != x
+
+        :rtype: (list[(Node, Node)], list[(Node, Node)])
+    """
+
+    x = Node('x')
+    y = Node('y')
+    gx = Node('g', [x])
+    fgx = Node('f', [gx])
+    fx = Node('f', [x])
+    gfx = Node('g', [fx])
+    fy = Node('f', [y])
+    gfy = Node('g', [fy])
+    fgfy = Node('f', [gfy])
+
+    return [(fgx, gfx), (fgfy, x), (fy, x)], [(gfx, x)]
+
+
+def create_random(seed, size):
+    """
+        Create a random conjunction of equalities and inequalities over unary
+        and binary terms without duplicate terms.
+
+        :rtype: (list[(Node, Node)], list[(Node, Node)])
+    """
+
+    generator = random.Random(seed)
+    terms = {}
+    nodes = []
+    for name in ['a', 'b', 'c']:
+        nodes.append(Node(name))
+
+    while len(nodes) < size:
+        name = generator.choice(['f', 'g'])
+        arguments = tuple(generator.sample(range(0, len(nodes)),
+                                           1 if name == 'f' else 2))
+        if (name, arguments) in terms:
+            continue
+
+        terms[(name, arguments)] = Node(name, [nodes[n] for n in arguments])
+        nodes.append(terms[(name, arguments)])
+
+    merge_list = [tuple(generator.sample(nodes, 2))
+                  for _ in range(0, size // 4)]
+    inequality_list = [tuple(generator.sample(nodes, 2))
+                       for _ in range(0, 2)]
+    return merge_list, inequality_list
 
 
 class TestAlgorithm(unittest.TestCase):
     """
         A collection of tests for the entire Algorithm class.
     """
+
+
+    def test_strategy(self):
+        self.assertEqual(Algorithm().strategy, Algorithm.SIGNATURE)
+        self.assertRaises(ValueError, Algorithm, [], [], 'unknown')
+
+        for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            merge_list, inequality_list = create_example()
+            alg = Algorithm(merge_list, inequality_list, strategy)
+            alg.merge_nodes()
+            self.assertFalse(alg.check_satisfiability())
+
+            merge_list, inequality_list = create_example()
+            alg = Algorithm(merge_list[1:], inequality_list, strategy)
+            alg.merge_nodes()
+            self.assertTrue(alg.check_satisfiability())
+
+
+    def test_store(self):
+        self.assertIs(algorithm.TermStore, TermStore)
+
+        merge_list, inequality_list = create_example()
+        store, merges, inequalities, _ = TermStore.load(merge_list,
+                                                        inequality_list)
+        alg = Algorithm(merges, inequalities, store = store)
+        alg.merge_nodes()
+        self.assertFalse(alg.check_satisfiability())
+
+        merge_list, inequality_list = create_example()
+        store, merges, inequalities, _ = TermStore.load(merge_list[1:],
+                                                        inequality_list)
+        alg = Algorithm(merges, inequalities, store = store)
+        alg.merge_nodes()
+        self.assertTrue(alg.check_satisfiability())
+
+        self.assertRaises(ValueError, Algorithm, merges, inequalities,
+                          Algorithm.PAIRWISE, store)
+
+
+    def test_strategies_agree(self):
+        for seed in range(0, 50):
+            verdicts = []
+            for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+                merge_list, inequality_list = create_random(seed, 40)
+                alg = Algorithm(merge_list, inequality_list, strategy)
+                alg.merge_nodes()
+                verdicts.append(alg.check_satisfiability())
+
+            merge_list, inequality_list = create_random(seed, 40)
+            store, merges, inequalities, _ = TermStore.load(merge_list,
+                                                            inequality_list)
+            alg = Algorithm(merges, inequalities, store = store)
+            alg.merge_nodes()
+            verdicts.append(alg.check_satisfiability())
+
+            self.assertEqual(verdicts[0], verdicts[1])
+            self.assertEqual(verdicts[0], verdicts[2])
+
+
+    def test_signature_duplicate_terms(self):
+        # Two separately created nodes f(x) are congruent from the start.
+        x = Node('x')
+        y = Node('y')
+        fx1 = Node('f', [x])
+        fx2 = Node('f', [x])
+
+        alg = Algorithm([(x, y)], [(fx1, fx2)], Algorithm.SIGNATURE)
+        alg.merge_nodes()
+        self.assertFalse(alg.check_satisfiability())
+
+
+    def test_deep_cascade(self):
+        # x == y && f^n(x) != f^n(y)
+        for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            chain1 = [Node('x')]
+            chain2 = [Node('y')]
+            for _ in range(0, 5000):
+                chain1.append(Node('f', [chain1[-1]]))
+                chain2.append(Node('f', [chain2[-1]]))
+
+            alg = Algorithm([(chain1[0], chain2[0])],
+                            [(chain1[-1], chain2[-1])], strategy)
+            alg.merge_nodes()
+            self.assertFalse(alg.check_satisfiability())
+
+
+    def test_push_pop(self):
+        for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            x = Node('x')
+            y = Node('y')
+            z = Node('z')
+            fx = Node('f', [x])
+            fy = Node('f', [y])
+            fz = Node('f', [z])
+
+            alg = Algorithm([(x, y)], [(fx, fz)], strategy,
+                            incremental = True)
+            alg.merge_nodes()
+            self.assertTrue(alg.are_equal(fx, fy))
+            self.assertTrue(alg.check_satisfiability())
+
+            alg.push()
+            alg.assert_equality(y, z)
+            self.assertTrue(alg.are_equal(fx, fz))
+            self.assertFalse(alg.check_satisfiability())
+
+            alg.push()
+            alg.assert_inequality(x, z)
+            self.assertEqual(len(alg.inequality_list), 2)
+            alg.pop()
+            self.assertEqual(len(alg.inequality_list), 1)
+            self.assertFalse(alg.check_satisfiability())
+
+            alg.pop()
+            self.assertEqual(alg.merge_list, [(x, y)])
+            self.assertTrue(alg.are_equal(fx, fy))
+            self.assertFalse(alg.are_equal(fx, fz))
+            self.assertTrue(alg.check_satisfiability())
+
+            # The undone merge can be done again.
+            alg.assert_equality(fz, fy)
+            self.assertFalse(alg.check_satisfiability())
+
+            self.assertRaises(IndexError, alg.pop)
+
+        self.assertRaises(ValueError, Algorithm().push)
+
+
+    def test_push_trail(self):
+        # Changes outside of any scope are not recorded.
+        nodes = [Node('x{0!s}'.format(n)) for n in range(0, 10)]
+        alg = Algorithm(incremental = True)
+        for n in range(0, 8):
+            alg.assert_equality(nodes[n], nodes[n + 1])
+        self.assertIsNone(alg._trail)
+
+        alg.push()
+        alg.assert_equality(nodes[8], nodes[9])
+        alg.assert_inequality(nodes[0], nodes[9])
+        self.assertGreater(len(alg._trail), 0)
+        self.assertFalse(alg.check_satisfiability())
+        alg.pop()
+        self.assertIsNone(alg._trail)
+        self.assertTrue(alg.check_satisfiability())
+        self.assertTrue(alg.are_equal(nodes[0], nodes[8]))
+        self.assertFalse(alg.are_equal(nodes[0], nodes[9]))
+
+
+    def test_push_pop_random(self):
+        # Each suffix of equalities checked within a scope must give the same
+        # result as solving the entire problem from scratch.
+        for seed in range(0, 20):
+            merge_list, inequality_list = create_random(seed, 40)
+            prefix = len(merge_list) // 2
+            alg = Algorithm(merge_list[:prefix], list(inequality_list),
+                            incremental = True)
+            alg.merge_nodes()
+
+            for end in range(prefix, len(merge_list) + 1):
+                alg.push()
+                for node1, node2 in merge_list[prefix:end]:
+                    alg.assert_equality(node1, node2)
+                verdict = alg.check_satisfiability()
+                alg.pop()
+
+                # The same problem with new nodes.
+                fresh_merge_list, fresh_inequality_list = \
+                    create_random(seed, 40)
+                expected = Algorithm(fresh_merge_list[:end],
+                                     fresh_inequality_list)
+                expected.merge_nodes()
+                self.assertEqual(verdict, expected.check_satisfiability())
+
+
+    def test_eager(self):
+        for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            merge_list, inequality_list = create_example()
+            alg = Algorithm(merge_list, inequality_list, strategy,
+                            eager = True)
+            alg.merge_nodes()
+            self.assertFalse(alg.check_satisfiability())
+            self.assertIs(alg.conflict, inequality_list[0])
+
+            merge_list, inequality_list = create_example()
+            alg = Algorithm(merge_list[1:], inequality_list, strategy,
+                            eager = True)
+            alg.merge_nodes()
+            self.assertTrue(alg.check_satisfiability())
+            self.assertIsNone(alg.conflict)
+
+        # Merging stops at the first violated inequality.
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        alg = Algorithm([(x, y), (y, z)], [(y, x)], eager = True)
+        alg.merge_nodes()
+        self.assertEqual(alg.conflict, (y, x))
+        self.assertFalse(alg.are_equal(x, z))
+        self.assertFalse(alg.check_satisfiability())
+
+        # Inequalities within one class are found when they are asserted.
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        alg = Algorithm([(x, z)], eager = True)
+        alg.merge_nodes()
+        alg.assert_inequality(z, y)
+        self.assertIsNone(alg.conflict)
+        alg.assert_inequality(z, x)
+        self.assertEqual(alg.conflict, (z, x))
+
+
+    def test_eager_random(self):
+        for seed in range(0, 50):
+            merge_list, inequality_list = create_random(seed, 40)
+            alg = Algorithm(merge_list, inequality_list)
+            alg.merge_nodes()
+            expected = alg.check_satisfiability()
+
+            merge_list, inequality_list = create_random(seed, 40)
+            alg = Algorithm(merge_list, inequality_list, eager = True)
+            alg.merge_nodes()
+            self.assertEqual(alg.check_satisfiability(), expected)
+
+
+    def test_eager_push_pop(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        fx = Node('f', [x])
+        fz = Node('f', [z])
+
+        alg = Algorithm([(x, y)], [(fx, fz)], incremental = True,
+                        eager = True)
+        alg.merge_nodes()
+        self.assertTrue(alg.check_satisfiability())
+
+        alg.push()
+        alg.assert_inequality(x, z)
+        alg.assert_equality(y, z)
+        self.assertEqual(alg.conflict, (x, z))
+        self.assertFalse(alg.check_satisfiability())
+        alg.pop()
+
+        self.assertIsNone(alg.conflict)
+        self.assertTrue(alg.check_satisfiability())
+
+        alg.push()
+        alg.assert_equality(z, y)
+        self.assertEqual(alg.conflict, (fx, fz))
+        alg.pop()
+        self.assertTrue(alg.check_satisfiability())
+
+
+    def test_watch(self):
+        for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            x = Node('x')
+            y = Node('y')
+            z = Node('z')
+            fx = Node('f', [x])
+            fy = Node('f', [y])
+            alg = Algorithm(strategy = strategy)
+            equality = alg.watch(fx, fy)
+            disequality = alg.watch_disequality(fy, fx)
+            reported = []
+            alg.watch(x, z, reported.append)
+            self.assertFalse(alg.implied)
+
+            # Congruent nodes are reported during the merge.
+            alg.merge(x, y)
+            self.assertEqual(list(alg.implied), [equality])
+            self.assertEqual(list(alg.violated), [disequality])
+            self.assertEqual(reported, [])
+
+            # Each pair is reported once, and equal pairs right away.
+            alg.merge(y, z)
+            alg.merge(fx, z)
+            self.assertEqual(len(alg.implied), 1)
+            self.assertEqual(reported, [(x, z)])
+            alg.watch(z, fy)
+            self.assertEqual(alg.implied[-1], (z, fy))
+
+        alg = Algorithm(lazy = True)
+        self.assertRaises(ValueError, alg.watch, Node('x'), Node('y'))
+
+
+    def test_watch_random(self):
+        for seed in range(0, 50):
+            merge_list, inequality_list = create_random(seed, 40)
+            nodes = list(set([node for pair in merge_list for node in pair]))
+            generator = random.Random(seed)
+            pairs = [tuple(generator.sample(nodes, 2)) for _ in range(0, 30)]
+            alg = Algorithm(inequality_list = inequality_list)
+            for pair in pairs:
+                alg.watch(*pair)
+
+            # Each pair is reported once it becomes equal.
+            for merge in merge_list:
+                alg.assert_equality(*merge)
+                expected = [pair for pair in pairs if alg.are_equal(*pair)]
+                self.assertEqual(len(alg.implied), len(expected))
+                self.assertEqual(set(alg.implied), set(expected))
+
+
+    def test_watch_push_pop(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        fx = Node('f', [x])
+        fz = Node('f', [z])
+        alg = Algorithm(incremental = True)
+        alg.watch(fx, fz)
+
+        alg.push()
+        alg.assert_equality(x, z)
+        self.assertEqual(list(alg.implied), [(fx, fz)])
+        alg.pop()
+
+        # The pair is reported again after the merge has been undone, and
+        # watches added in a scope are removed.
+        alg.implied.clear()
+        alg.push()
+        alg.watch(x, y)
+        alg.pop()
+        alg.assert_equality(y, z)
+        alg.assert_equality(x, y)
+        self.assertEqual(list(alg.implied), [(fx, fz)])
+
+
+    def test_classes(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        fx = Node('f', [x])
+        fy = Node('f', [y])
+        alg = Algorithm([(x, y)], [(fx, z)])
+        alg.merge_nodes()
+        classes = [frozenset(members) for members in alg.classes()]
+        self.assertEqual(len(classes), 3)
+        self.assertEqual(set(classes), {frozenset([x, y]), frozenset([z]),
+                                        frozenset([fx, fy])})
+
+        model = dict(alg.model())
+        self.assertEqual(len(model), 5)
+        self.assertIs(model[x], x.get_class_representative())
+        self.assertIs(model[fx], model[fy])
+        self.assertIsNot(model[fx], model[z])
+
+        self.assertRaises(ValueError, list,
+                          Algorithm(store = TermStore()).classes())
+
+
+    def test_classes_find(self):
+        # Find pointers set before the algorithm is created are part of the
+        # classes.
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        y.find = x
+        alg = Algorithm([(x, z)], [(y, z)])
+        alg.merge_nodes()
+        classes = list(alg.classes())
+        self.assertEqual(len(classes), 1)
+        self.assertEqual(set(classes[0]), {x, y, z})
+        self.assertEqual(set([rep for _, rep in alg.model()]),
+                         {z.get_class_representative()})
+
+
+    def test_classes_random(self):
+        for lazy in [False, True]:
+            for seed in range(0, 30):
+                merge_list, inequality_list = create_random(seed, 40)
+                alg = Algorithm(merge_list, inequality_list, lazy = lazy)
+                alg.merge_nodes()
+
+                # Two nodes have the same representative if they are equal.
+                model = list(alg.model())
+                nodes = [node for node, _ in model]
+                self.assertEqual(len(set(nodes)), len(nodes))
+                for node1, rep1 in model[::7]:
+                    for node2, rep2 in model:
+                        self.assertEqual(rep1 is rep2,
+                                         alg.are_equal(node1, node2))
+
+
+    def test_classes_push_pop(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        alg = Algorithm([(x, y)], [(x, z)], incremental = True)
+        alg.merge_nodes()
+
+        alg.push()
+        alg.assert_equality(y, z)
+        self.assertEqual(len(list(alg.classes())), 1)
+        alg.pop()
+        self.assertEqual(sorted([len(members) for members in alg.classes()]),
+                         [1, 2])
+
+
+    def test_explain(self):
+        for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            merge_list, inequality_list = create_example()
+            alg = Algorithm(merge_list, inequality_list, strategy,
+                            explain = True)
+            alg.merge_nodes()
+            self.assertFalse(alg.check_satisfiability())
+
+            inequality, equalities = alg.explain_conflict()
+            self.assertIs(inequality, inequality_list[0])
+            self.assertEqual(set(map(id, equalities)),
+                             set(map(id, merge_list)))
+
+            # f(y) == x implies f(g(f(y))) == f(g(x)).
+            fgfy, x = merge_list[1]
+            fgx, _ = merge_list[0]
+            self.assertEqual(alg.explain(fgfy, fgx), [merge_list[2]])
+
+            y = fgfy.arguments[0].arguments[0].arguments[0]
+            self.assertRaises(ValueError, alg.explain, fgfy, y)
+
+        merge_list, inequality_list = create_example()
+        alg = Algorithm(merge_list[1:], inequality_list, explain = True)
+        alg.merge_nodes()
+        self.assertIsNone(alg.explain_conflict())
+
+        alg = Algorithm(merge_list, inequality_list)
+        self.assertRaises(ValueError, alg.explain, *merge_list[0])
+
+
+    def test_explain_random(self):
+        # The explanation of a conflict is unsatisfiable on its own.
+        for seed in range(0, 50):
+            merge_list, inequality_list = create_random(seed, 40)
+            alg = Algorithm(merge_list, inequality_list, eager = True,
+                            explain = True)
+            alg.merge_nodes()
+            if alg.check_satisfiability():
+                continue
+
+            inequality, equalities = alg.explain_conflict()
+            indices = [merge_list.index(equality) for equality in equalities]
+
+            fresh_merge_list, fresh_inequality_list = create_random(seed, 40)
+            core = Algorithm([fresh_merge_list[n] for n in indices],
+                             [fresh_inequality_list[
+                                 inequality_list.index(inequality)]])
+            core.merge_nodes()
+            self.assertFalse(core.check_satisfiability())
+
+
+    def test_explain_push_pop(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        alg = Algorithm([(x, y)], [(x, z)], incremental = True,
+                        explain = True)
+        alg.merge_nodes()
+
+        alg.push()
+        alg.assert_equality(y, z)
+        self.assertEqual(alg.explain_conflict(),
+                         ((x, z), [(x, y), (y, z)]))
+        alg.pop()
+        self.assertIsNone(alg.explain_conflict())
+
+        alg.assert_equality(x, z)
+        self.assertEqual(alg.explain_conflict(), ((x, z), [(x, z)]))
+
+
+    def test_explain_smaller_tree(self):
+        for incremental in [False, True]:
+            nodes = [Node('x{0!s}'.format(n)) for n in range(0, 4)]
+            merge_list = [(nodes[n], nodes[n + 1]) for n in range(0, 3)]
+            alg = Algorithm(merge_list, incremental = incremental,
+                            explain = True)
+            alg.merge_nodes()
+            edges = dict(alg._proofs._edges)
+
+            # The single node is attached below the larger tree, which keeps
+            # its edges.
+            y = Node('y')
+            alg.merge(nodes[0], y)
+            self.assertIs(alg._proofs._edges[y][0], nodes[0])
+            for node, edge in edges.items():
+                self.assertEqual(alg._proofs._edges[node], edge)
+            self.assertEqual(set(alg.explain(nodes[3], y)),
+                             set(merge_list + [(nodes[0], y)]))
+
+
+    def test_long_equality_chain(self):
+        # x0 == x1 && x1 == x2 && ... && x0 != xn
+        nodes = [Node('x{0}'.format(n)) for n in range(0, 20000)]
+        merge_list = [(nodes[n], nodes[n + 1])
+                      for n in range(0, len(nodes) - 1)]
+
+        alg = Algorithm(merge_list, [(nodes[0], nodes[-1])])
+        alg.merge_nodes()
+        self.assertFalse(alg.check_satisfiability())
+
+        # Without the first equality, x0 is not part of the chain.
+        nodes = [Node('x{0}'.format(n)) for n in range(0, 20000)]
+        merge_list = [(nodes[n], nodes[n + 1])
+                      for n in range(1, len(nodes) - 1)]
+
+        alg = Algorithm(merge_list, [(nodes[0], nodes[-1])])
+        alg.merge_nodes()
+        self.assertTrue(alg.check_satisfiability())
+
+
+    def test_lazy(self):
+        merge_list, inequality_list = create_example()
+        alg = Algorithm(merge_list, inequality_list, lazy = True)
+        alg.merge_nodes()
+        self.assertFalse(alg.check_satisfiability())
+
+        # The same results as without laziness.
+        for seed in range(0, 20):
+            expected = Algorithm(*create_random(seed, 40))
+            expected.merge_nodes()
+            alg = Algorithm(*create_random(seed, 40), lazy = True)
+            alg.merge_nodes()
+            self.assertEqual(alg.check_satisfiability(),
+                             expected.check_satisfiability())
+
+        # A congruence found when registering new relevant nodes.
+        a = Node('a')
+        b = Node('b')
+        fa = Node('f', [a])
+        fb = Node('f', [b])
+        alg = Algorithm([(a, b)], [], lazy = True)
+        self.assertTrue(alg.are_equal(a, b))
+        self.assertTrue(alg.are_equal(fa, fb))
+
+        # Parents with another symbol are not relevant.
+        ga = Node('g', [a])
+        self.assertFalse(alg.are_equal(fa, b))
+        self.assertNotIn(ga, alg._relevant)
+
+
+    def test_lazy_relevant(self):
+        # Two long chains f^n(x), f^n(y) and an unrelated equality.
+        x = Node('x')
+        y = Node('y')
+        u = Node('u')
+        v = Node('v')
+        chain_x = [x]
+        chain_y = [y]
+        for _ in range(0, 1000):
+            chain_x.append(Node('f', [chain_x[-1]]))
+            chain_y.append(Node('f', [chain_y[-1]]))
+        gu = Node('g', [u])
+        gv = Node('g', [v])
+
+        alg = Algorithm([(x, y), (u, v)], [], lazy = True)
+        alg.merge_nodes()
+        self.assertEqual(len(alg._relevant), 0)
+        self.assertTrue(alg.are_equal(gu, gv))
+        self.assertEqual(len(alg._relevant), 4)
+        self.assertTrue(x.find is x and y.find is y)
+
+        # Equalities asserted later are merged if they are relevant.
+        w = Node('w')
+        alg.assert_equality(u, w)
+        self.assertTrue(alg.are_equal(w, v))
+        self.assertTrue(alg.are_equal(chain_x[-1], chain_y[-1]))
+
+
+    def test_lazy_options(self):
+        self.assertRaises(ValueError, Algorithm, [], [], Algorithm.PAIRWISE,
+                          lazy = True)
+        self.assertRaises(ValueError, Algorithm, [], [], lazy = True,
+                          eager = True)
+        self.assertRaises(ValueError, Algorithm, [], [], store = object(),
+                          lazy = True)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+from node import Node
+
+# The function names of the theory of lists.
+CONS = 'cons'
+CAR = 'car'
+CDR = 'cdr'
+
+
+class ListTheory(object):
+    """
+        The decision procedure for the theory of lists T_cons as described by
+        Bradley and Manna ("The Calculus of Computation", 2007) on top of the
+        congruence closure:
+
+        * For every node cons(a, b), the projections car(cons(a, b)) and
+          cdr(cons(a, b)) are added to the DAG unless they already exist, and
+          the equalities car(cons(a, b)) = a and cdr(cons(a, b)) = b are
+          returned so they can be merged.
+        * A literal atom(x) is violated as soon as the class of x contains a
+          cons node. Each class representative is mapped to some atom and
+          some cons node of its class, so a conflict is found when two classes
+          are merged by looking at these two entries only.
+    """
+
+
+    def __init__(self, find = None, trail = None):
+        """
+            Initialize the theory without any nodes.
+
+            :param find: The function returning a node's class
+                         representative.
+            :param trail: If given, a tuple (function, arguments) undoing
+                          each change of the index is appended to this list.
+            :type trail: list[(function, tuple)]
+        """
+
+        if find is None:
+            find = Node.get_class_representative
+
+        self._find = find  # Function
+        self._trail = trail  # List
+        self._nodes = set()  # Set of registered nodes
+        self._atoms = {}  # Dict: representative -> atom in its class
+        self._conses = {}  # Dict: representative -> cons node in its class
+
+
+    def register(self, nodes):
+        """
+            Add all nodes connected to the given nodes (via arguments and
+            parents) to the index, unless they have been registered before,
+            and create the projections of the new cons nodes.
+
+            Return the equalities of the projections, and an atom and a cons
+            node in the same class or None.
+
+            :type nodes: list[Node]
+            :rtype: (list[(Node, Node)], (Node, Node))
+        """
+
+        known = self._nodes
+        stack = [node for node in nodes if node not in known]
+        if not stack:
+            return [], None
+
+        known.update(stack)
+        added = list(stack)
+        axioms = []
+        conflict = None
+        while stack:
+            node = stack.pop()
+            if node.name == CONS and node.arity == 2:
+                for name, argument in zip([CAR, CDR], node.arguments):
+                    axioms.append((self._projection(name, node), argument))
+                conflict = self._index(self._conses, node) or conflict
+
+            for neighbour in node.arguments:
+                if neighbour not in known:
+                    known.add(neighbour)
+                    added.append(neighbour)
+                    stack.append(neighbour)
+
+            for neighbour in node.parents:
+                if neighbour not in known:
+                    known.add(neighbour)
+                    added.append(neighbour)
+                    stack.append(neighbour)
+
+        if self._trail is not None:
+            self._trail.append((known.difference_update, (added,)))
+
+        return axioms, conflict
+
+
+    def _projection(self, name, node):
+        """
+            Return the node applying the function with the given name to the
+            given cons node, creating it if it does not exist yet.
+
+            :type name: str
+            :type node: Node
+            :rtype: Node
+        """
+
+        rep = self._find(node)
+        projection = None
+        for parent in node.parents | rep.parents:
+            if parent.name == name and parent.arity == 1 and \
+                    parent.arguments[0] is node:
+                projection = parent
+                break
+        else:
+            # Creating the node registers it as a parent of the node.
+            projection = Node(name, [node])
+
+        # The parents of the node's class are kept by its representative.
+        # The registration must be undone with the merges of the class, so
+        # it does not stay with a class that no longer contains the node.
+        parents = rep.parents
+        if projection not in parents:
+            parents.add(projection)
+            if self._trail is not None:
+                self._trail.append((parents.discard, (projection,)))
+
+        return projection
+
+
+    def add_atom(self, node):
+        """
+            Index the literal atom(node). The node must have been registered.
+
+            Return the node and a cons node in its class, or None.
+
+            :type node: Node
+            :rtype: (Node, Node)
+        """
+
+        return self._index(self._atoms, node)
+
+
+    def _index(self, index, node):
+        """
+            Add a node to the atom or cons index, keeping an existing entry of
+            its class, and check its class for a conflict.
+
+            :type index: dict[Node, Node]
+            :type node: Node
+            :rtype: (Node, Node)
+        """
+
+        rep = self._find(node)
+        if rep not in index:
+            index[rep] = node
+            if self._trail is not None:
+                self._trail.append((index.pop, (rep, None)))
+
+        return self._conflict(rep)
+
+
+    def merge(self, child, root):
+        """
+            Update the index after the class of the child has been attached
+            below the given root, and check the merged class for a conflict.
+
+            Return an atom and a cons node in the merged class, or None.
+
+            :type child: Node
+            :type root: Node
+            :rtype: (Node, Node)
+        """
+
+        trail = self._trail
+        for index in [self._atoms, self._conses]:
+            node = index.get(child)
+            if node is not None and root not in index:
+                index[root] = node
+                if trail is not None:
+                    trail.append((index.pop, (root, None)))
+
+        return self._conflict(root)
+
+
+    def _conflict(self, rep):
+        """
+            :type rep: Node
+            :rtype: (Node, Node)
+        """
+
+        atom = self._atoms.get(rep)
+        if atom is None:
+            return None
+
+        cons = self._conses.get(rep)
+        if cons is None:
+            return None
+
+        return atom, cons
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from algorithm import Algorithm
+from algorithm.lists import CAR, CDR, CONS, ListTheory
+from algorithm.node import Node
+
+
+def solve(merge_list, inequality_list, atom_list = None, **options):
+    alg = Algorithm(merge_list, inequality_list, atom_list = atom_list,
+                    lists = True, **options)
+    alg.merge_nodes()
+    return alg.check_satisfiability()
+
+
+class TestListTheory(unittest.TestCase):
+    """
+        A collection of tests for the theory of lists.
+    """
+
+
+    def test_projections(self):
+        a = Node('a')
+        b = Node('b')
+        cons = Node(CONS, [a, b])
+        car = Node(CAR, [cons])
+
+        theory = ListTheory()
+        axioms, conflict = theory.register([a])
+        self.assertIsNone(conflict)
+        self.assertEqual(len(axioms), 2)
+
+        # The existing projection is reused.
+        self.assertIs(axioms[0][0], car)
+        self.assertIs(axioms[0][1], a)
+        self.assertEqual(axioms[1][0].name, CDR)
+        self.assertIs(axioms[1][0].arguments[0], cons)
+        self.assertIs(axioms[1][1], b)
+        self.assertEqual(len(cons.parents), 2)
+
+        # Nodes are registered only once.
+        self.assertEqual(theory.register([cons, car]), ([], None))
+
+
+    def test_projections_push_pop(self):
+        a = Node('a')
+        b = Node('b')
+        cons = Node(CONS, [a, b])
+        y = Node('y')
+        z = Node('z')
+        alg = Algorithm(incremental = True, lists = True)
+        alg.merge(y, z)
+
+        # The cons node is registered after its class has been merged, so
+        # its projections are added to the parents of another node.
+        alg.push()
+        alg.merge(cons, y)
+        alg.assert_inequality(cons, Node('w'))
+        rep = cons.get_root()
+        self.assertIsNot(rep, cons)
+        projections = [parent for parent in rep.parents
+                       if parent.name in [CAR, CDR]]
+        self.assertEqual(len(projections), 2)
+        alg.pop()
+
+        # They leave the class again with the merge.
+        self.assertIs(rep.get_root(), rep)
+        for projection in projections:
+            self.assertNotIn(projection, rep.parents)
+        self.assertTrue(alg.check_satisfiability())
+
+
+    def test_car_cdr(self):
+        for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            a = Node('a')
+            b = Node('b')
+            x = Node('x')
+            car = Node(CAR, [x])
+            cdr = Node(CDR, [x])
+            cons = Node(CONS, [a, b])
+            self.assertFalse(solve([(x, cons)], [(car, a)],
+                                   strategy = strategy))
+
+            a = Node('a')
+            b = Node('b')
+            x = Node('x')
+            cdr = Node(CDR, [x])
+            cons = Node(CONS, [a, b])
+            self.assertFalse(solve([(x, cons)], [(cdr, b)],
+                                   strategy = strategy))
+            self.assertTrue(solve([], [(Node(CAR, [cons]), b)],
+                                  strategy = strategy))
+
+
+    def test_injectivity(self):
+        a = Node('a')
+        b = Node('b')
+        c = Node('c')
+        d = Node('d')
+        cons1 = Node(CONS, [a, b])
+        cons2 = Node(CONS, [c, d])
+        self.assertFalse(solve([(cons1, cons2)], [(b, d)]))
+
+
+    def test_atoms(self):
+        a = Node('a')
+        b = Node('b')
+        x = Node('x')
+        y = Node('y')
+        cons = Node(CONS, [a, b])
+
+        alg = Algorithm([(x, y), (y, cons), (a, b)], [], atom_list = [x],
+                        lists = True)
+        alg.merge_nodes()
+        self.assertEqual(alg.conflict, (x, cons))
+        self.assertFalse(alg.check_satisfiability())
+
+        # The conflict is found while merging.
+        self.assertEqual(alg._merged, 2)
+
+        x = Node('x')
+        y = Node('y')
+        cons = Node(CONS, [x, y])
+        self.assertTrue(solve([(x, y)], [], [x, y]))
+        self.assertFalse(solve([], [], [Node(CONS, [Node('a'),
+                                                      Node('b')])]))
+
+
+    def test_assert_atom(self):
+        a = Node('a')
+        b = Node('b')
+        x = Node('x')
+        car = Node(CAR, [x])
+        cons = Node(CONS, [a, b])
+        alg = Algorithm(lists = True, incremental = True, eager = True)
+        alg.assert_equality(x, cons)
+        self.assertTrue(alg.check_satisfiability())
+
+        alg.push()
+        alg.assert_atom(a)
+        self.assertTrue(alg.check_satisfiability())
+        alg.assert_atom(x)
+        self.assertFalse(alg.check_satisfiability())
+        alg.pop()
+        self.assertTrue(alg.check_satisfiability())
+        self.assertEqual(alg.atom_list, [])
+
+        alg.push()
+        alg.assert_inequality(car, a)
+        self.assertFalse(alg.check_satisfiability())
+        alg.pop()
+        self.assertTrue(alg.check_satisfiability())
+
+        alg.push()
+        y = Node('y')
+        cons2 = Node(CONS, [y, y])
+        alg.assert_equality(cons2, x)
+        self.assertTrue(alg.are_equal(y, a))
+        self.assertTrue(alg.are_equal(y, b))
+        alg.pop()
+        self.assertFalse(alg.are_equal(y, a))
+
+
+    def test_explain(self):
+        a = Node('a')
+        b = Node('b')
+        x = Node('x')
+        cons = Node(CONS, [a, b])
+        alg = Algorithm([(x, cons)], [], atom_list = [x], lists = True,
+                        explain = True)
+        alg.merge_nodes()
+        self.assertEqual(alg.explain_conflict(), ((x, cons), [(x, cons)]))
+
+
+    def test_options(self):
+        self.assertRaises(ValueError, Algorithm, [], [], atom_list =
+                          [Node('x')])
+        self.assertRaises(ValueError, Algorithm().assert_atom, Node('x'))
+        self.assertRaises(ValueError, Algorithm, [], [], store = object(),
+                          lists = True)
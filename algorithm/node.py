@@ -1,17 +1,56 @@
 # -*- coding: utf-8 -*-
 
+from collections import deque
+from weakref import KeyedRef
+
+
+class Symbol(object):
+    """
+        An interned function name. All nodes with the same name share one
+        symbol, so symbols are compared and hashed by identity.
+    """
+
+    __slots__ = ('name', '__weakref__')
+
+
+    def __init__(self, name):
+        """
+            :type name: str
+        """
+
+        self.name = name
+
+
+    def __repr__(self):
+        """
+            :rtype: str
+        """
+        return 'Symbol({0!r})'.format(self.name)
+
 
 class Node(object):
     """
         This class represents a node of a DAG for the DAG based decision
         procedure for T_E formulas.
+
+        Nodes are compared and hashed by identity, so sets and dictionaries
+        of nodes only need the node's address. Two nodes are congruent if
+        congruent() returns True.
     """
 
+    __slots__ = ('_id', '_fn', '_symbol', '_arity', '_find', '_rank',
+                 '_ccpar', '_next', '_args', '__weakref__')
+
     # Each node object will have a unique ID. The value will be incremented
     # by the
     # constructor to keep the ID unique.
     __last_ID = 0
 
+    # Each function name is interned as a unique symbol. The symbols are
+    # only referenced weakly, so the entry of a name is removed with the last
+    # node using it and the table does not grow over the life of a process.
+    __symbols = {}  # Dict: function name -> weak reference to its Symbol
+
 
     def __init__(self, name, arguments = None):
         """
@@ -25,18 +64,41 @@ class Node(object):
         self._id = Node.__last_ID  # Int
         self._fn = name  # String
         self._find = self  # Node
+        self._rank = 0  # Int
         self._ccpar = set()  # Set
+        self._next = self  # Node
+
+        reference = Node.__symbols.get(name)
+        symbol = reference() if reference is not None else None
+        if symbol is None:
+            symbol = Symbol(name)
+            Node.__symbols[name] = KeyedRef(symbol, Node.__forget, name)
+        self._symbol = symbol  # Symbol
 
         if arguments is None:  # List
             self._args = []
         else:
             self._args = arguments
+        self._arity = len(self._args)  # Int
 
         # Set this node as the parent for all arguments.
         for argument in self._args:
             argument.add_single_parent(self)
 
 
+    @staticmethod
+    def __forget(reference):
+        """
+            Remove the entry of a symbol that is no longer used, unless the
+            name has been interned again since.
+
+            :type reference: KeyedRef
+        """
+
+        if Node.__symbols.get(reference.key) is reference:
+            del Node.__symbols[reference.key]
+
+
     @property
     def name(self):
         """
@@ -46,6 +108,27 @@ class Node(object):
         return self._fn
 
 
+    @property
+    def symbol(self):
+        """
+            The interned function name, which is the same for all nodes with
+            the same name.
+
+            :rtype: Symbol
+        """
+
+        return self._symbol
+
+
+    @property
+    def arity(self):
+        """
+            :rtype: int
+        """
+
+        return self._arity
+
+
     @property
     def arguments(self):
         """
@@ -67,12 +150,30 @@ class Node(object):
     @find.setter
     def find(self, value):
         """
+            Attaching a representative to a node of another class splices the
+            lists of members of both classes like a union. The lists are not
+            changed if the find pointer of any other node is set.
+
             :type value: Node
         """
 
+        if self._find is self and value.get_root() is not self:
+            self._next, value._next = value._next, self._next
         self._find = value
 
 
+    @property
+    def rank(self):
+        """
+            An upper bound on the height of the tree below this node if it is
+            a class representative.
+
+            :rtype: int
+        """
+
+        return self._rank
+
+
     @property
     def parents(self):
         """
@@ -103,13 +204,35 @@ class Node(object):
         """
             Return the representative of this node's equivalence class.
 
+            The find pointers are followed in a loop instead of recursively,
+            and every visited node is pointed to its grandparent (path
+            halving), so long chains are flattened by repeated lookups.
+
             :rtype: Node
         """
 
-        if self._find == self:
-            return self
+        node = self
+        while node._find is not node:
+            node._find = node._find._find
+            node = node._find
+
+        return node
+
 
-        return self._find.get_class_representative()
+    def get_root(self):
+        """
+            Return the representative of this node's equivalence class
+            without changing any find pointers, so a union can be undone
+            later on.
+
+            :rtype: Node
+        """
+
+        node = self
+        while node._find is not node:
+            node = node._find
+
+        return node
 
 
     def get_class_parents(self):
@@ -122,104 +245,191 @@ class Node(object):
         return self._find.get_class_representative().parents
 
 
-    def union(self, other):
+    def get_class_members(self):
+        """
+            Return all nodes in this node's equivalence class, starting with
+            this node.
+
+            The members of each class form a circular list, which a union
+            splices into the other class's list in constant time, so no find
+            pointers are followed and the time is linear in the size of the
+            class.
+
+            :rtype: list[Node]
+        """
+
+        members = [self]
+        node = self._next
+        while node is not self:
+            members.append(node)
+            node = node._next
+
+        return members
+
+
+    def union(self, other, trail = None):
         """
             Create the union of this node and another node.
 
+            The representative with the lower rank is attached below the one
+            with the higher rank. On equal ranks, the other node's
+            representative becomes the new representative.
+
+            The smaller set of parents is added to the larger one in place,
+            which the new representative keeps, so every parent is moved at
+            most a logarithmic number of times. If the attached
+            representative had more parents, its set therefore becomes the
+            set of the whole class.
+
+            If a trail is given, a tuple (function, arguments) undoing the
+            union is appended to it.
+
             :type other: Node
+            :type trail: list[(function, tuple)]
         """
 
         # Get the representatives of both nodes.
         rep1 = self.get_class_representative()
         rep2 = other.get_class_representative()
 
-        # Create the actual union on the representatives.
-        rep1.find = rep2.find
-        rep2.parents = rep1.parents | rep2.parents
-        rep1.parents = set()
+        # Both nodes already are in the same class.
+        if rep1 is rep2:
+            return
+
+        # Union by rank: rep1 will always be attached below rep2.
+        if rep1._rank > rep2._rank:
+            rep1, rep2 = rep2, rep1
+
+        parents1 = rep1._ccpar
+        parents2 = rep2._ccpar
+        if len(parents1) > len(parents2):
+            larger, smaller = parents1, parents2
+        else:
+            larger, smaller = parents2, parents1
+
+        if trail is not None:
+            # Only the parents added to the larger set must be removed again.
+            moved = smaller - larger
+            larger |= moved
+            trail.append((rep1.detach,
+                          (rep2, rep2._rank, parents1, parents2, moved)))
+        else:
+            larger |= smaller
+
+        if rep1._rank == rep2._rank:
+            rep2._rank += 1
+
+        # Create the actual union on the representatives. Swapping the
+        # successors of two nodes in different circular lists splices them
+        # into one, and swapping them again splits it.
+        rep1._find = rep2
+        rep2._ccpar = larger
+        rep1._ccpar = set()
+        rep1._next, rep2._next = rep2._next, rep1._next
+
+
+    def detach(self, root, rank, parents, root_parents, moved):
+        """
+            Undo the union that attached this representative below the given
+            root, restoring the root's rank, both sets of parents and both
+            lists of class members.
+
+            :type root: Node
+            :type rank: int
+            :type parents: set(Node)
+            :type root_parents: set(Node)
+            :param moved: The parents added to the larger set.
+            :type moved: set(Node)
+        """
+
+        root._ccpar -= moved
+        self._next, root._next = root._next, self._next
+        self._find = self
+        self._ccpar = parents
+        root._rank = rank
+        root._ccpar = root_parents
 
 
-    def merge(self, other):
+    def merge(self, other, pending = None):
         """
             Merge the two given nodes.
 
+            Congruent parents found on the way are not merged recursively. If
+            a queue of pending equalities is given, they are appended to it
+            and left to the caller. Otherwise, they are merged in a loop
+            before this method returns.
+
             :type other: Node
+            :type pending: deque[(Node, Node)]
         """
 
         # The two nodes must not already be congruent to each other.
-        if self.get_class_representative() == other.get_class_representative():
+        if self.get_class_representative() is \
+                other.get_class_representative():
             return False
 
-        # Save the parents temporarily because they will be overwritten
-        # before the
-        # current values will be used.
-        parents1 = self.parents
-        parents2 = other.parents
+        # Collect all possible parent combinations before the union adds one
+        # set of parents to the other.
+        parents1 = self.get_class_parents()
+        parents2 = other.get_class_parents()
+        parents = [(p1, p2) for p1 in parents1 for p2 in parents2]
 
         self.union(other)
 
-        # Merge all possible parent combinations.
-        parents = [(p1, p2) for p1 in parents1 for p2 in parents2]
+        if pending is None:
+            queue = deque()
+        else:
+            queue = pending
+
+        # Merge all congruent parent combinations.
         for parent_tuple in parents:
             p1, p2 = parent_tuple
 
             # If the two nodes have the same representative, continue with
             # the next
             # tuple.
-            if p1.get_class_representative() == p2.get_class_representative():
+            if p1.get_class_representative() is \
+                    p2.get_class_representative():
                 continue
 
             # If both nodes are congruent, merge them.
-            if p1 == p2:
-                p1.merge(p2)
+            if p1.congruent(p2):
+                queue.append(parent_tuple)
+
+        # Without a caller taking care of the pending equalities, merge them
+        # here.
+        if pending is None:
+            while queue:
+                p1, p2 = queue.popleft()
+                p1.merge(p2, queue)
 
         return True
 
 
-    def __eq__(self, other):
+    def congruent(self, other):
         """
-            Return True if two nodes are equal to each other. They are
-            considered equal if their function names match, they have the
-            same number of arguments and each argument in one node is equal
-            to its corresponding argument in the other node.
+            Return True if two nodes are congruent to each other, i.e. if
+            their function names match, they have the same number of
+            arguments and each argument in one node is in the same class as
+            its corresponding argument in the other node.
 
             :type other: Node
             :rtype: bool
         """
 
-        # The function names must match.
-        if self.name != other.name:
-            return False
-
-        # The number of arguments must match.
-        if len(self.arguments) != len(other.arguments):
+        if self._symbol != other._symbol or self._arity != other._arity:
             return False
 
         # All arguments of the first node must be congruent to their
-        # corresponding
-        # arguments in the second node.
-        number_of_arguments = len(self.arguments)
-        for n in range(0, number_of_arguments):
-            arg1 = self.arguments[n]
-            arg2 = other.arguments[n]
-
-            if arg1.get_class_representative() != \
+        # corresponding arguments in the second node.
+        for arg1, arg2 in zip(self._args, other._args):
+            if arg1.get_class_representative() is not \
                     arg2.get_class_representative():
                 return False
 
         return True
 
 
-    def __ne__(self, other):
-        """
-            Return False if two nodes are equal to each other.
-
-            :type other: Node
-            :rtype: bool
-        """
-        return not self.__eq__(other)
-
-
     def add_argument(self, argument):
         """
             Add a node as this node's arguments and add this node to the
@@ -227,7 +437,8 @@ class Node(object):
 
             :type argument: Node
         """
-        self.arguments.append(argument)
+        self._args.append(argument)
+        self._arity = len(self._args)
         argument.parents.add(self)
 
 
@@ -236,3 +447,53 @@ class Node(object):
             :rtype: str
         """
         return '{0!s}:{1}'.format(self._id, self._fn)
+
+
+def collect_nodes(merge_list, inequality_list):
+    """
+        Return the nodes in the given lists and all nodes connected to them
+        via arguments, parents or find pointers. The arguments of each node
+        come before the node itself.
+
+        :type merge_list: list[(Node, Node)]
+        :type inequality_list: list[(Node, Node)]
+        :rtype: list[Node]
+    """
+
+    # Collect all connected nodes.
+    connected = []
+    known = set()
+    stack = [node for pair in merge_list + inequality_list for node in pair]
+    while stack:
+        node = stack.pop()
+        if node in known:
+            continue
+
+        known.add(node)
+        connected.append(node)
+        stack.extend(node.arguments)
+        stack.extend(node.parents)
+        stack.append(node.find)
+
+    # Order them with their arguments first.
+    nodes = []
+    added = set()
+    for root in connected:
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node in added:
+                stack.pop()
+                continue
+
+            missing = [argument for argument in node.arguments
+                       if argument not in added]
+            if missing:
+                stack.extend(missing)
+                continue
+
+            stack.pop()
+            added.add(node)
+            nodes.append(node)
+
+    return nodes
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import gc
 import unittest
+import weakref
+from collections import deque
 from algorithm.node import Node
 
 
@@ -73,6 +76,32 @@ class TestNode(unittest.TestCase):
         self.assertEqual(node4.get_class_representative(), node4)
 
 
+    def test_get_class_representative_long_chain(self):
+        # A chain much longer than the recursion limit must not fail.
+        nodes = [Node('x') for _ in range(0, 20000)]
+        for n in range(0, len(nodes) - 1):
+            nodes[n].find = nodes[n + 1]
+
+        self.assertIs(nodes[0].get_class_representative(), nodes[-1])
+
+        # Path halving has shortened the chain for the first node.
+        self.assertIs(nodes[0].find, nodes[2])
+        self.assertIs(nodes[0].get_class_representative(), nodes[-1])
+
+
+    def test_get_root(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('z')
+        node1.find = node2
+        node2.find = node3
+
+        # The find pointers are not changed.
+        self.assertIs(node1.get_root(), node3)
+        self.assertIs(node1.find, node2)
+        self.assertIs(node3.get_root(), node3)
+
+
     def test_get_class_parents(self):
         node1 = Node('f')
         node2 = Node('f', [node1])
@@ -100,6 +129,52 @@ class TestNode(unittest.TestCase):
         self.assertEqual(node4.get_class_parents(), {node2})
 
 
+    def test_get_class_members(self):
+        nodes = [Node('x{0!s}'.format(n)) for n in range(0, 5)]
+        self.assertEqual(nodes[0].get_class_members(), [nodes[0]])
+
+        nodes[0].union(nodes[1])
+        nodes[2].union(nodes[3])
+        self.assertEqual(set(nodes[1].get_class_members()),
+                         set(nodes[0:2]))
+
+        # Each node starts with itself, and the order is the same otherwise.
+        trail = []
+        nodes[1].union(nodes[3], trail)
+        members = nodes[2].get_class_members()
+        self.assertIs(members[0], nodes[2])
+        self.assertEqual(set(members), set(nodes[0:4]))
+        index = members.index(nodes[0])
+        self.assertEqual(nodes[0].get_class_members(),
+                         members[index:] + members[:index])
+
+        # Undoing the union splits the lists again.
+        function, arguments = trail.pop()
+        function(*arguments)
+        self.assertEqual(set(nodes[0].get_class_members()),
+                         set(nodes[0:2]))
+        self.assertEqual(set(nodes[3].get_class_members()),
+                         set(nodes[2:4]))
+        self.assertEqual(nodes[4].get_class_members(), [nodes[4]])
+
+
+    def test_get_class_members_find(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('z')
+        node1.union(node2)
+
+        # Setting the find pointer of a representative splices the lists.
+        node3.find = node1
+        self.assertEqual(set(node1.get_class_members()),
+                         {node1, node2, node3})
+
+        # Within one class, nothing is spliced.
+        node3.find = node2
+        self.assertEqual(set(node3.get_class_members()),
+                         {node1, node2, node3})
+
+
     def test_union(self):
         # Create a few nodes.
         node1 = Node('f')
@@ -128,6 +203,83 @@ class TestNode(unittest.TestCase):
         self.assertEqual(node5.find, node2)
 
 
+    def test_union_by_rank(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('z')
+        self.assertEqual(node1.rank, 0)
+
+        # On equal ranks, the other node's representative is kept.
+        node1.union(node2)
+        self.assertIs(node1.find, node2)
+        self.assertEqual(node2.rank, 1)
+
+        # The class with the lower rank is attached below the higher one.
+        node2.union(node3)
+        self.assertIs(node3.find, node2)
+        self.assertEqual(node2.rank, 1)
+        self.assertEqual(node3.rank, 0)
+
+        # Creating the union of a class with itself does not change anything.
+        node1.union(node3)
+        self.assertIs(node2.find, node2)
+        self.assertEqual(node2.rank, 1)
+
+
+    def test_union_trail(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('f', [node1])
+        node4 = Node('g', [node2])
+        parents1 = node1.parents
+        parents2 = node2.parents
+
+        trail = []
+        node1.union(node2, trail)
+        self.assertEqual(len(trail), 1)
+        self.assertIs(node1.find, node2)
+        self.assertEqual(node2.parents, {node3, node4})
+
+        # Undo the union.
+        function, arguments = trail.pop()
+        function(*arguments)
+        self.assertIs(node1.find, node1)
+        self.assertEqual(node1.rank, 0)
+        self.assertEqual(node2.rank, 0)
+        self.assertIs(node1.parents, parents1)
+        self.assertIs(node2.parents, parents2)
+        self.assertEqual(node1.parents, {node3})
+        self.assertEqual(node2.parents, {node4})
+
+
+    def test_union_in_place(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('f', [node1])
+        node4 = Node('g', [node1])
+        node5 = Node('f', [node2])
+        node6 = Node('h', [node1, node2])
+        parents1 = node1.parents
+        parents2 = node2.parents
+
+        # The smaller set is added to the larger one, even though node 1 is
+        # attached below node 2.
+        trail = []
+        node1.union(node2, trail)
+        self.assertIs(node1.find, node2)
+        self.assertIs(node2.parents, parents1)
+        self.assertEqual(node2.parents, {node3, node4, node5, node6})
+        self.assertEqual(node1.parents, set())
+
+        # Only the moved parent is removed again.
+        function, arguments = trail.pop()
+        function(*arguments)
+        self.assertIs(node1.parents, parents1)
+        self.assertIs(node2.parents, parents2)
+        self.assertEqual(node1.parents, {node3, node4, node6})
+        self.assertEqual(node2.parents, {node5, node6})
+
+
     def test_merge(self):
         # Create a few nodes.
         node1 = Node('f')
@@ -160,7 +312,37 @@ class TestNode(unittest.TestCase):
         self.assertFalse(node1.merge(node2))
 
 
-    def test_equality(self):
+    def test_merge_pending(self):
+        # Node 3 and 4 become congruent when merging nodes 1 and 2.
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('f', [node1])
+        node4 = Node('f', [node2])
+
+        # With a pending queue, the parents are left to the caller.
+        pending = deque()
+        self.assertTrue(node1.merge(node2, pending))
+        self.assertEqual(list(pending), [(node3, node4)])
+        self.assertIsNot(node3.get_class_representative(),
+                         node4.get_class_representative())
+
+
+    def test_merge_deep_cascade(self):
+        # Merging x and y makes f^n(x) and f^n(y) congruent for all n.
+        node1 = Node('x')
+        node2 = Node('y')
+        chain1 = [node1]
+        chain2 = [node2]
+        for _ in range(0, 5000):
+            chain1.append(Node('f', [chain1[-1]]))
+            chain2.append(Node('f', [chain2[-1]]))
+
+        self.assertTrue(node1.merge(node2))
+        self.assertIs(chain1[-1].get_class_representative(),
+                      chain2[-1].get_class_representative())
+
+
+    def test_congruent(self):
         # Create a few nodes.
         node1 = Node('f')
         node2 = Node('f')
@@ -172,18 +354,48 @@ class TestNode(unittest.TestCase):
         node5.add_argument(node1)
         node5.add_argument(node2)
 
-        # Nodes 1 and 2 should be equal to each other.
-        self.assertEqual(node1, node2)
+        # Nodes 1 and 2 should be congruent to each other.
+        self.assertTrue(node1.congruent(node2))
 
-        # Nodes 1 and 3 are not equal because their function names differ.
-        self.assertNotEqual(node1, node3)
+        # Nodes 1 and 3 are not congruent because their function names
+        # differ.
+        self.assertFalse(node1.congruent(node3))
 
-        # Nodes 1 and 4 are not equal because they do not have the same number
-        # of arguments.
-        self.assertNotEqual(node1, node4)
+        # Nodes 1 and 4 are not congruent because they do not have the same
+        # number of arguments.
+        self.assertFalse(node1.congruent(node4))
 
-        # Nodes 4 and 5 are not equal because their arguments are not congruent.
-        self.assertNotEqual(node4, node5)
+        # Nodes 4 and 5 are not congruent because their arguments are not
+        # congruent, until nodes 2 and 3 are merged.
+        self.assertFalse(node4.congruent(node5))
+        node2.union(node3)
+        self.assertTrue(node4.congruent(node5))
+
+
+    def test_identity(self):
+        # Congruent nodes are still different objects.
+        node1 = Node('f')
+        node2 = Node('f')
+        self.assertNotEqual(node1, node2)
+        self.assertEqual(len({node1, node2}), 2)
+        self.assertEqual(hash(node1), hash(node1))
+        self.assertFalse(hasattr(node1, '__dict__'))
+
+        # Function names are interned, and the arity follows new arguments.
+        node3 = Node('f', [node1])
+        self.assertEqual(node3.symbol, node1.symbol)
+        self.assertNotEqual(Node('g').symbol, node1.symbol)
+        self.assertEqual(node3.arity, 1)
+        node3.add_argument(node2)
+        self.assertEqual(node3.arity, 2)
+
+        # The symbol of a name is freed with the last node using it. Each
+        # node refers to itself, so nodes are freed by the garbage collector.
+        symbol = weakref.ref(Node('unused').symbol)
+        gc.collect()
+        self.assertIsNone(symbol())
+        self.assertIsNot(Node('unused').symbol, None)
+        self.assertIs(Node('f').symbol, node1.symbol)
 
 
     def test_add_argument(self):
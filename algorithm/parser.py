@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+import re
+from factory import TermFactory
+
+# The kinds of literals emitted by the parser.
+MERGE = 'merge'
+INEQUALITY = 'inequality'
+
+# Commands that do not influence the conjunction of literals.
+IGNORED_COMMANDS = {'set-logic', 'set-info', 'set-option', 'declare-sort',
+                    'check-sat', 'get-model', 'get-info', 'exit'}
+
+# A single token, whitespace or comment. A string must not be followed by a
+# quote, as two quotes are an escaped quote within the string.
+_TOKEN = re.compile(r'\s+|;[^\n]*|\(|\)|\|[^|]*\||"(?:[^"]|"")*"(?!")|'
+                    r'[^\s();|"]+')
+
+
+class ParseError(Exception):
+    """
+        Raised if the input is not a valid script in the supported subset of
+        SMT-LIB 2.
+    """
+
+
+def tokenize(stream, chunk_size = 65536):
+    """
+        Return a generator yielding the tokens of an SMT-LIB script. The
+        stream is read in chunks of the given size, so the input never has to
+        be held in memory at once.
+
+        :type stream: file
+        :type chunk_size: int
+        :rtype: generator
+    """
+
+    buffer = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+        position = 0
+        length = len(buffer)
+        while position < length:
+            match = _TOKEN.match(buffer, position)
+
+            # An incomplete quoted symbol or string may be completed by the
+            # next chunk, and so may any token reaching the end of the chunk.
+            if match is None or (match.end() == length and not eof):
+                if eof:
+                    raise ParseError('Unterminated token: {0!s}'
+                                     .format(buffer[position:position + 20]))
+                break
+
+            position = match.end()
+            token = match.group()
+            if not token[0].isspace() and token[0] != ';':
+                yield token
+
+        buffer = buffer[position:]
+        if eof:
+            return
+
+
+class Parser(object):
+    """
+        A parser for the QF_UF subset of SMT-LIB 2 consisting of the commands
+        declare-fun, declare-const and assert with the connectives =,
+        distinct, not and and.
+
+        The script is read incrementally. Each asserted equality is emitted as
+        soon as its assertion has been read, so the literals can be processed
+        while the rest of the script is still being parsed. All terms are
+        created with a term factory, so identical subterms share a node.
+    """
+
+
+    def __init__(self, stream, factory = None):
+        """
+            Initialize the parser.
+
+            :type stream: file
+            :type factory: TermFactory
+        """
+
+        if factory is None:
+            factory = TermFactory()
+
+        self.factory = factory
+        self._tokens = tokenize(stream)
+        self._arities = {}  # Dict: function name -> number of arguments
+
+
+    def __iter__(self):
+        """
+            Return a generator yielding the literals of the script, each as a
+            tuple (kind, node1, node2) where kind is MERGE or INEQUALITY.
+
+            :rtype: generator
+        """
+
+        for command in self._commands():
+            if not isinstance(command, list) or not command or \
+                    isinstance(command[0], list):
+                raise ParseError('Invalid command: {0!s}'.format(command))
+
+            name = command[0]
+            if name == 'assert':
+                if len(command) != 2:
+                    raise ParseError('assert expects a single formula')
+                for literal in self._formula(command[1], True):
+                    yield literal
+            elif name == 'declare-fun':
+                if len(command) != 4 or not isinstance(command[2], list):
+                    raise ParseError('Invalid declaration: {0!s}'
+                                     .format(command))
+                self._declare(command[1], len(command[2]))
+            elif name == 'declare-const':
+                if len(command) != 3:
+                    raise ParseError('Invalid declaration: {0!s}'
+                                     .format(command))
+                self._declare(command[1], 0)
+            elif name not in IGNORED_COMMANDS:
+                raise ParseError('Unsupported command: {0!s}'.format(name))
+
+
+    def _commands(self):
+        """
+            Return a generator yielding the top-level s-expressions of the
+            script as nested lists of tokens.
+
+            :rtype: generator
+        """
+
+        stack = []
+        for token in self._tokens:
+            if token == '(':
+                stack.append([])
+            elif token == ')':
+                if not stack:
+                    raise ParseError('Unbalanced closing parenthesis')
+                expression = stack.pop()
+                if stack:
+                    stack[-1].append(expression)
+                else:
+                    yield expression
+            elif stack:
+                stack[-1].append(_symbol(token))
+            else:
+                yield _symbol(token)
+
+        if stack:
+            raise ParseError('Unexpected end of input')
+
+
+    def _declare(self, name, arity):
+        """
+            Declare a function symbol.
+
+            :type name: str
+            :type arity: int
+        """
+
+        if isinstance(name, list):
+            raise ParseError('Invalid function name: {0!s}'.format(name))
+        if name in self._arities:
+            raise ParseError('Function declared twice: {0!s}'.format(name))
+
+        self._arities[name] = arity
+
+
+    def _term(self, expression):
+        """
+            Return the node for the given term. The term is built bottom-up
+            with an explicit stack, so deeply nested terms do not hit the
+            recursion limit.
+
+            :type expression: str | list
+            :rtype: Node
+        """
+
+        term = self.factory.term
+        nodes = []
+        stack = [(expression, False)]
+        while stack:
+            expression, ready = stack.pop()
+            if isinstance(expression, list):
+                if not expression or isinstance(expression[0], list):
+                    raise ParseError('Invalid term: {0!s}'.format(expression))
+                name = expression[0]
+                arguments = expression[1:]
+            else:
+                name = expression
+                arguments = []
+
+            # All arguments have been built, they are on top of the stack of
+            # nodes.
+            if ready:
+                position = len(nodes) - len(arguments)
+                node = term(name, nodes[position:])
+                del nodes[position:]
+                nodes.append(node)
+                continue
+
+            if self._arities.get(name) != len(arguments):
+                raise ParseError('Undeclared function or wrong number of '
+                                 'arguments: {0!s}'.format(expression))
+
+            stack.append((expression, True))
+            stack.extend([(argument, False)
+                          for argument in reversed(arguments)])
+
+        return nodes[0]
+
+
+    def _formula(self, expression, positive):
+        """
+            Return the literals of the given formula as a list of tuples
+            (kind, node1, node2).
+
+            :type expression: str | list
+            :param positive: False if the formula occurs below a negation.
+            :rtype: list[(str, Node, Node)]
+        """
+
+        if expression == 'true' and positive:
+            return []
+
+        if not isinstance(expression, list) or not expression:
+            raise ParseError('Unsupported formula: {0!s}'.format(expression))
+
+        connective = expression[0]
+        operands = expression[1:]
+        if connective == 'not' and len(operands) == 1:
+            return self._formula(operands[0], not positive)
+
+        if connective == 'and' and positive:
+            literals = []
+            for operand in operands:
+                literals.extend(self._formula(operand, True))
+            return literals
+
+        if connective in ['=', 'distinct'] and len(operands) >= 2:
+            terms = [self._term(operand) for operand in operands]
+
+            # (= a b c) is a chain of equalities, (distinct a b c) means all
+            # terms are pairwise unequal.
+            if connective == '=' and positive:
+                return [(MERGE, terms[n], terms[n + 1])
+                        for n in range(0, len(terms) - 1)]
+            if connective == 'distinct' and positive:
+                return [(INEQUALITY, terms[m], terms[n])
+                        for m in range(0, len(terms))
+                        for n in range(m + 1, len(terms))]
+
+            # Negating more than two terms results in a disjunction.
+            if len(terms) == 2:
+                if connective == '=':
+                    return [(INEQUALITY, terms[0], terms[1])]
+                return [(MERGE, terms[0], terms[1])]
+
+        raise ParseError('Unsupported formula: {0!s}'.format(expression))
+
+
+def _symbol(token):
+    """
+        Return the name of a symbol, removing the bars of quoted symbols.
+
+        :type token: str
+        :rtype: str
+    """
+
+    if token[0] == '|':
+        return token[1:-1]
+
+    return token
+
+
+def load(stream, factory = None):
+    """
+        Parse an entire script and return its merge and inequality lists.
+
+        :type stream: file
+        :type factory: TermFactory
+        :rtype: (list[(Node, Node)], list[(Node, Node)])
+    """
+
+    merge_list = []
+    inequality_list = []
+    for kind, node1, node2 in Parser(stream, factory):
+        if kind == MERGE:
+            merge_list.append((node1, node2))
+        else:
+            inequality_list.append((node1, node2))
+
+    return merge_list, inequality_list
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from StringIO import StringIO
+from algorithm import Algorithm
+from algorithm.parser import INEQUALITY, MERGE, ParseError, Parser, load, \
+    tokenize
+
+SCRIPT = """
+; f(g(x)) == g(f(x)) && f(g(f(y))) == x && f(y) == x && g(f(x)) != x
+(set-logic QF_UF)
+(set-info :status unsat)
+(declare-sort U 0)
+(declare-fun x () U)
+(declare-const y U)
+(declare-fun f (U) U)
+(declare-fun |g| (U) U)
+(assert (= (f (g x)) (g (f x))))
+(assert (and (= (f (g (f y))) x) (= (f y) x)))
+(assert (not (= (g (f x)) x)))
+(check-sat)
+(exit)
+"""
+
+
+class TestParser(unittest.TestCase):
+    """
+        A collection of tests for the SMT-LIB parser.
+    """
+
+
+    def test_tokenize(self):
+        tokens = ['(', 'assert', '(', '=', '|a b|', 'c', ')', ')', '(',
+                  'set-info', ':source', '"x ""y"""', ')']
+        script = '(assert (= |a b| c)) ; comment\n' \
+                 '(set-info :source "x ""y""")'
+
+        # Tokens split across chunks are put back together.
+        for chunk_size in [1, 2, 3, 7, 65536]:
+            self.assertEqual(list(tokenize(StringIO(script), chunk_size)),
+                             tokens)
+
+        self.assertRaises(ParseError, list, tokenize(StringIO('(a |b')))
+
+
+    def test_parse(self):
+        parser = Parser(StringIO(SCRIPT))
+        literals = list(parser)
+        self.assertEqual([kind for kind, _, _ in literals],
+                         [MERGE, MERGE, MERGE, INEQUALITY])
+
+        # Identical subterms share a node.
+        factory = parser.factory
+        x = factory.term('x')
+        fx = factory.term('f', [x])
+        self.assertIs(literals[0][2], factory.term('g', [fx]))
+        self.assertIs(literals[3][1], factory.term('g', [fx]))
+        self.assertIs(literals[3][2], x)
+        self.assertEqual(len(factory), 9)
+
+
+    def test_connectives(self):
+        declarations = '(declare-fun a () U) (declare-fun b () U) ' \
+                       '(declare-fun c () U) '
+
+        # A chain of equalities.
+        literals = list(Parser(StringIO(declarations +
+                                        '(assert (= a b c))')))
+        self.assertEqual([(kind, node1.name, node2.name)
+                          for kind, node1, node2 in literals],
+                         [(MERGE, 'a', 'b'), (MERGE, 'b', 'c')])
+
+        # Pairwise inequalities.
+        literals = list(Parser(StringIO(declarations +
+                                        '(assert (distinct a b c))')))
+        self.assertEqual([(kind, node1.name, node2.name)
+                          for kind, node1, node2 in literals],
+                         [(INEQUALITY, 'a', 'b'), (INEQUALITY, 'a', 'c'),
+                          (INEQUALITY, 'b', 'c')])
+
+        # Negations.
+        literals = list(Parser(StringIO(
+            declarations + '(assert (and (not (distinct a b)) '
+                           '(not (not (= b c))) true))')))
+        self.assertEqual([(kind, node1.name, node2.name)
+                          for kind, node1, node2 in literals],
+                         [(MERGE, 'a', 'b'), (MERGE, 'b', 'c')])
+
+
+    def test_errors(self):
+        declarations = '(declare-fun a () U) (declare-fun f (U) U) '
+        for script in ['(assert (= a b))',
+                       '(assert (= (f a a) a))',
+                       '(assert (= f a))',
+                       '(assert (or (= a a) (= a a)))',
+                       '(assert (not (and (= a a) (= a a))))',
+                       '(assert (not (= a a a)))',
+                       '(assert (= a a)',
+                       '(assert (= a a)))',
+                       '(declare-fun a () U)',
+                       '(push 1)']:
+            self.assertRaises(ParseError, list,
+                              Parser(StringIO(declarations + script)))
+
+
+    def test_deep_term(self):
+        script = '(declare-fun x () U) (declare-fun f (U) U) ' \
+                 '(assert (= x {0!s}x{1!s}))'.format('(f ' * 5000, ')' * 5000)
+        merge_list, inequality_list = load(StringIO(script))
+        self.assertEqual(len(merge_list), 1)
+        self.assertEqual(inequality_list, [])
+
+
+    def test_load(self):
+        merge_list, inequality_list = load(StringIO(SCRIPT))
+        self.assertEqual(len(merge_list), 3)
+        self.assertEqual(len(inequality_list), 1)
+
+        alg = Algorithm(merge_list, inequality_list)
+        alg.merge_nodes()
+        self.assertFalse(alg.check_satisfiability())
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+    Partitioning of a conjunction into independent parts. Two literals
+    belong to the same part if their nodes are connected via arguments,
+    parents, find pointers or other literals. Merges in one part never
+    change the classes of another part, so the parts can be solved
+    separately, and the conjunction is unsatisfiable if and only if one of
+    its parts is.
+"""
+
+from multiprocessing import Pool, cpu_count
+from algorithm import Algorithm
+from batch import solve as solve_problem
+from problem import Problem
+
+
+def components(merge_list, inequality_list):
+    """
+        Return the independent parts of the given literals as pairs of merge
+        and inequality lists, in the order of their first literal. Each node
+        is visited once, so apart from joining the labels of searches that
+        meet, the time is linear in the size of the DAG.
+
+        :type merge_list: list[(Node, Node)]
+        :type inequality_list: list[(Node, Node)]
+        :rtype: list[(list[(Node, Node)], list[(Node, Node)])]
+    """
+
+    # The nodes connected to each node by literals.
+    adjacent = {}  # Dict: node -> list of nodes
+    for node1, node2 in merge_list + inequality_list:
+        adjacent.setdefault(node1, []).append(node2)
+        adjacent.setdefault(node2, []).append(node1)
+
+    # Label all nodes reachable from each literal. Find pointers can only be
+    # followed in one direction, so a search may reach the nodes of an
+    # earlier one, whose labels are then joined in a union-find.
+    labels = {}  # Dict: node -> label
+    joined = []  # List: label -> label it has been joined with
+    no_nodes = ()
+    for node1, _ in merge_list + inequality_list:
+        if node1 in labels:
+            continue
+
+        label = len(joined)
+        joined.append(label)
+        labels[node1] = label
+        stack = [node1]
+        while stack:
+            node = stack.pop()
+            for neighbours in (node.arguments, node.parents, (node.find,),
+                               adjacent.get(node, no_nodes)):
+                for neighbour in neighbours:
+                    other = labels.get(neighbour)
+                    if other == label:
+                        continue
+                    if other is None:
+                        labels[neighbour] = label
+                        stack.append(neighbour)
+                        continue
+
+                    while joined[other] != other:
+                        joined[other] = joined[joined[other]]
+                        other = joined[other]
+                    joined[other] = label
+
+    # Collect the literals of each part in their original order.
+    parts = []
+    part_of = {}  # Dict: label -> index of its part
+    for literals, position in [(merge_list, 0), (inequality_list, 1)]:
+        for literal in literals:
+            label = labels[literal[0]]
+            while joined[label] != label:
+                joined[label] = joined[joined[label]]
+                label = joined[label]
+
+            part = part_of.get(label)
+            if part is None:
+                part = part_of[label] = len(parts)
+                parts.append(([], []))
+            parts[part][position].append(literal)
+
+    return parts
+
+
+def solve(merge_list, inequality_list, processes = None):
+    """
+        Decide the satisfiability of a conjunction by solving its independent
+        parts. Parts without inequalities are always satisfiable and are
+        skipped. The search stops at the first unsatisfiable part.
+
+        With a single process, the parts are solved one after another in the
+        current process, which merges the classes of the nodes in each part
+        that has been solved. The nodes of skipped parts and of parts after
+        an unsatisfiable one are left unchanged, so the classes are only
+        complete as by Algorithm.merge_nodes() if every part has
+        inequalities and the conjunction is satisfiable. Otherwise, the parts
+        are encoded and solved by a pool of worker processes, which does not
+        change any nodes.
+
+        :type merge_list: list[(Node, Node)]
+        :type inequality_list: list[(Node, Node)]
+        :param processes: The number of worker processes, by default the
+                          number of CPUs.
+        :rtype: bool
+    """
+
+    parts = [part for part in components(merge_list, inequality_list)
+             if part[1]]
+
+    if processes is None:
+        processes = cpu_count()
+    if processes <= 1 or len(parts) <= 1:
+        for part in parts:
+            alg = Algorithm(*part)
+            alg.merge_nodes()
+            if not alg.check_satisfiability():
+                return False
+        return True
+
+    problems = [Problem.from_lists(*part) for part in parts]
+    pool = Pool(min(processes, len(problems)))
+    try:
+        for satisfiable in pool.imap_unordered(solve_problem, problems):
+            if not satisfiable:
+                return False
+        return True
+    finally:
+        # Parts still being solved are not needed any more.
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from algorithm.node import Node
+from algorithm.partition import components, solve
+from algorithm.workloads import chain
+
+
+class TestPartition(unittest.TestCase):
+    """
+        A collection of tests for the partitioning into independent parts.
+    """
+
+
+    def test_components(self):
+        x = Node('x')
+        y = Node('y')
+        fx = Node('f', [x])
+        a = Node('a')
+        b = Node('b')
+        c = Node('c')
+        d = Node('d')
+        ga = Node('g', [a])
+        gd = Node('g', [d])
+
+        # Parts are connected via arguments, parents and literals.
+        merge_list = [(x, y), (a, b), (c, d)]
+        inequality_list = [(fx, y), (gd, c)]
+        parts = components(merge_list, inequality_list)
+        self.assertEqual(parts, [([(x, y)], [(fx, y)]),
+                                 ([(a, b)], []),
+                                 ([(c, d)], [(gd, c)])])
+
+        # An inequality connects two parts, too.
+        inequality_list.append((ga, gd))
+        parts = components(merge_list, inequality_list)
+        self.assertEqual(len(parts), 2)
+        self.assertEqual(parts[1], ([(a, b), (c, d)],
+                                    [(gd, c), (ga, gd)]))
+
+
+    def test_find_pointers(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        w = Node('w')
+        x.union(y)
+        self.assertIs(x.find, y)
+
+        # The node below the representative is only found from the second
+        # literal.
+        parts = components([(y, z)], [(x, w)])
+        self.assertEqual(parts, [([(y, z)], [(x, w)])])
+
+
+    def test_solve(self):
+        for processes in [1, 2]:
+            # f(x) = y && x != y is satisfiable, the chain is not.
+            x = Node('x')
+            y = Node('y')
+            merge_list, inequality_list = chain(50)
+            merge_list.append((Node('f', [x]), y))
+            inequality_list.append((x, y))
+            self.assertEqual(len(components(merge_list, inequality_list)), 2)
+            self.assertFalse(solve(merge_list, inequality_list, processes))
+            self.assertTrue(solve(merge_list[1:], inequality_list[1:],
+                                  processes))
+
+
+    def test_early_exit(self):
+        # The second part is not merged after the first one is
+        # unsatisfiable.
+        x = Node('x')
+        y = Node('y')
+        a = Node('a')
+        b = Node('b')
+        self.assertFalse(solve([(x, y), (a, b)], [(x, y), (a, Node('c'))], 1))
+        self.assertIs(x.get_class_representative(),
+                      y.get_class_representative())
+        self.assertIsNot(a.get_class_representative(),
+                         b.get_class_representative())
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+    A preprocessing pass reducing the merge list before the congruence
+    closure is computed.
+
+    An equality can only influence the classes of nodes connected to its
+    nodes via arguments, parents, find pointers and other equalities. If no
+    node of an inequality or atom is connected to it, the equality cannot
+    make the formula unsatisfiable and is dropped, together with all other
+    equalities of its part of the DAG.
+
+    The remaining equalities are deduplicated, equalities of a node with
+    itself are dropped, and the rest is ordered such that equalities of
+    nodes with few parents, whose unions cause little work, come first.
+
+    The dropped equalities are never merged, so the classes of their nodes
+    must not be used after the formula has been checked.
+"""
+
+
+def _reach(nodes, adjacent, known):
+    """
+        Return all nodes connected to the given nodes that have not been
+        found before, adding them to the set of known nodes.
+
+        :type nodes: list[Node]
+        :param adjacent: The nodes connected to each node by equalities.
+        :type adjacent: dict[Node, list[Node]]
+        :type known: set(Node)
+        :rtype: list[Node]
+    """
+
+    found = []
+    stack = [node for node in nodes if node not in known]
+    known.update(stack)
+    while stack:
+        node = stack.pop()
+        found.append(node)
+        neighbours = list(node.arguments)
+        neighbours.extend(node.parents)
+        neighbours.append(node.find)
+        neighbours.extend(adjacent.get(node, []))
+        for neighbour in neighbours:
+            if neighbour not in known:
+                known.add(neighbour)
+                stack.append(neighbour)
+
+    return found
+
+
+def preprocess(merge_list, inequality_list, atom_list = None):
+    """
+        Return a reduced merge list, the inequality list without duplicates,
+        and a report of the reduction, a dictionary with the entries:
+
+        * nodes: The number of nodes connected to any literal.
+        * removed_nodes: The number of nodes connected to no inequality or
+                         atom.
+        * merges: The number of equalities in the given merge list.
+        * removed_merges: The number of equalities that have been dropped.
+        * reflexive_merges: The number of equalities of a node with itself.
+        * duplicate_merges: The number of repeated equalities, in either
+                            direction.
+        * irrelevant_merges: The number of equalities connected to no
+                             inequality or atom.
+        * duplicate_inequalities: The number of repeated inequalities.
+
+        The given lists are not changed.
+
+        :type merge_list: list[(Node, Node)]
+        :type inequality_list: list[(Node, Node)]
+        :param atom_list: The nodes of atom literals, if any.
+        :type atom_list: list[Node]
+        :rtype: (list[(Node, Node)], list[(Node, Node)], dict)
+    """
+
+    if atom_list is None:
+        atom_list = []
+
+    report = {
+        'merges': len(merge_list),
+        'reflexive_merges': 0,
+        'duplicate_merges': 0,
+        'irrelevant_merges': 0,
+        'duplicate_inequalities': 0,
+    }
+
+    # Drop repeated literals.
+    seen = set()
+    merges = []
+    for merge in merge_list:
+        node1, node2 = merge
+        if node1 is node2:
+            report['reflexive_merges'] += 1
+            continue
+
+        key = (min(id(node1), id(node2)), max(id(node1), id(node2)))
+        if key in seen:
+            report['duplicate_merges'] += 1
+            continue
+
+        seen.add(key)
+        merges.append(merge)
+
+    seen = set()
+    inequalities = []
+    for inequality in inequality_list:
+        node1, node2 = inequality
+        key = (min(id(node1), id(node2)), max(id(node1), id(node2)))
+        if key in seen:
+            report['duplicate_inequalities'] += 1
+            continue
+
+        seen.add(key)
+        inequalities.append(inequality)
+
+    # Find the nodes connected to an inequality or atom.
+    adjacent = {}
+    for node1, node2 in merges:
+        adjacent.setdefault(node1, []).append(node2)
+        adjacent.setdefault(node2, []).append(node1)
+
+    known = set()
+    relevant = _reach([node for pair in inequalities for node in pair] +
+                      list(atom_list), adjacent, known)
+    irrelevant = _reach([node for pair in merges for node in pair], adjacent,
+                        known)
+    report['nodes'] = len(relevant) + len(irrelevant)
+    report['removed_nodes'] = len(irrelevant)
+
+    irrelevant = set(irrelevant)
+    relevant_merges = [merge for merge in merges
+                       if merge[0] not in irrelevant]
+    report['irrelevant_merges'] = len(merges) - len(relevant_merges)
+
+    # Unions of classes with few parents first.
+    relevant_merges.sort(key = lambda merge: len(merge[0].parents) +
+                         len(merge[1].parents))
+
+    report['removed_merges'] = len(merge_list) - len(relevant_merges)
+    return relevant_merges, inequalities, report
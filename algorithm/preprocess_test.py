@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from algorithm import Algorithm
+from algorithm.init_test import create_example, create_random
+from algorithm.lists import CONS
+from algorithm.node import Node
+from algorithm.preprocess import preprocess
+
+
+def solve(merge_list, inequality_list, atom_list = None):
+    alg = Algorithm(merge_list, inequality_list, atom_list = atom_list,
+                    lists = atom_list is not None)
+    alg.merge_nodes()
+    return alg.check_satisfiability()
+
+
+class TestPreprocess(unittest.TestCase):
+    """
+        A collection of tests for the preprocessing pass.
+    """
+
+
+    def test_duplicates(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        merge_list = [(x, y), (y, x), (x, x), (x, y), (y, z)]
+        inequality_list = [(x, z), (z, x)]
+        merges, inequalities, report = preprocess(merge_list, inequality_list)
+        self.assertEqual(merges, [(x, y), (y, z)])
+        self.assertEqual(inequalities, [(x, z)])
+        self.assertEqual(report['reflexive_merges'], 1)
+        self.assertEqual(report['duplicate_merges'], 2)
+        self.assertEqual(report['duplicate_inequalities'], 1)
+        self.assertEqual(report['removed_merges'], 3)
+        self.assertEqual(report['merges'], 5)
+        self.assertEqual(len(merge_list), 5)
+
+
+    def test_irrelevant(self):
+        x = Node('x')
+        y = Node('y')
+        fx = Node('f', [x])
+        fy = Node('f', [y])
+
+        # A part of the DAG without inequalities.
+        a = Node('a')
+        b = Node('b')
+        ga = Node('g', [a])
+        gb = Node('g', [b])
+
+        merge_list = [(a, b), (x, y), (ga, gb)]
+        merges, inequalities, report = preprocess(merge_list, [(fx, fy)])
+        self.assertEqual(merges, [(x, y)])
+        self.assertEqual(report['irrelevant_merges'], 2)
+        self.assertEqual(report['nodes'], 8)
+        self.assertEqual(report['removed_nodes'], 4)
+        self.assertFalse(solve(merges, inequalities))
+
+        # An equality connects both parts.
+        c = Node('c')
+        merges, inequalities, report = preprocess(
+            [(a, b), (x, y), (a, c), (c, fx)], [(fx, fy)])
+        self.assertEqual(report['irrelevant_merges'], 0)
+        self.assertEqual(report['removed_nodes'], 0)
+
+
+    def test_atoms(self):
+        x = Node('x')
+        y = Node('y')
+        cons = Node(CONS, [Node('a'), Node('b')])
+        merges, inequalities, report = preprocess([(x, cons)], [], [y])
+        self.assertEqual(merges, [])
+        merges, inequalities, report = preprocess([(y, cons)], [], [y])
+        self.assertEqual(merges, [(y, cons)])
+        self.assertFalse(solve(merges, inequalities, [y]))
+
+
+    def test_order(self):
+        x = Node('x')
+        y = Node('y')
+        z = Node('z')
+        fx = Node('f', [x])
+        Node('g', [x])
+        merges, inequalities, report = preprocess([(x, y), (y, z)],
+                                                  [(fx, z)])
+        self.assertEqual(merges, [(y, z), (x, y)])
+
+
+    def test_satisfiability(self):
+        self.assertFalse(solve(*preprocess(*create_example())[:2]))
+        for seed in range(0, 40):
+            expected = solve(*create_random(seed, 60))
+            merges, inequalities, report = preprocess(
+                *create_random(seed, 60))
+            self.assertEqual(solve(merges, inequalities), expected)
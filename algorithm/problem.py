@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from algorithm import Algorithm
+from node import Node, collect_nodes
+
+
+class Problem(object):
+    """
+        A compact encoding of a conjunction of equalities and inequalities
+        that does not reference any nodes. Terms are numbered such that the
+        arguments of each term come before the term itself, function names
+        are interned, and all data is kept in flat integer arrays:
+
+        * symbols: The function names, indexed by symbol ID.
+        * term_symbols: The symbol ID of each term.
+        * offsets: The arguments of term t are
+                   arguments[offsets[t]:offsets[t + 1]].
+        * arguments: The term IDs of all arguments.
+        * merges: The term IDs of the equalities, two per equality.
+        * inequalities: The term IDs of the inequalities, two per
+                        inequality.
+
+        Unlike a DAG of nodes, whose parent sets reference each other, a
+        problem can be pickled cheaply, e.g. to send it to another process.
+    """
+
+
+    def __init__(self):
+        """
+            Initialize an empty problem.
+        """
+
+        self.symbols = []
+        self.term_symbols = array('i')
+        self.offsets = array('i', [0])
+        self.arguments = array('i')
+        self.merges = array('i')
+        self.inequalities = array('i')
+        self._symbol_ids = {}  # Dict: function name -> symbol ID
+
+
+    def __len__(self):
+        """
+            Return the number of terms.
+
+            :rtype: int
+        """
+
+        return len(self.term_symbols)
+
+
+    def __getstate__(self):
+        """
+            Return the state for pickling. The arrays are stored as strings,
+            which is much more compact than lists of integers.
+
+            :rtype: tuple
+        """
+
+        return (self.symbols, self.term_symbols.tostring(),
+                self.offsets.tostring(), self.arguments.tostring(),
+                self.merges.tostring(), self.inequalities.tostring())
+
+
+    def __setstate__(self, state):
+        """
+            Restore the state of a pickled problem.
+
+            :type state: tuple
+        """
+
+        self.__init__()
+        self.symbols = state[0]
+        self._symbol_ids = dict([(name, symbol) for symbol, name
+                                 in enumerate(self.symbols)])
+        del self.offsets[:]
+        for column, data in zip([self.term_symbols, self.offsets,
+                                 self.arguments, self.merges,
+                                 self.inequalities], state[1:]):
+            column.fromstring(data)
+
+
+    def intern(self, name):
+        """
+            Return the ID of the given function name, adding it if necessary.
+
+            :type name: str
+            :rtype: int
+        """
+
+        symbol = self._symbol_ids.get(name)
+        if symbol is None:
+            symbol = len(self.symbols)
+            self._symbol_ids[name] = symbol
+            self.symbols.append(name)
+
+        return symbol
+
+
+    def add_term(self, name, arguments = ()):
+        """
+            Add a new term and return its ID. All arguments must already be
+            part of this problem.
+
+            :type name: str
+            :type arguments: list[int]
+            :rtype: int
+        """
+
+        self.term_symbols.append(self.intern(name))
+        self.arguments.extend(arguments)
+        self.offsets.append(len(self.arguments))
+        return len(self.term_symbols) - 1
+
+
+    def add_merge(self, term1, term2):
+        """
+            Add an equality of two terms.
+
+            :type term1: int
+            :type term2: int
+        """
+
+        self.merges.append(term1)
+        self.merges.append(term2)
+
+
+    def add_inequality(self, term1, term2):
+        """
+            Add an inequality of two terms.
+
+            :type term1: int
+            :type term2: int
+        """
+
+        self.inequalities.append(term1)
+        self.inequalities.append(term2)
+
+
+    def name(self, term):
+        """
+            Return the function name of the given term.
+
+            :type term: int
+            :rtype: str
+        """
+
+        return self.symbols[self.term_symbols[term]]
+
+
+    def term_arguments(self, term):
+        """
+            Return the IDs of the given term's arguments.
+
+            :type term: int
+            :rtype: list[int]
+        """
+
+        return self.arguments[self.offsets[term]:
+                              self.offsets[term + 1]].tolist()
+
+
+    def merge_pairs(self):
+        """
+            :rtype: list[(int, int)]
+        """
+
+        return zip(self.merges[0::2], self.merges[1::2])
+
+
+    def inequality_pairs(self):
+        """
+            :rtype: list[(int, int)]
+        """
+
+        return zip(self.inequalities[0::2], self.inequalities[1::2])
+
+
+    @classmethod
+    def from_lists(cls, merge_list, inequality_list):
+        """
+            Encode the nodes in the given lists and all nodes connected to
+            them. Nodes that already have been merged with other nodes are
+            encoded with an additional equality.
+
+            :type merge_list: list[(Node, Node)]
+            :type inequality_list: list[(Node, Node)]
+            :rtype: Problem
+        """
+
+        problem = cls()
+        ids = {}
+        nodes = collect_nodes(merge_list, inequality_list)
+        for node in nodes:
+            ids[node] = problem.add_term(
+                node.name, [ids[argument] for argument in node.arguments])
+
+        for node in nodes:
+            if node.find is not node:
+                problem.add_merge(ids[node], ids[node.find])
+        for node1, node2 in merge_list:
+            problem.add_merge(ids[node1], ids[node2])
+        for node1, node2 in inequality_list:
+            problem.add_inequality(ids[node1], ids[node2])
+
+        return problem
+
+
+    def to_lists(self):
+        """
+            Create new nodes for all terms and return the merge and
+            inequality lists.
+
+            :rtype: (list[(Node, Node)], list[(Node, Node)])
+        """
+
+        symbols = self.symbols
+        offsets = self.offsets
+        arguments = self.arguments
+        nodes = []
+        for term, symbol in enumerate(self.term_symbols):
+            nodes.append(Node(symbols[symbol],
+                              [nodes[argument] for argument in
+                               arguments[offsets[term]:offsets[term + 1]]]))
+
+        merge_list = [(nodes[term1], nodes[term2])
+                      for term1, term2 in self.merge_pairs()]
+        inequality_list = [(nodes[term1], nodes[term2])
+                           for term1, term2 in self.inequality_pairs()]
+        return merge_list, inequality_list
+
+
+    def solve(self, **options):
+        """
+            Decide the satisfiability of this problem with new nodes.
+
+            :param options: Passed to the constructor of the algorithm.
+            :rtype: bool
+        """
+
+        merge_list, inequality_list = self.to_lists()
+        alg = Algorithm(merge_list, inequality_list, **options)
+        alg.merge_nodes()
+        return alg.check_satisfiability()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import unittest
+from algorithm.init_test import create_example, create_random
+from algorithm.node import Node, collect_nodes
+from algorithm.problem import Problem
+
+
+class TestProblem(unittest.TestCase):
+    """
+        A collection of tests for the entire Problem class.
+    """
+
+
+    def test_add_term(self):
+        problem = Problem()
+        x = problem.add_term('x')
+        y = problem.add_term('y')
+        fxy = problem.add_term('f', [x, y])
+        problem.add_merge(x, y)
+        problem.add_inequality(fxy, x)
+
+        self.assertEqual(len(problem), 3)
+        self.assertEqual(problem.symbols, ['x', 'y', 'f'])
+        self.assertEqual(problem.name(fxy), 'f')
+        self.assertEqual(problem.term_arguments(fxy), [x, y])
+        self.assertEqual(problem.term_arguments(x), [])
+        self.assertEqual(problem.merge_pairs(), [(x, y)])
+        self.assertEqual(problem.inequality_pairs(), [(fxy, x)])
+
+
+    def test_collect_nodes(self):
+        node1 = Node('x')
+        node2 = Node('f', [node1])
+        node3 = Node('g', [node2])
+        node4 = Node('y')
+        node5 = Node('z')
+        node5.find = node4
+
+        nodes = collect_nodes([(node2, node4)], [])
+        self.assertEqual(set(nodes), {node1, node2, node3, node4})
+        self.assertLess(nodes.index(node1), nodes.index(node2))
+        self.assertLess(nodes.index(node2), nodes.index(node3))
+
+
+    def test_from_lists(self):
+        merge_list, inequality_list = create_example()
+        problem = Problem.from_lists(merge_list, inequality_list)
+        self.assertEqual(len(problem), 9)
+        self.assertEqual(len(problem.merge_pairs()), 3)
+        self.assertEqual(len(problem.inequality_pairs()), 1)
+        self.assertEqual(sorted(problem.symbols), ['f', 'g', 'x', 'y'])
+
+        # Arguments come before their parents.
+        for term in range(0, len(problem)):
+            for argument in problem.term_arguments(term):
+                self.assertLess(argument, term)
+
+        # New nodes are created for the lists.
+        new_merge_list, new_inequality_list = problem.to_lists()
+        self.assertEqual(len(new_merge_list), 3)
+        self.assertEqual(len(new_inequality_list), 1)
+        self.assertIsNot(new_merge_list[0][0], merge_list[0][0])
+        self.assertEqual(new_merge_list[0][0].name, merge_list[0][0].name)
+
+        # Existing classes become equalities.
+        node1 = Node('x')
+        node2 = Node('y')
+        node1.find = node2
+        problem = Problem.from_lists([], [(node1, node2)])
+        self.assertEqual(len(problem.merge_pairs()), 1)
+        self.assertFalse(problem.solve())
+
+
+    def test_solve(self):
+        merge_list, inequality_list = create_example()
+        self.assertFalse(Problem.from_lists(merge_list,
+                                            inequality_list).solve())
+
+        merge_list, inequality_list = create_example()
+        problem = Problem.from_lists(merge_list[1:], inequality_list)
+        self.assertTrue(problem.solve())
+        self.assertTrue(problem.solve(strategy = 'pairwise'))
+
+
+    def test_pickle(self):
+        merge_list, inequality_list = create_random(0, 100)
+        problem = Problem.from_lists(merge_list, inequality_list)
+        data = pickle.dumps(problem, pickle.HIGHEST_PROTOCOL)
+        copy = pickle.loads(data)
+
+        for column in ['symbols', 'term_symbols', 'offsets', 'arguments',
+                       'merges', 'inequalities']:
+            self.assertEqual(getattr(copy, column), getattr(problem, column))
+        self.assertEqual(copy.intern('f'), problem.intern('f'))
+        self.assertEqual(copy.solve(), problem.solve())
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+
+class ProofForest(object):
+    """
+        A proof forest as described by Nieuwenhuis and Oliveras ("Proof-
+        Producing Congruence Closure", 2005). Its trees contain the same nodes
+        as the classes of the union-find, but each edge is labelled with the
+        reason for the merge that created it: either an input equality, or
+        None if the two nodes of the edge have been merged because they are
+        congruent.
+
+        Two nodes of the same class are connected by a unique path in the
+        forest, and the reasons along this path explain their equality.
+    """
+
+
+    def __init__(self, trail = None):
+        """
+            Initialize an empty forest.
+
+            :param trail: If given, a tuple (function, arguments) undoing
+                          each change of the forest is appended to this list.
+            :type trail: list[(function, tuple)]
+        """
+
+        self._edges = {}  # Dict: node -> (parent node, reason)
+        self._trail = trail  # List
+
+
+    def add_edge(self, node1, node2, reason):
+        """
+            Connect the trees of the two given nodes. The first node is made
+            the root of its tree by reversing the path to its old root, and
+            then attached below the second node.
+
+            :type node1: Node
+            :type node2: Node
+            :param reason: The input equality merging both nodes, or None if
+                           both nodes are congruent.
+        """
+
+        edges = self._edges
+        changed = [(node1, edges.get(node1))]
+
+        # Reverse the path from the first node to its root.
+        node = node1
+        edge = edges.get(node)
+        while edge is not None:
+            parent, parent_reason = edge
+            edge = edges.get(parent)
+            changed.append((parent, edge))
+            edges[parent] = (node, parent_reason)
+            node = parent
+
+        edges[node1] = (node2, reason)
+
+        if self._trail is not None:
+            self._trail.append((self._restore, (changed,)))
+
+
+    def _restore(self, changed):
+        """
+            Restore the given edges.
+
+            :type changed: list[(Node, (Node, object))]
+        """
+
+        edges = self._edges
+        for node, edge in reversed(changed):
+            if edge is None:
+                edges.pop(node, None)
+            else:
+                edges[node] = edge
+
+
+    def explain(self, node1, node2):
+        """
+            Return the input equalities implying the equality of the two
+            given nodes, without duplicates.
+
+            Each edge of the forest is explained at most once per call: the
+            explained edges are collected in an auxiliary union-find whose
+            classes are represented by their node closest to the root, so
+            explained parts of a path are skipped.
+
+            :type node1: Node
+            :type node2: Node
+            :rtype: list
+        """
+
+        edges = self._edges
+        highest = {}  # Dict: node -> node closer to the root
+        explanation = []
+        explained = set()
+
+        def find_highest(node):
+            while node in highest:
+                above = highest[node]
+                if above in highest:
+                    highest[node] = highest[above]
+                node = above
+            return node
+
+        pending = [(node1, node2)]
+        while pending:
+            node1, node2 = pending.pop()
+            if node1 is node2:
+                continue
+
+            # Find the nearest common ancestor of both nodes.
+            ancestors = set()
+            node = node1
+            while node is not None:
+                ancestors.add(node)
+                edge = edges.get(node)
+                node = edge[0] if edge is not None else None
+
+            ancestor = node2
+            while ancestor not in ancestors:
+                edge = edges.get(ancestor)
+                if edge is None:
+                    raise ValueError('The nodes are not in the same class')
+                ancestor = edge[0]
+
+            # Explain the edges on the paths from both nodes to the ancestor.
+            ancestor = find_highest(ancestor)
+            for node in [node1, node2]:
+                node = find_highest(node)
+                while node is not ancestor:
+                    parent, reason = edges[node]
+                    if reason is None:
+                        pending.extend(zip(node.arguments,
+                                           parent.arguments))
+                    elif id(reason) not in explained:
+                        explained.add(id(reason))
+                        explanation.append(reason)
+
+                    highest[node] = parent
+                    node = find_highest(parent)
+
+        return explanation
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from algorithm.node import Node
+from algorithm.proof import ProofForest
+
+
+class TestProofForest(unittest.TestCase):
+    """
+        A collection of tests for the entire ProofForest class.
+    """
+
+
+    def test_explain(self):
+        node1 = Node('a')
+        node2 = Node('b')
+        node3 = Node('c')
+        node4 = Node('d')
+        reason1 = (node1, node2)
+        reason2 = (node3, node2)
+        reason3 = (node4, node3)
+
+        forest = ProofForest()
+        forest.add_edge(node1, node2, reason1)
+        forest.add_edge(node3, node2, reason2)
+        forest.add_edge(node4, node3, reason3)
+
+        self.assertEqual(forest.explain(node1, node1), [])
+        self.assertEqual(forest.explain(node1, node2), [reason1])
+        self.assertEqual(set(forest.explain(node1, node3)),
+                         {reason1, reason2})
+        self.assertEqual(set(forest.explain(node4, node1)),
+                         {reason1, reason2, reason3})
+        self.assertEqual(forest.explain(node4, node3), [reason3])
+
+
+    def test_add_edge_reverses_path(self):
+        node1 = Node('a')
+        node2 = Node('b')
+        node3 = Node('c')
+        node4 = Node('d')
+        reason1 = (node1, node2)
+        reason2 = (node3, node4)
+        reason3 = (node2, node4)
+
+        forest = ProofForest()
+        forest.add_edge(node1, node2, reason1)
+        forest.add_edge(node3, node4, reason2)
+
+        # Node 2 becomes the root of its tree before being attached.
+        forest.add_edge(node2, node4, reason3)
+        self.assertEqual(forest.explain(node1, node2), [reason1])
+        self.assertEqual(set(forest.explain(node1, node3)),
+                         {reason1, reason2, reason3})
+
+
+    def test_explain_congruence(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('z')
+        node4 = Node('f', [node1])
+        node5 = Node('f', [node3])
+        reason1 = (node1, node2)
+        reason2 = (node2, node3)
+
+        forest = ProofForest()
+        forest.add_edge(node1, node2, reason1)
+        forest.add_edge(node2, node3, reason2)
+        forest.add_edge(node4, node5, None)
+
+        self.assertEqual(set(forest.explain(node4, node5)),
+                         {reason1, reason2})
+        self.assertRaises(ValueError, forest.explain, node1, node4)
+
+
+    def test_trail(self):
+        node1 = Node('a')
+        node2 = Node('b')
+        node3 = Node('c')
+        reason1 = (node1, node2)
+        reason2 = (node2, node3)
+
+        trail = []
+        forest = ProofForest(trail)
+        forest.add_edge(node1, node2, reason1)
+        forest.add_edge(node2, node3, reason2)
+        self.assertEqual(len(trail), 2)
+
+        function, arguments = trail.pop()
+        function(*arguments)
+        self.assertEqual(forest.explain(node2, node1), [reason1])
+        self.assertRaises(ValueError, forest.explain, node2, node3)
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+
+"""
+    A compact binary format for problems. All counts are unsigned LEB128
+    varints, i.e. seven bits per byte with the highest bit set on all but the
+    last byte. A file consists of:
+
+    * The magic bytes 'CCA' and the format version.
+    * The symbol table: the number of symbols, then the length and the name
+      of each symbol. Unicode names are encoded as UTF-8, and all names are
+      read back as byte strings.
+    * The terms: the number of terms, then the column of the symbol IDs of
+      all terms, then the column of their numbers of arguments, then the
+      column of the difference between the ID of each term and the ID of
+      each of its arguments. As arguments always come before their terms,
+      these differences are small positive numbers for most DAGs.
+    * The equalities: their number, then the column of two term IDs per
+      equality.
+    * The inequalities: their number, then the column of two term IDs per
+      inequality.
+
+    A column of fewer than 64 values is a sequence of varints. A larger
+    column starts with a byte giving the width of its values: 1, 2 or 4 for
+    little-endian unsigned integers of that many bytes, or 0 for varints
+    preceded by their total number of bytes. A column of values below 256
+    has the width 1. Otherwise, varints are used if at most an eighth of the
+    values need more than one byte, and the smallest sufficient width if
+    not, so large columns are decoded in bulk instead of value by value.
+"""
+
+import mmap
+import re
+import sys
+from array import array
+from itertools import chain, imap, repeat
+from operator import sub
+from problem import Problem
+
+# NumPy is optional. Without it, arguments are resolved with iterators.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = 'CCA'
+VERSION = 2
+
+# Columns with at least this many values have a header.
+LARGE_COLUMN = 64
+
+# The array type codes of the fixed widths.
+_TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+# A varint of more than one byte.
+_LONG_VARINT = re.compile('[\x80-\xff]+[\x00-\x7f]')
+
+
+def _write_varint(output, value):
+    """
+        Append a single varint to the given byte array.
+
+        :type output: bytearray
+        :type value: int
+    """
+
+    while value >= 0x80:
+        output.append((value & 0x7f) | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def _write_column(output, values):
+    """
+        Append a column of values to the given byte array.
+
+        :type output: bytearray
+        :type values: list[int] | array
+    """
+
+    if len(values) < LARGE_COLUMN:
+        for value in values:
+            _write_varint(output, value)
+        return
+
+    width = 1
+    largest = max(values)
+    while largest >> (8 * width):
+        width *= 2
+
+    if width > 1:
+        long_values = sum(1 for value in values if value >= 0x80)
+        if 8 * long_values <= len(values):
+            encoded = bytearray()
+            for value in values:
+                _write_varint(encoded, value)
+            output.append(0)
+            _write_varint(output, len(encoded))
+            output.extend(encoded)
+            return
+
+    if width not in _TYPECODES:
+        raise ValueError('Value out of range: {0!s}'.format(largest))
+    column = array(_TYPECODES[width], values)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    output.append(width)
+    output.extend(column.tostring())
+
+
+def _read_varint(data, position):
+    """
+        Read a single varint.
+
+        :type data: buffer
+        :type position: int
+        :rtype: (int, int)
+        :return: The value and the position after it.
+    """
+
+    value = 0
+    shift = 0
+    while True:
+        try:
+            byte = ord(data[position])
+        except IndexError:
+            raise ValueError('Unexpected end of data')
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _read_chunk(data, position, length):
+    """
+        Copy the given number of bytes out of the data.
+
+        :type data: buffer
+        :type position: int
+        :type length: int
+        :rtype: str
+    """
+
+    chunk = data[position:position + length]
+    if len(chunk) != length:
+        raise ValueError('Unexpected end of data')
+    return chunk
+
+
+def _decode_varints(chunk):
+    """
+        Decode a string of varints into an array. The runs of single-byte
+        values between the longer varints are converted at once.
+
+        :type chunk: str
+        :rtype: array
+    """
+
+    if chunk and chunk[-1] >= '\x80':
+        raise ValueError('Unexpected end of data')
+
+    values = array('i')
+    start = 0
+    for match in _LONG_VARINT.finditer(chunk):
+        values.extend(bytearray(chunk[start:match.start()]))
+        value = 0
+        shift = 0
+        for byte in bytearray(match.group()):
+            value |= (byte & 0x7f) << shift
+            shift += 7
+        try:
+            values.append(value)
+        except OverflowError:
+            raise ValueError('Value out of range: {0!s}'.format(value))
+        start = match.end()
+    values.extend(bytearray(chunk[start:]))
+    return values
+
+
+def _read_column(data, position, count):
+    """
+        Read a column of the given number of values into an array.
+
+        :type data: buffer
+        :type position: int
+        :type count: int
+        :rtype: (array, int)
+        :return: The values and the position after them.
+    """
+
+    if count < LARGE_COLUMN:
+        values = array('i')
+        for _ in range(0, count):
+            value, position = _read_varint(data, position)
+            try:
+                values.append(value)
+            except OverflowError:
+                raise ValueError('Value out of range: {0!s}'.format(value))
+        return values, position
+
+    try:
+        width = ord(data[position])
+    except IndexError:
+        raise ValueError('Unexpected end of data')
+    position += 1
+
+    if width == 0:
+        length, position = _read_varint(data, position)
+        values = _decode_varints(_read_chunk(data, position, length))
+        if len(values) != count:
+            raise ValueError('Wrong number of values in column')
+        return values, position + length
+
+    if width not in _TYPECODES:
+        raise ValueError('Unsupported column width: {0!s}'.format(width))
+    chunk = _read_chunk(data, position, width * count)
+    if width < 4:
+        # Pad each value with zero bytes.
+        wide = bytearray(4 * count)
+        for byte in range(0, width):
+            wide[byte::4] = chunk[byte::width]
+        chunk = str(wide)
+
+    values = array('i')
+    values.fromstring(chunk)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    if width == 4 and min(values) < 0:
+        raise ValueError('Value out of range')
+    return values, position + width * count
+
+
+def _resolve_arguments(arities, deltas):
+    """
+        Compute the offsets of the arguments of all terms and the IDs of all
+        arguments from the number of arguments of each term and the
+        differences between the IDs of the terms and their arguments.
+
+        :type arities: array
+        :type deltas: array
+        :rtype: (array, array)
+    """
+
+    if numpy is not None:
+        arity = numpy.frombuffer(arities, numpy.intc)
+        offsets = numpy.zeros(len(arity) + 1, numpy.intc)
+        numpy.cumsum(arity, out = offsets[1:])
+        owners = numpy.repeat(numpy.arange(len(arity), dtype = numpy.intc),
+                              arity)
+        arguments = owners - numpy.frombuffer(deltas, numpy.intc)
+        offsets, arguments = [array('i', column.tostring()) for column
+                              in [offsets, arguments]]
+    else:
+        offsets = array('i', [0])
+        append = offsets.append
+        offset = 0
+        for arity in arities:
+            offset += arity
+            append(offset)
+
+        # The term of each argument.
+        owners = chain.from_iterable(imap(repeat, xrange(len(arities)),
+                                          arities))
+        arguments = array('i', imap(sub, owners, deltas))
+
+    if deltas and (min(deltas) < 1 or min(arguments) < 0):
+        raise ValueError('Unknown argument ID')
+    return offsets, arguments
+
+
+def dumps(problem):
+    """
+        Return the binary encoding of the given problem.
+
+        :type problem: Problem
+        :rtype: str
+    """
+
+    output = bytearray(MAGIC)
+    output.append(VERSION)
+
+    _write_varint(output, len(problem.symbols))
+    for name in problem.symbols:
+        encoded = name.encode('utf-8') if isinstance(name, unicode) else name
+        _write_varint(output, len(encoded))
+        output.extend(encoded)
+
+    offsets = problem.offsets
+    arguments = problem.arguments
+    _write_varint(output, len(problem))
+    _write_column(output, problem.term_symbols)
+    _write_column(output, [offsets[term + 1] - offsets[term]
+                           for term in range(0, len(problem))])
+    _write_column(output, [term - arguments[n]
+                           for term in range(0, len(problem))
+                           for n in range(offsets[term], offsets[term + 1])])
+
+    for literals in [problem.merges, problem.inequalities]:
+        _write_varint(output, len(literals) // 2)
+        _write_column(output, literals)
+
+    return str(output)
+
+
+def dump(problem, stream):
+    """
+        Write the binary encoding of the given problem to a file.
+
+        :type problem: Problem
+        :type stream: file
+    """
+
+    stream.write(dumps(problem))
+
+
+def loads(data):
+    """
+        Decode a problem from its binary encoding. The data is read through
+        a buffer, so of a memory-mapped file, only the bytes of the column
+        being decoded are copied into a string.
+
+        Malformed data raises a ValueError, including IDs of unknown
+        symbols or terms and arguments not coming before their terms.
+
+        :type data: str | bytearray | mmap.mmap
+        :rtype: Problem
+    """
+
+    data = buffer(data)
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not a problem file')
+    if len(data) <= len(MAGIC):
+        raise ValueError('Unexpected end of data')
+    if ord(data[len(MAGIC)]) != VERSION:
+        raise ValueError('Unsupported version: {0!s}'
+                         .format(ord(data[len(MAGIC)])))
+    position = len(MAGIC) + 1
+
+    problem = Problem()
+    count, position = _read_varint(data, position)
+    for _ in range(0, count):
+        length, position = _read_varint(data, position)
+        name = data[position:position + length]
+        if len(name) != length:
+            raise ValueError('Unexpected end of data')
+        problem.intern(str(name))
+        position += length
+
+    count, position = _read_varint(data, position)
+    problem.term_symbols, position = _read_column(data, position, count)
+    if count and max(problem.term_symbols) >= len(problem.symbols):
+        raise ValueError('Unknown symbol ID')
+    arities, position = _read_column(data, position, count)
+    # Each argument takes at least one byte.
+    arguments = sum(arities)
+    if arguments > len(data) - position:
+        raise ValueError('Unexpected end of data')
+    deltas, position = _read_column(data, position, arguments)
+    problem.offsets, problem.arguments = _resolve_arguments(arities, deltas)
+
+    count, position = _read_varint(data, position)
+    problem.merges, position = _read_column(data, position, 2 * count)
+    count, position = _read_varint(data, position)
+    problem.inequalities, position = _read_column(data, position, 2 * count)
+    for literals in [problem.merges, problem.inequalities]:
+        if literals and max(literals) >= len(problem):
+            raise ValueError('Unknown term ID')
+
+    return problem
+
+
+def load(path):
+    """
+        Read a problem from a file, which is memory-mapped instead of being
+        read into a string first. Only the bytes of one column at a time are
+        copied out of the mapping while it is decoded.
+
+        :type path: str
+        :rtype: Problem
+    """
+
+    with open(path, 'rb') as stream:
+        mapped = mmap.mmap(stream.fileno(), 0, access = mmap.ACCESS_READ)
+        try:
+            return loads(mapped)
+        finally:
+            mapped.close()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from algorithm import serialize
+from algorithm.init_test import create_example, create_random
+from algorithm.problem import Problem
+
+
+class TestSerialize(unittest.TestCase):
+    """
+        A collection of tests for the binary format of problems.
+    """
+
+
+    def assertSameProblem(self, problem1, problem2):
+        self.assertEqual(problem1.symbols, problem2.symbols)
+        self.assertEqual(problem1.term_symbols, problem2.term_symbols)
+        self.assertEqual(problem1.offsets, problem2.offsets)
+        self.assertEqual(problem1.arguments, problem2.arguments)
+        self.assertEqual(problem1.merges, problem2.merges)
+        self.assertEqual(problem1.inequalities, problem2.inequalities)
+
+
+    def test_varint(self):
+        values = [0, 1, 127, 128, 300, 16383, 16384, 2 ** 31 - 1]
+        data = bytearray()
+        serialize._write_column(data, values)
+        self.assertEqual(data[:5], bytearray([0, 1, 127, 0x80, 1]))
+
+        data = buffer(data)
+        column, position = serialize._read_column(data, 0, len(values))
+        self.assertEqual(column.tolist(), values)
+        self.assertEqual(position, len(data))
+        self.assertRaises(ValueError, serialize._read_column, data[:-1], 0,
+                          len(values))
+
+
+    def test_large_columns(self):
+        size = serialize.LARGE_COLUMN
+        few = [1] * (size - 1) + [300]
+        for values, width in [(range(0, size), 1), (range(150, 150 + size), 1),
+                              (few, 0), (range(300, 300 + size), 2),
+                              (range(2 ** 31 - size, 2 ** 31), 4)]:
+            data = bytearray()
+            serialize._write_column(data, values)
+            self.assertEqual(data[0], width)
+            data = buffer(str(data) + 'rest')
+            column, position = serialize._read_column(data, 0, len(values))
+            self.assertEqual(column.tolist(), values)
+            self.assertEqual(position, len(data) - 4)
+            self.assertRaises(ValueError, serialize._read_column,
+                              data[:position - 1], 0, len(values))
+
+        # Single-byte values are stored as they are.
+        data = bytearray()
+        serialize._write_column(data, range(0, size))
+        self.assertEqual(data[1:], bytearray(range(0, size)))
+
+        # A varint cut off, a wrong number of varints, an unknown width and
+        # a value too large.
+        for data in [[0, 2, 1, 0x80], [0, 1, 1], [3] + [0] * 3 * size,
+                     [4] + [0xff] * 4 * size]:
+            self.assertRaises(ValueError, serialize._read_column,
+                              buffer(str(bytearray(data))), 0, size)
+
+
+    def test_roundtrip(self):
+        problem = Problem.from_lists(*create_example())
+        loaded = serialize.loads(serialize.dumps(problem))
+        self.assertSameProblem(loaded, problem)
+        self.assertEqual(loaded.intern('f'), problem.intern('f'))
+        self.assertFalse(loaded.solve())
+
+        for seed in range(0, 10):
+            problem = Problem.from_lists(*create_random(seed, 300))
+            loaded = serialize.loads(serialize.dumps(problem))
+            self.assertSameProblem(loaded, problem)
+            self.assertEqual(loaded.solve(), problem.solve())
+
+        empty = serialize.loads(serialize.dumps(Problem()))
+        self.assertSameProblem(empty, Problem())
+
+
+    def test_vectorized(self):
+        numpy = serialize.numpy
+        if numpy is None:
+            self.skipTest('numpy not installed')
+
+        data = serialize.dumps(Problem.from_lists(*create_random(2, 300)))
+        problem = serialize.loads(data)
+        serialize.numpy = None
+        try:
+            self.assertSameProblem(problem, serialize.loads(data))
+        finally:
+            serialize.numpy = numpy
+
+
+    def test_compact(self):
+        problem = Problem()
+        term = problem.add_term('x')
+        for _ in range(0, 1000):
+            term = problem.add_term('f', [term])
+        problem.add_inequality(0, term)
+
+        # One byte each for the symbol, arity and argument of each term.
+        data = serialize.dumps(problem)
+        self.assertLess(len(data), 3 * len(problem) + 20)
+
+
+    def test_unicode(self):
+        problem = Problem()
+        problem.add_term(u'\xe4')
+        loaded = serialize.loads(serialize.dumps(problem))
+        self.assertEqual(loaded.symbols[0].decode('utf-8'), u'\xe4')
+
+
+    def test_invalid(self):
+        data = serialize.dumps(Problem.from_lists(*create_example()))
+        self.assertRaises(ValueError, serialize.loads, 'XYZ' + data[3:])
+        self.assertRaises(ValueError, serialize.loads,
+                          data[:3] + chr(99) + data[4:])
+        self.assertRaises(ValueError, serialize.loads, data[:-1])
+
+
+    def test_invalid_ids(self):
+        problem = Problem()
+        x = problem.add_term('x')
+        problem.add_inequality(x, problem.add_term('f', [x]))
+        data = serialize.dumps(problem)
+
+        # The symbol of f, its argument decoding to -1 and 1, and a term of
+        # the inequality.
+        self.assertEqual(bytearray(data[9:]),
+                         bytearray([2, 0, 1, 0, 1, 1, 0, 1, 0, 1]))
+        for position, value in [(11, 2), (14, 2), (14, 0), (18, 2)]:
+            corrupt = bytearray(data)
+            corrupt[position] = value
+            self.assertRaises(ValueError, serialize.loads, str(corrupt))
+        self.assertSameProblem(serialize.loads(data), problem)
+
+        # In a large column, the argument of term 1 referring to itself or
+        # to a later term.
+        problem = Problem()
+        for term in range(0, 100):
+            problem.add_term('f', [term - 1] if term else [])
+        data = serialize.dumps(problem)
+        self.assertEqual(bytearray(data[-102:-100]), bytearray([1, 1]))
+        for delta in [0, 5]:
+            corrupt = bytearray(data)
+            corrupt[-101] = delta
+            self.assertRaises(ValueError, serialize.loads, str(corrupt))
+
+
+    def test_file(self):
+        problem = Problem.from_lists(*create_random(1, 200))
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'problem.cca')
+            with open(path, 'wb') as stream:
+                serialize.dump(problem, stream)
+            self.assertSameProblem(serialize.load(path), problem)
+        finally:
+            shutil.rmtree(directory)
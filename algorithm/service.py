@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+
+"""
+    A solving service reading problems line by line from local sockets or
+    from stdin. Each request is a JSON object on a single line with an
+    arbitrary "id" and either an SMT-LIB 2 script as "smt2" or a problem in
+    the binary format of the serialize module, encoded in base64, as
+    "problem". Each response is a JSON object on a single line with the "id"
+    of the request and a "result", which is "sat", "unsat", "timeout" or
+    "error" (with an "error" message). Responses are written as soon as
+    their batch is done, so they may come in a different order than the
+    requests.
+
+    Requests are collected into small batches: a batch is sent to a pool of
+    worker processes as soon as it is full, or when its oldest request has
+    waited for the batch delay. A request not answered within the timeout is
+    answered with "timeout". Once the given number of requests is
+    outstanding, no further input is read until some of them are answered,
+    so a burst of requests waits in the operating system's buffers instead
+    of in memory.
+"""
+
+import asynchat
+import asyncore
+import base64
+import json
+import os
+import socket
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+from StringIO import StringIO
+from algorithm import Algorithm
+from parser import load
+from serialize import loads
+
+
+def solve_request(request):
+    """
+        Decide the satisfiability of a single request and return its result,
+        "sat", "unsat" or ("error", message).
+
+        :type request: dict
+        :rtype: str | (str, str)
+    """
+
+    try:
+        if 'problem' in request:
+            problem = loads(base64.b64decode(request['problem']))
+            satisfiable = problem.solve()
+        elif 'smt2' in request:
+            merge_list, inequality_list = load(StringIO(request['smt2']))
+            alg = Algorithm(merge_list, inequality_list)
+            alg.merge_nodes()
+            satisfiable = alg.check_satisfiability()
+        else:
+            return 'error', 'The request contains no problem'
+    except Exception as error:
+        return 'error', str(error)
+
+    if satisfiable:
+        return 'sat'
+
+    return 'unsat'
+
+
+def solve_batch(requests):
+    """
+        Decide the satisfiability of a batch of requests.
+
+        :type requests: list[dict]
+        :rtype: list[str | (str, str)]
+    """
+
+    return [solve_request(request) for request in requests]
+
+
+class _Channel(asynchat.async_chat):
+    """
+        A connection reading requests line by line.
+    """
+
+
+    def __init__(self, service, sock = None):
+        """
+            :type service: SolverService
+            :type sock: socket.socket
+        """
+
+        asynchat.async_chat.__init__(self, sock, service.map)
+        self.set_terminator('\n')
+        self.pending = 0  # The number of unanswered requests
+        self._service = service
+        self._buffer = []
+        self._eof = False
+
+
+    def collect_incoming_data(self, data):
+        """
+            :type data: str
+        """
+
+        self._buffer.append(data)
+
+
+    def found_terminator(self):
+        line = ''.join(self._buffer).strip()
+        self._buffer = []
+        if line:
+            self._service.submit(self, line)
+
+
+    def readable(self):
+        """
+            Stop reading at the end of the input and while too many requests
+            are outstanding.
+
+            :rtype: bool
+        """
+
+        return not self._eof and self._service.accepting()
+
+
+    def respond(self, line):
+        """
+            Send a response unless the connection has been closed. After the
+            end of the input, the connection is closed once all requests have
+            been answered.
+
+            :type line: str
+        """
+
+        if self.connected:
+            self.push(line + '\n')
+            if self._eof and not self.pending:
+                self.close_when_done()
+
+
+    def handle_close(self):
+        # Called again by close_when_done() after the last response.
+        if self._eof:
+            self.close()
+            return
+
+        # The client may have closed its side after sending its requests.
+        self.found_terminator()
+        self._eof = True
+        if not self.pending:
+            self.close_when_done()
+
+
+class _StdinChannel(_Channel):
+    """
+        A channel reading requests from stdin and writing the responses to
+        stdout.
+    """
+
+
+    def __init__(self, service, stdin = None, stdout = None):
+        """
+            :type service: SolverService
+            :type stdin: file
+            :type stdout: file
+        """
+
+        _Channel.__init__(self, service)
+        self._stdout = stdout or sys.stdout
+        self.connected = True
+        self.socket = asyncore.file_wrapper((stdin or sys.stdin).fileno())
+        self._fileno = self.socket.fd
+        self.add_channel()
+
+
+    def writable(self):
+        """
+            :rtype: bool
+        """
+
+        return False
+
+
+    def respond(self, line):
+        """
+            :type line: str
+        """
+
+        self._stdout.write(line + '\n')
+        self._stdout.flush()
+
+
+    def handle_close(self):
+        # Remaining requests are still answered.
+        self.found_terminator()
+        self._eof = True
+        self.close()
+
+
+class _Listener(asyncore.dispatcher):
+    """
+        A listening socket creating a channel for each connection.
+    """
+
+
+    def __init__(self, service, address):
+        """
+            :type service: SolverService
+            :param address: A pair (host, port) or the path of a Unix socket.
+        """
+
+        asyncore.dispatcher.__init__(self, map = service.map)
+        self._service = service
+        if isinstance(address, tuple):
+            self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.set_reuse_addr()
+        else:
+            if os.path.exists(address):
+                os.remove(address)
+            self.create_socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.bind(address)
+        self.listen(64)
+
+
+    def handle_accept(self):
+        pair = self.accept()
+        if pair is not None:
+            _Channel(self._service, pair[0])
+
+
+class SolverService(object):
+    """
+        The event loop of the solving service. See the description of the
+        module for the protocol.
+    """
+
+
+    def __init__(self, processes = None, batch_size = 32, batch_delay = 0.01,
+                 timeout = 10.0, max_pending = 1024):
+        """
+            Initialize the service without any sockets.
+
+            :param processes: The number of worker processes, by default the
+                              number of CPUs. With zero processes, batches
+                              are solved in the event loop itself, and
+                              timeouts only apply to requests waiting for a
+                              batch.
+            :param batch_size: The maximum number of requests in a batch.
+            :param batch_delay: The maximum number of seconds a request
+                                waits for its batch to be filled.
+            :param timeout: The number of seconds after which a request is
+                            answered with "timeout". Workers cannot abandon
+                            a single batch, so once all requests of a batch
+                            being solved have timed out, the worker pool is
+                            restarted, and the unanswered requests of the
+                            other batches being solved are solved again from
+                            the start.
+            :param max_pending: The maximum number of outstanding requests.
+        """
+
+        self.map = {}  # Dict: file descriptor -> dispatcher
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.timeout = timeout
+        self.max_pending = max_pending
+
+        self._processes = processes
+        if processes == 0:
+            self._pool = None
+        else:
+            self._pool = Pool(processes)
+
+        # Requests waiting for a batch and batches being solved.
+        self._waiting = deque()  # Deque of _Request
+        self._running = []  # List of (AsyncResult, list of _Request)
+        self._outstanding = 0
+        self._closed = False
+        self._serving = False
+
+
+    def listen(self, address):
+        """
+            Accept connections on a TCP socket bound to a pair (host, port) or
+            on a Unix socket with the given path. Return the bound address.
+
+            :type address: (str, int) | str
+            :rtype: (str, int) | str
+        """
+
+        return _Listener(self, address).socket.getsockname()
+
+
+    def read_stdin(self, stdin = None, stdout = None):
+        """
+            Read requests from stdin and write the responses to stdout.
+
+            :type stdin: file
+            :type stdout: file
+        """
+
+        _StdinChannel(self, stdin, stdout)
+
+
+    def accepting(self):
+        """
+            Return True if further requests may be read.
+
+            :rtype: bool
+        """
+
+        return self._outstanding < self.max_pending
+
+
+    def submit(self, channel, line):
+        """
+            Add a request received on the given channel.
+
+            :type channel: _Channel
+            :type line: str
+        """
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('The request is not an object')
+        except ValueError as error:
+            channel.respond(json.dumps({'id': None, 'result': 'error',
+                                        'error': str(error)}))
+            return
+
+        self._outstanding += 1
+        channel.pending += 1
+        self._waiting.append(_Request(channel, request, self.timeout))
+
+
+    def _answer(self, entry, result):
+        """
+            Send the response to a request unless it has been answered.
+
+            :type entry: _Request
+            :type result: str | (str, str)
+        """
+
+        if entry.answered:
+            return
+
+        entry.answered = True
+        self._outstanding -= 1
+        entry.channel.pending -= 1
+        response = {'id': entry.request.get('id')}
+        if isinstance(result, tuple):
+            response['result'], response['error'] = result
+        else:
+            response['result'] = result
+        entry.channel.respond(json.dumps(response))
+
+
+    def _dispatch(self):
+        """
+            Send full batches and batches whose oldest request has waited long
+            enough to the workers.
+        """
+
+        waiting = self._waiting
+        now = time.time()
+        while waiting and (len(waiting) >= self.batch_size or
+                           waiting[0].arrival + self.batch_delay <= now):
+            batch = []
+            for _ in range(0, min(self.batch_size, len(waiting))):
+                entry = waiting.popleft()
+                if entry.deadline <= now:
+                    self._answer(entry, 'timeout')
+                else:
+                    batch.append(entry)
+            if not batch:
+                continue
+
+            requests = [entry.request for entry in batch]
+            if self._pool is None:
+                for entry, result in zip(batch, solve_batch(requests)):
+                    self._answer(entry, result)
+            else:
+                self._running.append((self._pool.apply_async(
+                    solve_batch, (requests,)), batch))
+
+
+    def _collect(self):
+        """
+            Answer the requests of all finished batches and all requests
+            whose time is up.
+        """
+
+        now = time.time()
+        running = []
+        for result, batch in self._running:
+            if result.ready():
+                try:
+                    results = result.get()
+                except Exception as error:
+                    results = [('error', str(error))] * len(batch)
+                for entry, value in zip(batch, results):
+                    self._answer(entry, value)
+                continue
+
+            for entry in batch:
+                if entry.deadline <= now:
+                    self._answer(entry, 'timeout')
+            running.append((result, batch))
+
+        self._running = running
+        for entry in self._waiting:
+            if entry.deadline <= now:
+                self._answer(entry, 'timeout')
+
+        # A worker solving a batch no one waits for is only freed by
+        # replacing the pool.
+        if any(all(entry.answered for entry in batch) for _, batch in running):
+            self._restart()
+
+
+    def _restart(self):
+        """
+            Replace the worker pool and send all batches being solved that
+            still have unanswered requests to the new workers.
+        """
+
+        self._pool.terminate()
+        self._pool.join()
+        self._pool = Pool(self._processes)
+
+        running = []
+        for _, batch in self._running:
+            batch = [entry for entry in batch if not entry.answered]
+            if batch:
+                requests = [entry.request for entry in batch]
+                running.append((self._pool.apply_async(
+                    solve_batch, (requests,)), batch))
+        self._running = running
+
+
+    def serve(self):
+        """
+            Run the event loop until close() is called, or until all channels
+            have been closed and all requests have been answered. Then close
+            all sockets and the worker pool.
+        """
+
+        self._serving = True
+        try:
+            while not self._closed and \
+                    (self.map or self._waiting or self._running):
+                poll = self.batch_delay if self._waiting or self._running \
+                    else 0.1
+                if self.map:
+                    asyncore.loop(poll, False, self.map, 1)
+                else:
+                    time.sleep(poll)
+                self._dispatch()
+                self._collect()
+        finally:
+            self._serving = False
+            self._shutdown()
+
+
+    def close(self):
+        """
+            Stop the event loop. This may be called from another thread while
+            serve() is running, which then closes all sockets and the worker
+            pool itself.
+        """
+
+        self._closed = True
+        if not self._serving:
+            self._shutdown()
+
+
+    def _shutdown(self):
+        """
+            Close all sockets and the worker pool.
+        """
+
+        asyncore.close_all(self.map)
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+
+class _Request(object):
+    """
+        A request received by the service.
+    """
+
+
+    def __init__(self, channel, request, timeout):
+        """
+            :type channel: _Channel
+            :type request: dict
+            :param timeout: The number of seconds until the request times
+                            out.
+        """
+
+        self.channel = channel
+        self.request = request
+        self.arrival = time.time()
+        self.deadline = self.arrival + timeout
+        self.answered = False
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import json
+import os
+import socket
+import threading
+import time
+import unittest
+from StringIO import StringIO
+from algorithm.init_test import create_example
+from algorithm.problem import Problem
+from algorithm.serialize import dumps
+from algorithm.service import SolverService, solve_batch, solve_request
+
+SAT = '(declare-const x Int) (declare-const y Int) (assert (= x y))'
+UNSAT = '(declare-const x Int) (assert (not (= x x)))'
+
+
+def serve_stdin(service, lines):
+    """
+        Serve the given lines on a pipe and return the responses by id.
+    """
+
+    read, write = os.pipe()
+    os.write(write, ''.join([line + '\n' for line in lines]))
+    os.close(write)
+    stdout = StringIO()
+    with os.fdopen(read) as stdin:
+        service.read_stdin(stdin, stdout)
+        service.serve()
+
+    responses = [json.loads(line) for line in
+                 stdout.getvalue().splitlines()]
+    return dict([(response['id'], response) for response in responses])
+
+
+class TestService(unittest.TestCase):
+    """
+        A collection of tests for the solving service.
+    """
+
+
+    def test_solve_request(self):
+        problem = base64.b64encode(dumps(Problem.from_lists(
+            *create_example())))
+        self.assertEqual(solve_request({'problem': problem}), 'unsat')
+        self.assertEqual(solve_request({'smt2': SAT}), 'sat')
+        self.assertEqual(solve_request({'smt2': UNSAT}), 'unsat')
+        self.assertEqual(solve_request({})[0], 'error')
+        self.assertEqual(solve_request({'smt2': '(assert'})[0], 'error')
+        self.assertEqual(solve_batch([{'smt2': SAT}, {'smt2': UNSAT}]),
+                         ['sat', 'unsat'])
+
+
+    def test_stdin(self):
+        lines = [json.dumps({'id': n, 'smt2': SAT if n % 2 else UNSAT})
+                 for n in range(0, 50)]
+        lines.append('not json')
+        lines.append('')
+        lines.append(json.dumps({'id': 'missing'}))
+        for processes in [0, 2]:
+            service = SolverService(processes, batch_size = 8)
+            responses = serve_stdin(service, lines)
+            self.assertEqual(len(responses), 52)
+            for n in range(0, 50):
+                self.assertEqual(responses[n]['result'],
+                                 'sat' if n % 2 else 'unsat')
+            self.assertEqual(responses[None]['result'], 'error')
+            self.assertEqual(responses['missing']['result'], 'error')
+
+
+    def test_timeout(self):
+        service = SolverService(0, timeout = 0)
+        responses = serve_stdin(service, [json.dumps({'id': 1,
+                                                      'smt2': SAT})])
+        self.assertEqual(responses[1]['result'], 'timeout')
+
+
+    def test_restart(self):
+        service = SolverService(1, batch_delay = 0)
+
+        class Channel(object):
+            pending = 0
+            responses = []
+
+            def respond(self, line):
+                self.responses.append(json.loads(line))
+
+        class Stuck(object):
+            def ready(self):
+                return False
+
+        channel = Channel()
+        service.submit(channel, json.dumps({'id': 1, 'smt2': SAT}))
+        service.submit(channel, json.dumps({'id': 2, 'smt2': UNSAT}))
+        service.batch_size = 1
+        service._dispatch()
+        self.assertEqual(len(service._running), 2)
+
+        # The first batch never finishes and times out.
+        batch = service._running[0][1]
+        service._running[0] = (Stuck(), batch)
+        batch[0].deadline = 0
+        pool = service._pool
+        service._collect()
+        self.assertIsNot(service._pool, pool)
+        self.assertEqual(len(service._running), 1)
+        while service._running:
+            time.sleep(0.01)
+            service._collect()
+        self.assertEqual([(response['id'], response['result']) for response
+                          in channel.responses], [(1, 'timeout'),
+                                                  (2, 'unsat')])
+        self.assertEqual(channel.pending, 0)
+        service.close()
+
+
+    def test_backpressure(self):
+        service = SolverService(0, max_pending = 2)
+        self.assertTrue(service.accepting())
+
+        class Channel(object):
+            pending = 0
+            responses = []
+
+            def respond(self, line):
+                self.responses.append(json.loads(line))
+
+        channel = Channel()
+        service.submit(channel, json.dumps({'id': 1, 'smt2': SAT}))
+        service.submit(channel, json.dumps({'id': 2, 'smt2': UNSAT}))
+        self.assertFalse(service.accepting())
+        self.assertEqual(channel.pending, 2)
+
+        service._dispatch()
+        self.assertEqual(channel.responses, [])
+        service.batch_delay = 0
+        service._dispatch()
+        self.assertTrue(service.accepting())
+        self.assertEqual([response['result'] for response
+                          in channel.responses], ['sat', 'unsat'])
+        self.assertEqual(channel.pending, 0)
+        service.close()
+
+
+    def test_socket(self):
+        service = SolverService(2, batch_size = 4)
+        address = service.listen(('127.0.0.1', 0))
+        thread = threading.Thread(target = service.serve)
+        thread.start()
+        try:
+            client = socket.create_connection(address)
+            for n in range(0, 10):
+                client.sendall(json.dumps({'id': n, 'smt2': UNSAT}) + '\n')
+            client.shutdown(socket.SHUT_WR)
+
+            data = ''
+            while True:
+                chunk = client.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+            client.close()
+        finally:
+            service.close()
+            thread.join()
+
+        responses = [json.loads(line) for line in data.splitlines()]
+        self.assertEqual(sorted([response['id'] for response in responses]),
+                         range(0, 10))
+        for response in responses:
+            self.assertEqual(response['result'], 'unsat')
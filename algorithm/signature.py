@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+from node import Node
+
+
+class SignatureTable(object):
+    """
+        A hash table mapping the signature of a node, i.e. the ID of its
+        function name and the representatives of its arguments, to a node
+        with this signature. Two nodes are congruent if and only if they have
+        the same signature, so congruent parents can be found with a single
+        lookup per parent instead of comparing all pairs of parents.
+
+        Entries are never deleted. A signature containing a node that no
+        longer is a class representative can never be computed again, so
+        outdated entries are simply never found.
+    """
+
+
+    def __init__(self, find = None, trail = None):
+        """
+            Initialize the table.
+
+            :param find: The function returning a node's class
+                         representative.
+            :param trail: If given, a tuple (function, arguments) undoing
+                          each change of the table is appended to this list.
+            :type trail: list[(function, tuple)]
+        """
+
+        if find is None:
+            find = Node.get_class_representative
+
+        self._find = find  # Function
+        self._trail = trail  # List
+        self._table = {}  # Dict
+        self._nodes = set()  # Set
+
+
+    def __len__(self):
+        """
+            :rtype: int
+        """
+
+        return len(self._table)
+
+
+    def signature(self, node):
+        """
+            Return the signature of the given node.
+
+            :type node: Node
+            :rtype: tuple
+        """
+
+        find = self._find
+        return (node.symbol,) + tuple([id(find(argument))
+                                       for argument in node.arguments])
+
+
+    def register(self, nodes):
+        """
+            Add all nodes connected to the given nodes (via arguments and
+            parents) to the table, unless they have been registered before.
+
+            Return a list of all pairs of registered nodes that are congruent
+            but not in the same class.
+
+            :type nodes: list[Node]
+            :rtype: list[(Node, Node)]
+        """
+
+        known = self._nodes
+        stack = [node for node in nodes if node not in known]
+        if not stack:
+            return []
+
+        known.update(stack)
+        added = list(stack)
+        compound = []
+        while stack:
+            node = stack.pop()
+            if node.arguments:
+                compound.append(node)
+
+            for neighbour in node.arguments:
+                if neighbour not in known:
+                    known.add(neighbour)
+                    added.append(neighbour)
+                    stack.append(neighbour)
+
+            for neighbour in node.parents:
+                if neighbour not in known:
+                    known.add(neighbour)
+                    added.append(neighbour)
+                    stack.append(neighbour)
+
+        if self._trail is not None:
+            self._trail.append((known.difference_update, (added,)))
+
+        return self.update(compound)
+
+
+    def update(self, nodes):
+        """
+            Recompute the signatures of the given nodes, usually the parents
+            of a class that has just been merged into another one.
+
+            Return a list of all pairs of nodes that are congruent but not in
+            the same class.
+
+            :type nodes: list[Node]
+            :rtype: list[(Node, Node)]
+        """
+
+        find = self._find
+        table = self._table
+        trail = self._trail
+        congruent = []
+        for node in nodes:
+            signature = (node.symbol,) + tuple(
+                [id(find(argument)) for argument in node.arguments])
+            other = table.get(signature)
+            if other is None:
+                table[signature] = node
+                if trail is not None:
+                    trail.append((table.pop, (signature, None)))
+            elif other is not node and find(other) is not find(node):
+                congruent.append((node, other))
+
+        return congruent
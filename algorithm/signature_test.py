@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from algorithm.node import Node
+from algorithm.signature import SignatureTable
+
+
+class TestSignatureTable(unittest.TestCase):
+    """
+        A collection of tests for the entire SignatureTable class.
+    """
+
+
+    def test_signature(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('f', [node1])
+        node4 = Node('f', [node2])
+        table = SignatureTable()
+
+        self.assertEqual(table.signature(node1), (node1.symbol,))
+        self.assertNotEqual(table.signature(node3), table.signature(node4))
+
+        node1.union(node2)
+        self.assertEqual(table.signature(node3), table.signature(node4))
+
+
+    def test_register(self):
+        node1 = Node('x')
+        node2 = Node('f', [node1])
+        node3 = Node('f', [node1])
+        node4 = Node('g', [node2])
+        table = SignatureTable()
+
+        # Nodes 2 and 3 are congruent, but not yet in the same class.
+        # The order of the pair depends on the order of the parents.
+        congruent = table.register([node1])
+        self.assertEqual(len(congruent), 1)
+        self.assertEqual(set(congruent[0]), {node2, node3})
+        self.assertEqual(len(table), 2)
+
+        # Registering known nodes again does not change anything.
+        self.assertEqual(table.register([node1, node4]), [])
+        self.assertEqual(len(table), 2)
+
+
+    def test_update(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('f', [node1])
+        node4 = Node('f', [node2])
+        table = SignatureTable()
+        self.assertEqual(table.register([node1, node2]), [])
+
+        # Only the parents of node 1 get a new signature.
+        node1.union(node2)
+        self.assertEqual(table.update([node3]), [(node3, node4)])
+
+        # Nodes that already are in the same class are not reported.
+        node3.union(node4)
+        self.assertEqual(table.update([node3]), [])
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+# The counters of an instrumented algorithm.
+COUNTERS = ['finds', 'unions', 'merges', 'congruences', 'moved_parents',
+            'parent_pairs', 'signatures', 'propagation_depth']
+
+
+class Statistics(object):
+    """
+        Counters and timers of an instrumented algorithm. They are collected
+        by wrapping the algorithm's functions when it is created, so an
+        algorithm without instrumentation runs exactly the same code as
+        before and does not pay for any checks.
+
+        The counters are:
+
+        * finds: Lookups of class representatives by the algorithm.
+        * unions: Unions of two classes.
+        * merges: Equalities taken from the queue of pending equalities,
+                  including those of nodes that already are in the same
+                  class.
+        * congruences: Congruent pairs of nodes among them.
+        * moved_parents: Parents added to the set of parents of another
+                         class by unions, i.e. the size of the smaller set
+                         of each union.
+        * parent_pairs: Pairs of parents examined for congruence. The
+                        pairwise strategy examines all pairs of parents of
+                        two merged classes, the signature strategy looks up
+                        each parent in the set of the class attached below
+                        the other one.
+        * signatures: Signatures computed.
+        * propagation_depth: The largest number of rounds of congruences
+                             caused by a single input equality.
+
+        The timers contain the total number of seconds spent in each phase,
+        i.e. in merge_nodes() and check_satisfiability().
+    """
+
+
+    def __init__(self, timers = False):
+        """
+            Initialize all counters with zero.
+
+            :param timers: If True, the time of each phase is measured, too.
+            :type timers: bool
+        """
+
+        self.counts = dict([(name, 0) for name in COUNTERS])  # Dict
+        if timers:
+            self.timers = {}  # Dict: phase -> seconds
+        else:
+            self.timers = None
+
+
+    def __getitem__(self, name):
+        """
+            Return the value of a counter.
+
+            :type name: str
+            :rtype: int
+        """
+
+        return self.counts[name]
+
+
+    def counted(self, name, function):
+        """
+            Return a function calling the given function and incrementing the
+            counter with the given name on each call.
+
+            :type name: str
+            :type function: function
+            :rtype: function
+        """
+
+        counts = self.counts
+
+        def wrapper(*arguments):
+            counts[name] += 1
+            return function(*arguments)
+
+        return wrapper
+
+
+    def timed(self, phase, function):
+        """
+            Return a function calling the given function and adding the time
+            of each call to the timer of the given phase. Without timers, the
+            function is returned unchanged.
+
+            :type phase: str
+            :type function: function
+            :rtype: function
+        """
+
+        timers = self.timers
+        if timers is None:
+            return function
+
+        timers[phase] = 0.0
+
+        def wrapper(*arguments):
+            start = time.time()
+            try:
+                return function(*arguments)
+            finally:
+                timers[phase] += time.time() - start
+
+        return wrapper
+
+
+    def as_dict(self):
+        """
+            Return all counters and timers in a single dictionary.
+
+            :rtype: dict
+        """
+
+        result = dict(self.counts)
+        if self.timers is not None:
+            result['timers'] = dict(self.timers)
+
+        return result
+
+
+    def __repr__(self):
+        """
+            :rtype: str
+        """
+
+        return ', '.join(['{0!s}={1!s}'.format(name, self.counts[name])
+                          for name in COUNTERS])
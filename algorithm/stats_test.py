@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from algorithm import Algorithm
+from algorithm.init_test import create_example
+from algorithm.node import Node
+from algorithm.stats import COUNTERS, Statistics
+from algorithm.workloads import chain, fan_in
+
+
+class TestStatistics(unittest.TestCase):
+    """
+        A collection of tests for the instrumentation of the algorithm.
+    """
+
+
+    def test_disabled(self):
+        alg = Algorithm(*create_example())
+        self.assertIsNone(alg.stats)
+
+        # Nothing has been wrapped.
+        for name in ['_propagate', '_union', 'merge_nodes',
+                     'check_satisfiability']:
+            self.assertNotIn(name, alg.__dict__)
+        self.assertEqual(alg._merge, alg._merge_signature)
+        self.assertEqual(alg._find, Node.get_class_representative)
+        self.assertNotIn('update', alg._signatures.__dict__)
+
+
+    def test_counters(self):
+        alg = Algorithm(*create_example(), instrument = True)
+        self.assertIsInstance(alg.stats, Statistics)
+        self.assertEqual(sorted(alg.stats.counts.keys()), sorted(COUNTERS))
+        alg.merge_nodes()
+        self.assertFalse(alg.check_satisfiability())
+
+        stats = alg.stats
+        self.assertGreater(stats['finds'], 0)
+        self.assertGreater(stats['unions'], 0)
+        self.assertGreaterEqual(stats['merges'], stats['unions'])
+        self.assertEqual(stats['merges'] - stats['congruences'], 3)
+        self.assertGreater(stats['signatures'], 0)
+        self.assertIsNone(stats.timers)
+        self.assertIn('unions=', repr(stats))
+        self.assertEqual(stats.as_dict()['unions'], stats['unions'])
+
+
+    def test_propagation_depth(self):
+        for strategy in [Algorithm.PAIRWISE, Algorithm.SIGNATURE]:
+            alg = Algorithm(*chain(20), strategy = strategy,
+                            instrument = True)
+            alg.merge_nodes()
+            self.assertFalse(alg.check_satisfiability())
+            self.assertEqual(alg.stats['propagation_depth'], 20)
+            self.assertEqual(alg.stats['unions'], 21)
+            self.assertEqual(alg.stats['congruences'], 20)
+
+
+    def test_parent_pairs(self):
+        pairwise = Algorithm(*fan_in(30), strategy = Algorithm.PAIRWISE,
+                             instrument = True)
+        pairwise.merge_nodes()
+        signature = Algorithm(*fan_in(30), instrument = True)
+        signature.merge_nodes()
+        self.assertEqual(pairwise.stats['unions'],
+                         signature.stats['unions'])
+
+        # The pairwise strategy examines quadratically many pairs.
+        self.assertGreater(pairwise.stats['parent_pairs'],
+                           10 * signature.stats['parent_pairs'])
+
+        # The attached class is counted with its parents before the union,
+        # even if its set has received the other class's parents.
+        a = Node('a')
+        b = Node('b')
+        parents = [Node('f', [a]), Node('g', [a]), Node('h', [b])]
+        alg = Algorithm([(a, b)], [], instrument = True)
+        alg.merge_nodes()
+        self.assertIs(a.find, b)
+        self.assertEqual(len(b.parents), 3)
+        self.assertEqual(alg.stats['parent_pairs'], 2)
+
+
+    def test_moved_parents(self):
+        # Each union moves the smaller set of parents only, so the number of
+        # moved parents grows linearly with the number of parents.
+        moved = []
+        for size in [30, 300]:
+            alg = Algorithm(*fan_in(size), instrument = True)
+            alg.merge_nodes()
+            self.assertLessEqual(alg.stats['moved_parents'],
+                                 alg.stats['unions'])
+            moved.append(alg.stats['moved_parents'])
+        self.assertLess(moved[1], 15 * moved[0])
+
+
+    def test_timers(self):
+        stats = Statistics(timers = True)
+        alg = Algorithm(*create_example(), instrument = stats)
+        self.assertIs(alg.stats, stats)
+        alg.merge_nodes()
+        alg.check_satisfiability()
+        self.assertEqual(sorted(stats.timers.keys()),
+                         ['check_satisfiability', 'merge_nodes'])
+        self.assertGreaterEqual(stats.timers['merge_nodes'], 0.0)
+        self.assertIn('timers', stats.as_dict())
+
+
+    def test_incremental(self):
+        alg = Algorithm(incremental = True, eager = True, explain = True,
+                        instrument = True)
+        merge_list, inequality_list = create_example()
+        alg.push()
+        for node1, node2 in inequality_list:
+            alg.assert_inequality(node1, node2)
+        for node1, node2 in merge_list:
+            alg.assert_equality(node1, node2)
+        self.assertFalse(alg.check_satisfiability())
+        unions = alg.stats['unions']
+        alg.pop()
+        self.assertTrue(alg.check_satisfiability())
+        self.assertEqual(alg.stats['unions'], unions)
@@ -0,0 +1,556 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from collections import deque
+from node import collect_nodes
+
+# NumPy is optional. Without it, bulk loading runs in plain Python loops.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TermStore(object):
+    """
+        A compact representation of a term DAG. Instead of one object per
+        node, every term is identified by an integer ID and all of its data is
+        kept in flat integer arrays indexed by this ID. Function names are
+        interned to integers as well.
+
+        The store implements the congruence closure on its terms itself: the
+        union-find uses union by rank and path halving, the parents of each
+        class are kept in circular linked lists which are spliced in constant
+        time on a union, and congruent parents are found in a signature
+        table.
+    """
+
+
+    def __init__(self):
+        """
+            Initialize an empty store.
+        """
+
+        self._symbols = {}  # Dict: function name -> symbol ID
+        self._names = []  # List: symbol ID -> function name
+
+        # Per term.
+        self._symbol = array('i')  # Symbol ID
+        self._offset = array('i')  # Index of the first argument in _args
+        self._arity = array('i')  # Number of arguments
+        self._find = array('i')  # Union-find parent
+        self._rank = array('i')  # Union-find rank
+        self._uses = array('i')  # Some entry of the class' use list or -1
+
+        # Per argument.
+        self._args = array('i')  # Term ID of the argument
+
+        # Per use list entry, i.e. per argument of a term.
+        self._use_next = array('i')  # Next entry in the circular list
+        self._use_term = array('i')  # Term ID of the parent
+
+        self._signatures = {}  # Dict: signature -> term ID
+        self._pending = deque()  # Pairs of congruent terms not yet merged
+
+
+    def __len__(self):
+        """
+            Return the number of terms in this store.
+
+            :rtype: int
+        """
+
+        return len(self._symbol)
+
+
+    def intern(self, name):
+        """
+            Return the ID of the given function name, adding it if necessary.
+
+            :type name: str
+            :rtype: int
+        """
+
+        symbol = self._symbols.get(name)
+        if symbol is None:
+            symbol = len(self._names)
+            self._symbols[name] = symbol
+            self._names.append(name)
+
+        return symbol
+
+
+    def add_term(self, name, arguments = ()):
+        """
+            Add a new term and return its ID. All arguments must already be
+            part of this store.
+
+            :type name: str
+            :type arguments: list[int]
+            :rtype: int
+        """
+
+        term = len(self._symbol)
+        self._symbol.append(self.intern(name))
+        self._offset.append(len(self._args))
+        self._arity.append(len(arguments))
+        self._find.append(term)
+        self._rank.append(0)
+        self._uses.append(-1)
+
+        if not arguments:
+            return term
+
+        # Add this term to the use lists of all its arguments' classes.
+        find = self.find
+        uses = self._uses
+        use_next = self._use_next
+        for argument in arguments:
+            entry = len(self._args)
+            self._args.append(argument)
+            self._use_term.append(term)
+
+            rep = find(argument)
+            head = uses[rep]
+            if head < 0:
+                use_next.append(entry)
+                uses[rep] = entry
+            else:
+                use_next.append(use_next[head])
+                use_next[head] = entry
+
+        # A term congruent to an existing one is merged with it.
+        signature = self._signature(term)
+        other = self._signatures.get(signature)
+        if other is None:
+            self._signatures[signature] = term
+        else:
+            self._pending.append((term, other))
+            self._propagate()
+
+        return term
+
+
+    def name(self, term):
+        """
+            Return the function name of the given term.
+
+            :type term: int
+            :rtype: str
+        """
+
+        return self._names[self._symbol[term]]
+
+
+    def arguments(self, term):
+        """
+            Return the IDs of the given term's arguments.
+
+            :type term: int
+            :rtype: list[int]
+        """
+
+        offset = self._offset[term]
+        return self._args[offset:offset + self._arity[term]].tolist()
+
+
+    def parents(self, term):
+        """
+            Return the IDs of all terms having a member of the given term's
+            class as an argument.
+
+            :type term: int
+            :rtype: set(int)
+        """
+
+        head = self._uses[self.find(term)]
+        if head < 0:
+            return set()
+
+        parents = set()
+        entry = head
+        while True:
+            parents.add(self._use_term[entry])
+            entry = self._use_next[entry]
+            if entry == head:
+                return parents
+
+
+    def find(self, term):
+        """
+            Return the representative of the given term's class.
+
+            :type term: int
+            :rtype: int
+        """
+
+        find = self._find
+        while find[term] != term:
+            find[term] = find[find[term]]
+            term = find[term]
+
+        return term
+
+
+    def are_equal(self, term1, term2):
+        """
+            Return True if both terms are in the same class.
+
+            :type term1: int
+            :type term2: int
+            :rtype: bool
+        """
+
+        return self.find(term1) == self.find(term2)
+
+
+    def _signature(self, term):
+        """
+            Return the symbol ID of the given term together with the
+            representatives of its arguments.
+
+            :type term: int
+            :rtype: tuple
+        """
+
+        find = self.find
+        offset = self._offset[term]
+        return (self._symbol[term],) + tuple(
+            [find(argument)
+             for argument in self._args[offset:offset + self._arity[term]]])
+
+
+    def merge(self, term1, term2):
+        """
+            Merge the two given terms and all terms becoming congruent by this
+            merge.
+
+            :type term1: int
+            :type term2: int
+        """
+
+        self._pending.append((term1, term2))
+        self._propagate()
+
+
+    def _propagate(self):
+        """
+            Merge all pending pairs of terms.
+
+            The parents in the use list of the class attached below the other
+            one get new signatures. This class is chosen by rank, not by the
+            length of its use list, so a merge costs the length of the use
+            list of the attached class, which may be the longer one.
+        """
+
+        find = self.find
+        rank = self._rank
+        uses = self._uses
+        use_next = self._use_next
+        use_term = self._use_term
+        signatures = self._signatures
+        pending = self._pending
+        while pending:
+            term1, term2 = pending.popleft()
+            rep1 = find(term1)
+            rep2 = find(term2)
+            if rep1 == rep2:
+                continue
+
+            # Union by rank: rep1 will be attached below rep2.
+            if rank[rep1] > rank[rep2]:
+                rep1, rep2 = rep2, rep1
+            elif rank[rep1] == rank[rep2]:
+                rank[rep2] += 1
+            self._find[rep1] = rep2
+
+            head1 = uses[rep1]
+            if head1 < 0:
+                continue
+
+            # All parents of rep1's class get new signatures.
+            entry = head1
+            while True:
+                parent = use_term[entry]
+                signature = self._signature(parent)
+                other = signatures.get(signature)
+                if other is None:
+                    signatures[signature] = parent
+                elif find(other) != find(parent):
+                    pending.append((parent, other))
+
+                entry = use_next[entry]
+                if entry == head1:
+                    break
+
+            # Splice the use list of rep1 into the one of rep2.
+            head2 = uses[rep2]
+            if head2 < 0:
+                uses[rep2] = head1
+            else:
+                use_next[head1], use_next[head2] = \
+                    use_next[head2], use_next[head1]
+            uses[rep1] = -1
+
+
+    @classmethod
+    def load(cls, merge_list, inequality_list):
+        """
+            Create a store from the nodes in the given lists and all nodes
+            connected to them.
+
+            Return the store, the merge and inequality lists with each node
+            replaced by its term ID, and a dictionary mapping all nodes to
+            their term IDs. Nodes that already have been merged with other
+            nodes are merged in the store as well.
+
+            :type merge_list: list[(Node, Node)]
+            :type inequality_list: list[(Node, Node)]
+            :rtype: (TermStore, list[(int, int)], list[(int, int)],
+                     dict[Node, int])
+        """
+
+        store = cls()
+        ids = {}
+        nodes = collect_nodes(merge_list, inequality_list)
+        for node in nodes:
+            ids[node] = store.add_term(
+                node.name, [ids[argument] for argument in node.arguments])
+
+        # Take over the existing classes.
+        for node in nodes:
+            if node.find is not node:
+                store.merge(ids[node], ids[node.find])
+
+        merges = [(ids[node1], ids[node2]) for node1, node2 in merge_list]
+        inequalities = [(ids[node1], ids[node2])
+                        for node1, node2 in inequality_list]
+        return store, merges, inequalities, ids
+
+
+    @classmethod
+    def from_arrays(cls, symbols, term_symbols, offsets, arguments,
+                    merges = (), inequalities = ()):
+        """
+            Create a store from columns in the layout of a Problem: the
+            function names, the symbol ID of each term, the offsets of each
+            term's arguments (one more than there are terms), the term IDs
+            of all arguments, and the term IDs of the equalities and
+            inequalities, two per literal. The columns may be lists, arrays
+            of the array module or NumPy arrays.
+
+            The store is built column by column instead of term by term. The
+            equalities of two terms without arguments are united in the
+            union-find before the use lists and the signatures are built, so
+            they never cause any congruence propagation. With NumPy, these
+            passes are vectorized. The remaining equalities are not merged.
+
+            Return the store, the remaining equalities, i.e. those involving
+            at least one term with arguments, and all inequalities, each as a
+            list of pairs of term IDs in their original order, e.g. for
+            Algorithm(merges, inequalities, store = store). The equalities
+            united while loading are not part of the returned merge list.
+
+            :type symbols: list[str]
+            :type term_symbols: list[int]
+            :type offsets: list[int]
+            :type arguments: list[int]
+            :type merges: list[int]
+            :type inequalities: list[int]
+            :rtype: (TermStore, list[(int, int)], list[(int, int)])
+        """
+
+        store = cls()
+        store._names = list(symbols)
+        store._symbols = dict([(name, symbol) for symbol, name
+                               in enumerate(store._names)])
+
+        store._symbol = _column(term_symbols)
+        offsets = _column(offsets)
+        store._args = _column(arguments)
+        merges = _column(merges)
+        inequalities = _column(inequalities)
+
+        size = len(store._symbol)
+        if len(offsets) != size + 1 or offsets[0] != 0 or \
+                offsets[-1] != len(store._args):
+            raise ValueError('The offsets do not match the terms and '
+                             'arguments')
+        if len(merges) % 2 or len(inequalities) % 2:
+            raise ValueError('Each literal needs two terms')
+        for column, limit in [(store._symbol, len(store._names)),
+                              (store._args, size), (merges, size),
+                              (inequalities, size)]:
+            if column and (min(column) < 0 or max(column) >= limit):
+                raise ValueError('Unknown term or symbol ID')
+
+        store._offset = offsets[:-1]
+        if numpy is not None:
+            store._link_vectorized(offsets, merges)
+        else:
+            store._link(offsets, merges)
+
+        # Terms with the same signature are congruent.
+        find = store.find
+        signatures = store._signatures
+        pending = store._pending
+        symbol = store._symbol
+        args = store._args
+        for term in range(0, size):
+            start = offsets[term]
+            end = offsets[term + 1]
+            if start == end:
+                continue
+
+            signature = (symbol[term],) + tuple(
+                [find(argument) for argument in args[start:end]])
+            other = signatures.get(signature)
+            if other is None:
+                signatures[signature] = term
+            else:
+                pending.append((term, other))
+        store._propagate()
+
+        remaining = [(term1, term2) for term1, term2
+                     in zip(merges[0::2], merges[1::2])
+                     if offsets[term1] != offsets[term1 + 1] or
+                     offsets[term2] != offsets[term2 + 1]]
+        return (store, remaining,
+                zip(inequalities[0::2], inequalities[1::2]))
+
+
+    def _link(self, offsets, merges):
+        """
+            Fill in the arities, the union-find and the use lists of this
+            store, whose terms and arguments have been loaded, uniting the
+            terms of all equalities between terms without arguments first.
+
+            :type offsets: array
+            :type merges: array
+        """
+
+        size = len(self._symbol)
+        arity = array('i', [offsets[term + 1] - offsets[term]
+                            for term in range(0, size)])
+        self._arity = arity
+        self._find = array('i', range(0, size))
+        self._rank = array('i', [0]) * size
+
+        find = self.find
+        rank = self._rank
+        for n in range(0, len(merges), 2):
+            term1 = merges[n]
+            term2 = merges[n + 1]
+            if arity[term1] or arity[term2]:
+                continue
+
+            rep1 = find(term1)
+            rep2 = find(term2)
+            if rep1 == rep2:
+                continue
+            if rank[rep1] > rank[rep2]:
+                rep1, rep2 = rep2, rep1
+            elif rank[rep1] == rank[rep2]:
+                rank[rep2] += 1
+            self._find[rep1] = rep2
+
+        # Each argument is an entry in the use list of its class.
+        use_term = array('i')
+        for term in range(0, size):
+            use_term.extend([term] * arity[term])
+        self._use_term = use_term
+
+        uses = array('i', [-1]) * size
+        use_next = array('i', [0]) * len(self._args)
+        for entry, argument in enumerate(self._args):
+            rep = find(argument)
+            head = uses[rep]
+            if head < 0:
+                use_next[entry] = entry
+                uses[rep] = entry
+            else:
+                use_next[entry] = use_next[head]
+                use_next[head] = entry
+        self._uses = uses
+        self._use_next = use_next
+
+
+    def _link_vectorized(self, offsets, merges):
+        """
+            Do the same as _link() with NumPy. The equalities are united by
+            hooking the larger of two roots below the smaller one and pointer
+            jumping until all trees are flat, and the use lists are built by
+            sorting the entries by their classes.
+
+            :type offsets: array
+            :type merges: array
+        """
+
+        size = len(self._symbol)
+        offsets = numpy.frombuffer(offsets, numpy.intc)
+        arity = numpy.diff(offsets)
+
+        pairs = numpy.frombuffer(merges, numpy.intc).reshape(-1, 2)
+        pairs = pairs[(arity[pairs[:, 0]] == 0) & (arity[pairs[:, 1]] == 0)]
+        find = numpy.arange(size, dtype = numpy.intc)
+        while len(pairs):
+            rep1 = find[pairs[:, 0]]
+            rep2 = find[pairs[:, 1]]
+            different = rep1 != rep2
+            if not different.any():
+                break
+
+            # A root only points to a smaller term, so no cycles arise.
+            low = numpy.minimum(rep1, rep2)[different]
+            high = numpy.maximum(rep1, rep2)[different]
+            numpy.minimum.at(find, high, low)
+            while True:
+                jumped = find[find]
+                if (jumped == find).all():
+                    break
+                find = jumped
+
+        # All trees are flat, so every root with children has rank 1.
+        rank = numpy.zeros(size, numpy.intc)
+        rank[find[find != numpy.arange(size)]] = 1
+
+        # Link the entries of each class in a circle, in the order of a stable
+        # sort by their representatives.
+        args = numpy.frombuffer(self._args, numpy.intc)
+        use_term = numpy.repeat(numpy.arange(size, dtype = numpy.intc), arity)
+        uses = numpy.full(size, -1, numpy.intc)
+        use_next = numpy.zeros(len(args), numpy.intc)
+        if len(args):
+            reps = find[args]
+            order = numpy.argsort(reps, kind = 'mergesort').astype(numpy.intc)
+            sorted_reps = reps[order]
+            first = numpy.flatnonzero(numpy.concatenate(
+                ([True], sorted_reps[1:] != sorted_reps[:-1])))
+            last = numpy.concatenate((first[1:], [len(order)])) - 1
+            use_next[order[:-1]] = order[1:]
+            use_next[order[last]] = order[first]
+            uses[sorted_reps[first]] = order[first]
+
+        self._arity = _column(arity)
+        self._find = _column(find)
+        self._rank = _column(rank)
+        self._uses = _column(uses)
+        self._use_term = _column(use_term)
+        self._use_next = _column(use_next)
+
+
+def _column(values):
+    """
+        Return a sequence of integers as an array of the array module.
+
+        :type values: list[int]
+        :rtype: array
+    """
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        column = array('i')
+        column.fromstring(numpy.ascontiguousarray(
+            values, dtype = numpy.intc).ravel().tostring())
+        return column
+
+    return array('i', values)
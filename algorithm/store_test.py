@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from array import array
+from algorithm import Algorithm
+from algorithm import store as store_module
+from algorithm.init_test import create_random
+from algorithm.node import Node
+from algorithm.problem import Problem
+from algorithm.store import TermStore
+
+
+class TestTermStore(unittest.TestCase):
+    """
+        A collection of tests for the entire TermStore class.
+    """
+
+
+    def test_add_term(self):
+        store = TermStore()
+        x = store.add_term('x')
+        y = store.add_term('y')
+        fxy = store.add_term('f', [x, y])
+        fx = store.add_term('f', [x])
+
+        self.assertEqual(len(store), 4)
+        self.assertEqual(store.name(fxy), 'f')
+        self.assertEqual(store.arguments(fxy), [x, y])
+        self.assertEqual(store.arguments(x), [])
+        self.assertEqual(store.intern('f'), store.intern('f'))
+        self.assertEqual(store.parents(x), {fxy, fx})
+        self.assertEqual(store.parents(y), {fxy})
+        self.assertEqual(store.parents(fx), set())
+
+        # A term congruent to an existing term is merged with it.
+        fx2 = store.add_term('f', [x])
+        self.assertTrue(store.are_equal(fx, fx2))
+        self.assertFalse(store.are_equal(fx, fxy))
+
+
+    def test_merge(self):
+        store = TermStore()
+        x = store.add_term('x')
+        y = store.add_term('y')
+        fx = store.add_term('f', [x])
+        fy = store.add_term('f', [y])
+        gfx = store.add_term('g', [fx])
+        gfy = store.add_term('g', [fy])
+
+        store.merge(x, y)
+        self.assertTrue(store.are_equal(x, y))
+        self.assertTrue(store.are_equal(fx, fy))
+        self.assertTrue(store.are_equal(gfx, gfy))
+        self.assertFalse(store.are_equal(x, fx))
+        self.assertEqual(store.find(x), store.find(y))
+
+        # The use lists of both classes have been spliced.
+        self.assertEqual(store.parents(x), {fx, fy})
+        self.assertEqual(store.parents(fx), {gfx, gfy})
+
+
+    def test_merge_deep_cascade(self):
+        store = TermStore()
+        chain1 = [store.add_term('x')]
+        chain2 = [store.add_term('y')]
+        for _ in range(0, 5000):
+            chain1.append(store.add_term('f', [chain1[-1]]))
+            chain2.append(store.add_term('f', [chain2[-1]]))
+
+        store.merge(chain1[0], chain2[0])
+        self.assertTrue(store.are_equal(chain1[-1], chain2[-1]))
+
+
+    def test_load(self):
+        node1 = Node('x')
+        node2 = Node('y')
+        node3 = Node('f', [node1])
+        node4 = Node('f', [node2])
+        node5 = Node('z')
+        node6 = Node('g', [node4])
+        node6.find = node5
+
+        store, merges, inequalities, ids = TermStore.load(
+            [(node1, node2)], [(node3, node4)])
+        self.assertEqual(len(store), 6)
+        self.assertEqual(merges, [(ids[node1], ids[node2])])
+        self.assertEqual(inequalities, [(ids[node3], ids[node4])])
+        self.assertEqual(store.name(ids[node3]), 'f')
+        self.assertEqual(store.arguments(ids[node3]), [ids[node1]])
+
+        # Existing classes are taken over.
+        self.assertTrue(store.are_equal(ids[node5], ids[node6]))
+        self.assertFalse(store.are_equal(ids[node3], ids[node4]))
+
+
+    def test_from_arrays(self):
+        # x, y, z, f(x), f(y), g(f(x)), g(z), h(x, y)
+        store, merges, inequalities = TermStore.from_arrays(
+            ['x', 'y', 'z', 'f', 'g', 'h'], [0, 1, 2, 3, 3, 4, 4, 5],
+            [0, 0, 0, 0, 1, 2, 3, 4, 6], array('i', [0, 1, 3, 2, 0, 1]),
+            [0, 1, 1, 2, 3, 2], [5, 6])
+        self.assertEqual(len(store), 8)
+        self.assertEqual(merges, [(3, 2)])
+        self.assertEqual(inequalities, [(5, 6)])
+        self.assertEqual(store.name(7), 'h')
+        self.assertEqual(store.arguments(7), [0, 1])
+        self.assertEqual(store.intern('g'), 4)
+
+        # The variables have been united, and f(x) and f(y) are congruent.
+        self.assertTrue(store.are_equal(0, 2))
+        self.assertTrue(store.are_equal(3, 4))
+        self.assertEqual(store.parents(1), {3, 4, 6, 7})
+        self.assertFalse(store.are_equal(5, 6))
+
+        # The other equalities are left to the algorithm.
+        alg = Algorithm(merges, inequalities, store = store)
+        alg.merge_nodes()
+        self.assertFalse(alg.check_satisfiability())
+        self.assertTrue(store.are_equal(5, 6))
+
+        self.assertRaises(ValueError, TermStore.from_arrays, ['x'], [0],
+                          [0, 1], [], [], [])
+        self.assertRaises(ValueError, TermStore.from_arrays, ['x'], [0],
+                          [0, 0], [], [0], [])
+        self.assertRaises(ValueError, TermStore.from_arrays, ['x'], [1],
+                          [0, 0], [], [], [])
+
+
+    def test_from_arrays_random(self):
+        for seed in range(0, 20):
+            problem = Problem.from_lists(*create_random(seed, 60))
+            expected = problem.solve()
+            columns = [problem.symbols, problem.term_symbols, problem.offsets,
+                       problem.arguments, problem.merges,
+                       problem.inequalities]
+            store, merges, inequalities = TermStore.from_arrays(*columns)
+            alg = Algorithm(merges, inequalities, store = store)
+            alg.merge_nodes()
+            self.assertEqual(alg.check_satisfiability(), expected)
+
+
+    def test_from_arrays_vectorized(self):
+        numpy = store_module.numpy
+        if numpy is None:
+            self.skipTest('numpy not installed')
+
+        # The vectorized passes build the same classes as the plain ones.
+        for seed in range(0, 20):
+            problem = Problem.from_lists(*create_random(seed, 60))
+            expected = problem.solve()
+            columns = [problem.symbols, problem.term_symbols, problem.offsets,
+                       problem.arguments, problem.merges,
+                       problem.inequalities]
+            store_module.numpy = None
+            try:
+                store = TermStore.from_arrays(*columns)[0]
+            finally:
+                store_module.numpy = numpy
+            vectorized, merges, inequalities = TermStore.from_arrays(
+                columns[0], *[numpy.array(column) for column in columns[1:]])
+            for term in range(0, len(store)):
+                self.assertEqual(vectorized.parents(term),
+                                 store.parents(term))
+                for other in range(0, term):
+                    self.assertEqual(vectorized.are_equal(term, other),
+                                     store.are_equal(term, other))
+
+            alg = Algorithm(merges, inequalities, store = vectorized)
+            alg.merge_nodes()
+            self.assertEqual(alg.check_satisfiability(), expected)
+
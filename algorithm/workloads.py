@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""
+    Generators for synthetic conjunctions of equalities and inequalities
+    whose size can be scaled freely. Each generator takes a size and a seed
+    and returns a merge list and an inequality list of new nodes. The
+    generators which do not use random numbers ignore the seed.
+"""
+
+import random
+from factory import TermFactory
+from node import Node
+
+
+def _apply(name, node, times):
+    """
+        Return the nodes f(node), f(f(node)), ... up to the given number of
+        applications of the function with the given name.
+
+        :type name: str
+        :type node: Node
+        :type times: int
+        :rtype: list[Node]
+    """
+
+    nodes = []
+    for _ in range(0, times):
+        node = Node(name, [node])
+        nodes.append(node)
+
+    return nodes
+
+
+def chain(size, seed = None):
+    """
+        Two chains f(x), ..., f^n(x) and f(y), ..., f^n(y) with x = y and
+        f^n(x) != f^n(y). The single input equality makes the pairs of both
+        chains congruent one after another. Unsatisfiable.
+
+        :type size: int
+        :type seed: int
+        :rtype: (list[(Node, Node)], list[(Node, Node)])
+    """
+
+    x = Node('x')
+    y = Node('y')
+    chain_x = _apply('f', x, size)
+    chain_y = _apply('f', y, size)
+    return [(x, y)], [(chain_x[-1], chain_y[-1])]
+
+
+def cascade(size, seed = None):
+    """
+        A single chain f(x), ..., f^n(x) with f^n(x) = x, f^(n-1)(x) = x and
+        f(x) != x. The second equality makes f(x) and f^n(x) congruent, and
+        then all terms of the chain collapse into a single class.
+        Unsatisfiable.
+
+        :type size: int
+        :type seed: int
+        :rtype: (list[(Node, Node)], list[(Node, Node)])
+    """
+
+    x = Node('x')
+    nodes = [x] + _apply('f', x, max(size, 2))
+    return [(nodes[-1], x), (nodes[-2], x)], [(nodes[1], x)]
+
+
+def fan_in(size, seed = None):
+    """
+        Variables x_1, ..., x_n with the terms f(x_i) and g(x_i, c) and the
+        equalities x_1 = x_i for all i, so the class of x_1 gains two parents
+        per merge and ends up with 2n parents. f(x_1) != f(x_n).
+        Unsatisfiable.
+
+        :type size: int
+        :type seed: int
+        :rtype: (list[(Node, Node)], list[(Node, Node)])
+    """
+
+    c = Node('c')
+    variables = []
+    f_terms = []
+    for n in range(0, max(size, 2)):
+        variable = Node('x{0!s}'.format(n))
+        variables.append(variable)
+        f_terms.append(Node('f', [variable]))
+        Node('g', [variable, c])
+
+    merge_list = [(variables[0], variable) for variable in variables[1:]]
+    return merge_list, [(f_terms[0], f_terms[-1])]
+
+
+def lists(size, seed = None):
+    """
+        Random lists over the variables a_1, ..., a_n built with cons. For
+        every cons term, the axioms car(cons(a, b)) = a and
+        cdr(cons(a, b)) = b are given as equalities, together with random
+        equalities between variables and terms and two random inequalities.
+        All terms are created with a term factory, so they are unique.
+
+        :type size: int
+        :type seed: int
+        :rtype: (list[(Node, Node)], list[(Node, Node)])
+    """
+
+    generator = random.Random(seed)
+    factory = TermFactory()
+    term = factory.term
+    nodes = [term('a{0!s}'.format(n)) for n in range(0, max(size // 4, 2))]
+    variables = list(nodes)
+
+    merge_list = []
+    for _ in range(0, size):
+        car = generator.choice(nodes)
+        cdr = generator.choice(nodes)
+        cons = term('cons', [car, cdr])
+        merge_list.append((term('car', [cons]), car))
+        merge_list.append((term('cdr', [cons]), cdr))
+        nodes.append(cons)
+
+    for _ in range(0, size // 4):
+        merge_list.append((generator.choice(variables),
+                           generator.choice(nodes)))
+
+    inequality_list = [tuple(generator.sample(nodes, 2)) for _ in range(0, 2)]
+    return merge_list, inequality_list
+
+
+# The generators by name.
+WORKLOADS = {
+    'chain': chain,
+    'cascade': cascade,
+    'fan_in': fan_in,
+    'lists': lists,
+}
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from algorithm import Algorithm
+from algorithm.node import collect_nodes
+from algorithm.workloads import WORKLOADS, cascade, chain, fan_in, lists
+
+
+def solve(merge_list, inequality_list, strategy = Algorithm.SIGNATURE):
+    alg = Algorithm(merge_list, inequality_list, strategy)
+    alg.merge_nodes()
+    return alg.check_satisfiability()
+
+
+class TestWorkloads(unittest.TestCase):
+    """
+        A collection of tests for the workload generators.
+    """
+
+
+    def test_chain(self):
+        merge_list, inequality_list = chain(50)
+        self.assertEqual(len(collect_nodes(merge_list, inequality_list)), 102)
+        self.assertFalse(solve(merge_list, inequality_list))
+
+
+    def test_cascade(self):
+        merge_list, inequality_list = cascade(50)
+        self.assertEqual(len(collect_nodes(merge_list, inequality_list)), 51)
+        self.assertFalse(solve(*cascade(50)))
+
+        # All terms of the chain end up in a single class.
+        alg = Algorithm(merge_list, inequality_list)
+        alg.merge_nodes()
+        x = merge_list[0][1]
+        for node in collect_nodes(merge_list, inequality_list):
+            self.assertTrue(alg.are_equal(node, x))
+
+        self.assertEqual(len(collect_nodes(*cascade(1))), 3)
+
+
+    def test_fan_in(self):
+        merge_list, inequality_list = fan_in(50)
+        self.assertEqual(len(merge_list), 49)
+        self.assertEqual(len(collect_nodes(merge_list, inequality_list)), 151)
+        self.assertEqual(len(merge_list[0][0].parents), 2)
+        self.assertFalse(solve(merge_list, inequality_list))
+        self.assertFalse(solve(*fan_in(50), strategy = Algorithm.PAIRWISE))
+
+
+    def test_lists(self):
+        merge_list, inequality_list = lists(40, 3)
+        self.assertEqual(len(merge_list), 90)
+        self.assertEqual(len(inequality_list), 2)
+        for node1, node2 in merge_list[:80]:
+            self.assertIn(node1.name, ['car', 'cdr'])
+            self.assertIs(node1.arguments[0].name, 'cons')
+
+        # The same seed results in the same problem.
+        for seed in range(0, 10):
+            self.assertEqual(solve(*lists(40, seed)),
+                             solve(*lists(40, seed), strategy =
+                                   Algorithm.PAIRWISE))
+            self.assertEqual(
+                [(node1.name, node2.name) for node1, node2
+                 in lists(40, seed)[0]],
+                [(node1.name, node2.name) for node1, node2
+                 in lists(40, seed)[0]])
+
+
+    def test_workloads(self):
+        for name, generator in WORKLOADS.items():
+            merge_list, inequality_list = generator(10, 1)
+            self.assertTrue(merge_list, name)
+            self.assertTrue(inequality_list, name)
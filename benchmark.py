@@ -0,0 +1,210 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+    ConCloAlg - Benchmarks
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Runs the algorithm on the synthetic workloads in algorithm/workloads.py
+    for a range of sizes and reports the time, the peak memory and the number
+    of merged classes per second of each case. Run
+        ./benchmark.py --sizes 1000 10000 --output results.json
+    to save the results, and
+        ./benchmark.py --sizes 1000 10000 --baseline results.json
+    to compare a later run with them.
+
+    Each case runs in a new process, so the peak memory of one case is not
+    influenced by the cases before it.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from multiprocessing import Pipe, Process
+from algorithm import Algorithm
+from algorithm.node import collect_nodes
+from algorithm.workloads import WORKLOADS
+
+
+def run_case(workload, size, strategy, seed, instrument, connection):
+    """
+        Generate and solve a single workload and send the measurements
+        through the given connection.
+
+        :type workload: str
+        :type size: int
+        :type strategy: str
+        :type seed: int
+        :param instrument: If True, the counters of the algorithm are sent,
+                           too.
+        :type connection: multiprocessing.Connection
+    """
+
+    merge_list, inequality_list = WORKLOADS[workload](size, seed)
+    nodes = collect_nodes(merge_list, inequality_list)
+    loaded = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.time()
+    alg = Algorithm(merge_list, inequality_list, strategy,
+                    instrument = instrument)
+    alg.merge_nodes()
+    satisfiable = alg.check_satisfiability()
+    elapsed = time.time() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Every union reduces the number of classes by one.
+    classes = len(set([id(node.get_root()) for node in nodes]))
+    connection.send({
+        'stats': alg.stats.as_dict() if instrument else None,
+        'nodes': len(nodes),
+        'unions': len(nodes) - classes,
+        'satisfiable': satisfiable,
+        'time': elapsed,
+        'peak_memory_kb': peak,
+        'solver_memory_kb': peak - loaded,
+    })
+    connection.close()
+
+
+def measure(workload, size, strategy, seed, repeat, instrument = False):
+    """
+        Run a case the given number of times, each time in a new process, and
+        return the measurements of the fastest run.
+
+        :type workload: str
+        :type size: int
+        :type strategy: str
+        :type seed: int
+        :type repeat: int
+        :type instrument: bool
+        :rtype: dict
+    """
+
+    best = None
+    for _ in range(0, repeat):
+        receiver, sender = Pipe(False)
+        process = Process(target = run_case,
+                          args = (workload, size, strategy, seed, instrument,
+                                  sender))
+        process.start()
+
+        # Only the child may keep the sending end open, so recv() fails
+        # instead of waiting forever if the child dies without a result.
+        sender.close()
+        try:
+            result = receiver.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError('The case {0!s} failed with exit code {1!s}'
+                               .format((workload, size, strategy, seed),
+                                       process.exitcode))
+        process.join()
+        if best is None or result['time'] < best['time']:
+            best = result
+
+    best.update({
+        'workload': workload,
+        'size': size,
+        'strategy': strategy,
+        'seed': seed,
+        'unions_per_second': best['unions'] / best['time']
+                             if best['time'] > 0 else None,
+    })
+    return best
+
+
+def compare(results, path):
+    """
+        Print the speedup of each case compared to the same case in a results
+        file of an earlier run.
+
+        :type results: list[dict]
+        :type path: str
+    """
+
+    with open(path) as stream:
+        baseline = json.load(stream)['results']
+
+    times = {}
+    for result in baseline:
+        key = (result['workload'], result['size'], result['strategy'],
+               result['seed'])
+        times[key] = result['time']
+
+    print ''
+    print 'Compared to {0!s}:'.format(path)
+    for result in results:
+        key = (result['workload'], result['size'], result['strategy'],
+               result['seed'])
+        if key not in times or result['time'] <= 0:
+            continue
+        print '{0:<10} {1:>8} {2:<10} {3:>8.2f}x'.format(
+            result['workload'], result['size'], result['strategy'],
+            times[key] / result['time'])
+
+
+# If called directly run the benchmarks.
+if __name__ == '__main__':
+    argument_parser = argparse.ArgumentParser(
+        description = 'Benchmark the algorithm on synthetic workloads.')
+    argument_parser.add_argument('--workloads', nargs = '+',
+                                 choices = sorted(WORKLOADS.keys()),
+                                 default = sorted(WORKLOADS.keys()))
+    argument_parser.add_argument('--sizes', nargs = '+', type = int,
+                                 default = [100, 1000, 10000])
+    argument_parser.add_argument('--strategies', nargs = '+',
+                                 choices = [Algorithm.PAIRWISE,
+                                            Algorithm.SIGNATURE],
+                                 default = [Algorithm.SIGNATURE])
+    argument_parser.add_argument('--seed', type = int, default = 0)
+    argument_parser.add_argument('--repeat', type = int, default = 3,
+                                 help = 'Report the fastest of this many '
+                                        'runs of each case.')
+    argument_parser.add_argument('--instrument', action = 'store_true',
+                                 help = 'Save the counters of the algorithm '
+                                        'with the results. This slows down '
+                                        'the algorithm.')
+    argument_parser.add_argument('--output', help = 'Save the results to '
+                                                    'this JSON file.')
+    argument_parser.add_argument('--baseline', help = 'Compare the results '
+                                                      'to this JSON file.')
+    arguments = argument_parser.parse_args()
+
+    # With the counters, the number of parents moved between the sets of
+    # parents of merged classes shows how much the unions copy.
+    header = '{0:<10} {1:>8} {2:<10} {3:>10} {4:>12} {5:>14}'.format(
+        'Workload', 'Size', 'Strategy', 'Time (s)', 'Peak (KiB)', 'Unions/s')
+    if arguments.instrument:
+        header += ' {0:>14}'.format('Moved parents')
+    print header
+
+    results = []
+    for workload in arguments.workloads:
+        for strategy in arguments.strategies:
+            for size in arguments.sizes:
+                result = measure(workload, size, strategy, arguments.seed,
+                                 arguments.repeat, arguments.instrument)
+                results.append(result)
+                line = '{0:<10} {1:>8} {2:<10} {3:>10.4f} {4:>12} {5:>14}'\
+                    .format(workload, size, strategy, result['time'],
+                            result['peak_memory_kb'],
+                            int(result['unions_per_second'] or 0))
+                if arguments.instrument:
+                    line += ' {0:>14}'.format(
+                        result['stats']['moved_parents'])
+                print line
+
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as stream:
+            json.dump({
+                'python': sys.version,
+                'platform': platform.platform(),
+                'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'results': results,
+            }, stream, indent = 2, sort_keys = True)
+
+    if arguments.baseline is not None:
+        compare(results, arguments.baseline)
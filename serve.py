@@ -0,0 +1,58 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+"""
+    ConCloAlg - Service
+    ~~~~~~~~~~~~~~~~~~~
+
+    Runs the solving service of algorithm/service.py. Without a socket, the
+    requests are read from stdin and the responses are written to stdout:
+        echo '{"id": 1, "smt2": "(declare-const x Int)"}' | ./serve.py
+    With --port or --socket, the service accepts connections on a local TCP
+    socket or a Unix socket until it is interrupted.
+"""
+
+# If called directly run the service.
+if __name__ == '__main__':
+    import argparse
+    from algorithm.service import SolverService
+
+    argument_parser = argparse.ArgumentParser(
+        description = 'Decide the satisfiability of line-delimited JSON '
+                      'requests.')
+    argument_parser.add_argument('--port', type = int,
+                                 help = 'Listen on this TCP port of '
+                                        'localhost.')
+    argument_parser.add_argument('--socket', help = 'Listen on a Unix socket '
+                                                    'with this path.')
+    argument_parser.add_argument('--processes', type = int,
+                                 help = 'The number of worker processes, by '
+                                        'default the number of CPUs.')
+    argument_parser.add_argument('--batch-size', type = int, default = 32)
+    argument_parser.add_argument('--batch-delay', type = float,
+                                 default = 0.01,
+                                 help = 'The maximum number of seconds a '
+                                        'request waits for its batch.')
+    argument_parser.add_argument('--timeout', type = float, default = 10.0,
+                                 help = 'The number of seconds after which a '
+                                        'request is answered with '
+                                        '"timeout".')
+    argument_parser.add_argument('--max-pending', type = int, default = 1024,
+                                 help = 'Stop reading while this many '
+                                        'requests are outstanding.')
+    arguments = argument_parser.parse_args()
+
+    service = SolverService(arguments.processes, arguments.batch_size,
+                            arguments.batch_delay, arguments.timeout,
+                            arguments.max_pending)
+    if arguments.port is not None:
+        service.listen(('127.0.0.1', arguments.port))
+    if arguments.socket is not None:
+        service.listen(arguments.socket)
+    if arguments.port is None and arguments.socket is None:
+        service.read_stdin()
+
+    try:
+        service.serve()
+    except KeyboardInterrupt:
+        service.close()